@@ -0,0 +1,246 @@
+"""
+Timing benchmarks for the four criteria, in asv style.
+
+Each class's `params` grid is expanded by `run_benchmarks.py` (or by asv itself);
+`setup` raises NotImplementedError to skip grid points above the sample cap.
+"""
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from sentinel_triage.calculators import load_calculator
+from sentinel_triage.synthetic import PULSE_SHAPES, synthetic_trace, write_trace_csv
+from sentinel_triage.traces import KINEMATIC_COLUMNS, Trace
+
+RATES_HZ = [10_000, 100_000, 1_000_000]
+DURATIONS_S = [0.01, 0.1, 1.0, 10.0]
+
+# Grid points above this many samples are skipped unless SENTINEL_BENCH_FULL=1
+MAX_SAMPLES = 2_000_000 if os.environ.get("SENTINEL_BENCH_FULL") != "1" else float("inf")
+
+# HIC/SI read linear acceleration in mm/s² from columns 2-4
+MM_PER_G = 9810
+
+
+def _trace(shape: str, rate_hz: float, duration_s: float) -> np.ndarray:
+    if rate_hz * duration_s > MAX_SAMPLES:
+        raise NotImplementedError("Grid point above the sample cap")
+    return synthetic_trace(shape, rate_hz, duration_s, noise_g=0.5)
+
+
+class TimeHIC:
+    params = [PULSE_SHAPES, RATES_HZ, DURATIONS_S]
+    param_names = ["shape", "rate_hz", "duration_s"]
+
+    def setup(self, shape, rate_hz, duration_s):
+        data = _trace(shape, rate_hz, duration_s)
+        HICCalculator = load_calculator("HICCalculator")
+        self.calculator = HICCalculator(1 / rate_hz)
+        series_type = sys.modules[HICCalculator.__module__].AccelerationSeries
+        self.acceleration = series_type(data[:, 0], np.linalg.norm(data[:, 1:4], axis=1))
+
+    def time_calculate_hic(self, shape, rate_hz, duration_s):
+        self.calculator.calculate_hic(self.acceleration, min(15.0, duration_s * 500))
+
+    def time_calculate_hic_windows(self, shape, rate_hz, duration_s):
+        self.calculator.calculate_hic_windows(self.acceleration)
+
+
+class HICInput:
+    """Runtime and peak memory of the legacy dict from get_data against the arrays from get_series."""
+
+    params = [RATES_HZ, [0.01, 0.05, 0.1]]
+    param_names = ["rate_hz", "duration_s"]
+
+    def setup(self, rate_hz, duration_s):
+        data = _trace("half-sine", rate_hz, duration_s)
+        data[:, 1:4] *= MM_PER_G
+        self.trace = Trace(data, KINEMATIC_COLUMNS)
+        self.calculator = load_calculator("HICCalculator")(1 / rate_hz)
+
+    def time_get_data(self, rate_hz, duration_s):
+        self.calculator.calculate_hic_windows(self.calculator.get_data(self.trace, 2, 3, 4))
+
+    def time_get_series(self, rate_hz, duration_s):
+        self.calculator.calculate_hic_windows(self.calculator.get_series(self.trace, 2, 3, 4))
+
+    def peakmem_get_data(self, rate_hz, duration_s):
+        return self.calculator.get_data(self.trace, 2, 3, 4)
+
+    def peakmem_get_series(self, rate_hz, duration_s):
+        return self.calculator.get_series(self.trace, 2, 3, 4)
+
+
+class TimeSI:
+    params = [PULSE_SHAPES, RATES_HZ, DURATIONS_S]
+    param_names = ["shape", "rate_hz", "duration_s"]
+
+    def setup(self, shape, rate_hz, duration_s):
+        data = _trace(shape, rate_hz, duration_s)
+        self.calculator = load_calculator("SICalculator")(1 / rate_hz)
+        self.time_steps = data[:, 0]
+        self.magnitudes = self.calculator.butter_lowpass_filter(np.linalg.norm(data[:, 1:4], axis=1))
+
+    def time_calculate_si(self, shape, rate_hz, duration_s):
+        self.calculator.calculate_si(self.time_steps, self.magnitudes)
+
+
+class TimeHIP:
+    params = [PULSE_SHAPES, RATES_HZ, DURATIONS_S]
+    param_names = ["shape", "rate_hz", "duration_s"]
+
+    def setup(self, shape, rate_hz, duration_s):
+        self.data = _trace(shape, rate_hz, duration_s)
+        self.calculator = load_calculator("HIPCalculator")(1 / rate_hz)
+
+    def time_calculate_hip(self, shape, rate_hz, duration_s):
+        self.calculator.calculate_hip(self.data)
+
+
+class TimeGAMBIT:
+    params = [PULSE_SHAPES, RATES_HZ, DURATIONS_S]
+    param_names = ["shape", "rate_hz", "duration_s"]
+
+    def setup(self, shape, rate_hz, duration_s):
+        self.data = _trace(shape, rate_hz, duration_s)
+        self.calculator = load_calculator("GAMBITCalculator")(1 / rate_hz)
+
+    def time_calculate_gambit(self, shape, rate_hz, duration_s):
+        self.calculator.calculate_gambit(self.data)
+
+
+class TimeStack:
+    """Score a Monte-Carlo style stack of short traces with all four criteria in one call."""
+
+    params = [[100, 1000, 10000]]
+    param_names = ["n_traces"]
+
+    def setup(self, n_traces):
+        from sentinel_triage.engine import TriageEngine
+
+        peaks = np.linspace(20.0, 150.0, n_traces)
+        self.stack = np.stack([synthetic_trace("half-sine", 10_000, 0.05, peak_g=peak, noise_g=0.5, seed=i)
+                               for i, peak in enumerate(peaks)])
+        self.stack[:, :, 1:4] *= MM_PER_G
+        self.engine = TriageEngine(1 / 10_000, accel_units="mm/s2")
+
+    def time_run_stack(self, n_traces):
+        self.engine.run_stack(self.stack)
+
+
+class TimeEndToEnd:
+    """Parse a CSV file and score it with all four criteria, with and without the binary trace cache."""
+
+    params = [RATES_HZ, [0.1, 1.0], [False, True]]
+    param_names = ["rate_hz", "duration_s", "cached"]
+
+    def setup(self, rate_hz, duration_s, cached):
+        data = _trace("half-sine", rate_hz, duration_s)
+        data[:, 1:4] *= MM_PER_G
+        self.directory = tempfile.mkdtemp(prefix="sentinel-bench-")
+        self.path = os.path.join(self.directory, "impact_data.csv")
+        write_trace_csv(data, self.path)
+        os.environ["SENTINEL_TRACE_CACHE"] = "1" if cached else "0"
+
+        from sentinel_triage.batch import score_trace
+        self.score_trace = score_trace
+        if cached:
+            self.score_trace(self.path, 1 / rate_hz, accel_units="mm/s2")  # Warm the cache
+
+    def teardown(self, rate_hz, duration_s, cached):
+        os.environ.pop("SENTINEL_TRACE_CACHE", None)
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def time_score_file(self, rate_hz, duration_s, cached):
+        self.score_trace(self.path, 1 / rate_hz, accel_units="mm/s2")
+
+
+class TimeReplay:
+    """Replay a 0.2 s recording into `RealtimeTriage` block by block, as a live sensor would deliver it."""
+
+    params = [[10_000, 100_000], [1, 16, 128, 1024]]
+    param_names = ["rate_hz", "block_size"]
+
+    def setup(self, rate_hz, block_size):
+        from sentinel_triage.realtime import RealtimeTriage, iter_blocks
+
+        if rate_hz * 0.2 / block_size > 5000:
+            raise NotImplementedError("More than 5000 updates per replay")
+        self.data = synthetic_trace("multi-peak", rate_hz, 0.2, noise_g=0.5)
+        self.data[:, 1:4] *= MM_PER_G
+        self.scorer_type, self.iter_blocks = RealtimeTriage, iter_blocks
+        self.scorer_type(1 / rate_hz, accel_units="mm/s2").update(self.data[:block_size])  # Load SciPy and compile kernels
+
+    def time_replay(self, rate_hz, block_size):
+        scorer = self.scorer_type(1 / rate_hz, accel_units="mm/s2")
+        for block in self.iter_blocks(self.data, block_size):
+            scorer.update(block)
+
+    def track_latency_p99(self, rate_hz, block_size):
+        scorer = self.scorer_type(1 / rate_hz, accel_units="mm/s2")
+        latencies = []
+        for block in self.iter_blocks(self.data, block_size):
+            began = time.perf_counter()
+            scorer.update(block)
+            latencies.append(time.perf_counter() - began)
+        return np.percentile(latencies, 99) * 1e6
+
+    track_latency_p99.unit = "us"
+
+
+class TimeDecimation:
+    """HIP and GAMBIT at the input rate against decimated to the rate their bandwidth needs."""
+
+    params = [["HIPCalculator", "GAMBITCalculator"], [100_000, 1_000_000]]
+    param_names = ["calculator", "rate_hz"]
+
+    def setup(self, calculator, rate_hz):
+        method = "calculate_hip" if calculator == "HIPCalculator" else "calculate_gambit"
+        self.data = _trace("multi-peak", rate_hz, 0.2)
+        self.full_rate = getattr(load_calculator(calculator)(1 / rate_hz), method)
+        self.decimated = getattr(load_calculator(calculator)(1 / rate_hz, decimate=True), method)
+        self.full_rate(self.data), self.decimated(self.data)  # Design the filters
+
+    def time_full_rate(self, calculator, rate_hz):
+        self.full_rate(self.data)
+
+    def time_decimated(self, calculator, rate_hz):
+        self.decimated(self.data)
+
+    def track_error_percent(self, calculator, rate_hz):
+        reference = self.full_rate(self.data)
+        return 100 * abs(self.decimated(self.data) - reference) / abs(reference)
+
+    track_error_percent.unit = "%"
+
+
+class TimeSweep:
+    """Score one file under a parameter grid; cost should grow far slower than the number of sets."""
+
+    params = [[1, 10, 100]]
+    param_names = ["values_per_parameter"]
+
+    def setup(self, values_per_parameter):
+        from sentinel_triage.sweep import sweep_trace
+
+        data = _trace("multi-peak", 10_000, 0.5)
+        data[:, 1:4] *= MM_PER_G
+        self.directory = tempfile.mkdtemp(prefix="sentinel-bench-")
+        self.path = os.path.join(self.directory, "impact_data.csv")
+        write_trace_csv(data, self.path)
+        n = values_per_parameter
+        self.grid = {"hic_limits_ms": np.linspace(10.0, 36.0, n), "hip_mass": np.linspace(4.0, 5.0, n),
+                     "gambit_a_c": np.linspace(200.0, 300.0, n), "gambit_alpha_c": np.linspace(8000.0, 12000.0, n)}
+        self.sweep_trace = sweep_trace
+        self.sweep_trace(self.path, 1 / 10_000, self.grid, accel_units="mm/s2")  # Write the trace cache and design the filters
+
+    def teardown(self, values_per_parameter):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def time_sweep_trace(self, values_per_parameter):
+        self.sweep_trace(self.path, 1 / 10_000, self.grid, accel_units="mm/s2")
@@ -0,0 +1,172 @@
+"""
+Runs the asv-style benchmarks in this directory and checks them against a stored baseline.
+
+`time_*` methods report seconds per call; `peakmem_*` methods report the peak bytes
+allocated during one call, as traced by tracemalloc (NumPy buffers included);
+`track_*` methods return their own measurement, in the method's `unit`.
+
+    python benchmarks/run_benchmarks.py --save          # record benchmarks/baseline.json
+    python benchmarks/run_benchmarks.py                 # compare; exit 1 on regressions
+    python benchmarks/run_benchmarks.py -k HIP --threshold 10
+"""
+import argparse
+import glob
+import importlib.util
+import inspect
+import itertools
+import json
+import os
+import platform
+import re
+import sys
+import timeit
+import tracemalloc
+from typing import Callable, Dict, Iterator, Tuple
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_BASELINE = os.path.join(BENCHMARK_DIR, "baseline.json")
+PREFIXES = ("time_", "peakmem_", "track_")
+
+# Benchmark name -> unit of its `track_*` method, filled in by `run`
+UNITS: Dict[str, str] = {}
+
+
+def discover() -> Iterator[Tuple[str, type]]:
+    """Yields (module name, class) for every benchmark class in bench_*.py."""
+    for path in sorted(glob.glob(os.path.join(BENCHMARK_DIR, "bench_*.py"))):
+        name = os.path.splitext(os.path.basename(path))[0]
+        spec = importlib.util.spec_from_file_location(name, path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        for _, cls in inspect.getmembers(module, inspect.isclass):
+            if cls.__module__ == name and any(attr.startswith(PREFIXES) for attr in dir(cls)):
+                yield name, cls
+
+
+def measure(func: Callable[[], object], repeat: int, min_time: float) -> float:
+    """Returns the best per-call time in seconds over `repeat` runs of at least `min_time` each."""
+    timer = timeit.Timer(func)
+    number, elapsed = timer.autorange()
+    while elapsed < min_time:
+        number *= 2
+        elapsed = timer.timeit(number)
+    return min(timer.repeat(repeat, number)) / number
+
+
+def measure_peakmem(func: Callable[[], object]) -> int:
+    """Returns the peak number of bytes allocated while `func` runs, including its return value."""
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def format_result(key: str, value: float) -> str:
+    """Formats a result in milliseconds or megabytes, depending on the benchmark kind."""
+    if ".peakmem_" in key:
+        return f"{value / 2**20:.3f} MB"
+    if ".track_" in key:
+        return f"{value:.3f} {UNITS.get(key, '')}".rstrip()
+    return f"{value * 1000:.3f} ms"
+
+
+def run(pattern: str, repeat: int, min_time: float) -> Dict[str, float]:
+    """
+    Runs every benchmark whose name matches `pattern`.
+
+    Args:
+        pattern (str): Regular expression matched against "Class.method(params)".
+        repeat (int): Timing runs per benchmark; the fastest counts.
+        min_time (float): Minimum duration of one timing run in seconds.
+
+    Returns:
+        Dict[str, float]: Seconds per call (`time_*`), peak bytes (`peakmem_*`) or the returned
+        value (`track_*`), keyed by benchmark name.
+    """
+    results = {}
+    for module_name, cls in discover():
+        params = getattr(cls, "params", [])
+        names = getattr(cls, "param_names", [])
+        methods = sorted(attr for attr in dir(cls) if attr.startswith(PREFIXES))
+        for values in itertools.product(*params):
+            label = ", ".join(f"{name}={value}" for name, value in zip(names, values))
+            keys = {method: f"{cls.__name__}.{method}({label})" for method in methods}
+            selected = [method for method, key in keys.items() if re.search(pattern, key)]
+            if not selected:
+                continue
+
+            instance = cls()
+            try:
+                if hasattr(instance, "setup"):
+                    instance.setup(*values)
+            except NotImplementedError:
+                continue
+            try:
+                for method in selected:
+                    bound = getattr(instance, method)
+                    if method.startswith("peakmem_"):
+                        results[keys[method]] = measure_peakmem(lambda: bound(*values))
+                    elif method.startswith("track_"):
+                        results[keys[method]] = float(bound(*values))
+                        UNITS[keys[method]] = getattr(bound, "unit", "")
+                    else:
+                        results[keys[method]] = measure(lambda: bound(*values), repeat, min_time)
+                    print(f"{keys[method]:<80} {format_result(keys[method], results[keys[method]]):>15}", flush=True)
+            finally:
+                if hasattr(instance, "teardown"):
+                    instance.teardown(*values)
+    return results
+
+
+def compare(results: Dict[str, float], baseline: Dict[str, float], threshold: float) -> int:
+    """
+    Prints benchmarks slower (or, for `peakmem_*` and `track_*`, larger) than their baseline by more than `threshold` percent.
+
+    A zero baseline, such as a `track_error_percent` that was exact, has no relative change and is skipped.
+
+    Returns:
+        int: Number of regressions.
+    """
+    regressions = 0
+    for key, seconds in results.items():
+        if key not in baseline or baseline[key] == 0:
+            continue
+        change = (seconds / baseline[key] - 1) * 100
+        if change > threshold:
+            regressions += 1
+            print(f"REGRESSION {key}: {format_result(key, baseline[key])} -> {format_result(key, seconds)} (+{change:.1f}%)")
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the SENTINEL benchmarks and compare against a baseline")
+    parser.add_argument("-k", "--filter", type=str, default="", help="Regular expression selecting benchmarks")
+    parser.add_argument("--baseline", type=str, default=DEFAULT_BASELINE, help="Baseline JSON file")
+    parser.add_argument("--save", action="store_true", help="Store these results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=20.0, help="Allowed slowdown in percent")
+    parser.add_argument("--repeat", type=int, default=5, help="Timing runs per benchmark")
+    parser.add_argument("--min_time", type=float, default=0.05, help="Minimum seconds per timing run")
+    args = parser.parse_args()
+
+    results = run(args.filter, args.repeat, args.min_time)
+
+    if args.save:
+        stored = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline, "r") as f:
+                stored = json.load(f).get("results", {})
+        stored.update(results)
+        with open(args.baseline, "w") as f:
+            json.dump({"machine": platform.node(), "python": platform.python_version(), "results": stored},
+                      f, indent=2, sort_keys=True)
+        print(f"Baseline with {len(stored)} benchmarks written to {args.baseline}")
+    elif os.path.exists(args.baseline):
+        with open(args.baseline, "r") as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(results, baseline, args.threshold)
+        print(f"{regressions} regression(s) above {args.threshold:g}% against {args.baseline}")
+        sys.exit(1 if regressions else 0)
+    else:
+        print(f"No baseline at {args.baseline}; run with --save to record one")
@@ -0,0 +1,31 @@
+"""Shared tooling for running the SENTINEL head injury criteria calculators."""
+import importlib
+from typing import List
+
+# Public name -> submodule defining it. Submodules are imported on first access, so
+# `import sentinel_triage` stays cheap and SciPy loads only when a filter is first designed.
+_EXPORTS = {
+    "HICCalculator": "hic",
+    "SICalculator": "si",
+    "HIPCalculator": "hip",
+    "GAMBITCalculator": "gambit",
+    "TriageEngine": "engine",
+    "ResultStore": "store",
+    "Trace": "traces",
+    "load_trace": "traces",
+    "load_calculator": "calculators",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str) -> object:
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f"{__name__}.{_EXPORTS[name]}"), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(__all__))
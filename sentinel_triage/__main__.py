@@ -0,0 +1,3 @@
+from sentinel_triage.cli import main
+
+main()
@@ -0,0 +1,336 @@
+import argparse
+import csv
+import glob
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+
+from sentinel_triage import profiling
+from sentinel_triage.engine import ACCEL_UNITS, TriageEngine
+from sentinel_triage.events import detect_events
+from sentinel_triage.store import ResultStore
+from sentinel_triage.traces import Trace, load_trace
+
+SUMMARY_FIELDS = [
+    "file", "event", "t_start", "t_end", "HIC15", "HIC15_t1", "HIC15_t2", "HIC36", "HIC36_t1", "HIC36_t2",
+    "SI", "HIP_m", "GAMBIT", "error",
+]
+
+# A recording whose peak resultant stays this many times below the event threshold is
+# reported as an error rather than as "no events": its units are most likely wrong
+EVENT_UNIT_RATIO = 100.0
+
+# Seconds between flushes of a CSV summary, so a running batch shows progress without a write per row
+FLUSH_SECONDS = 1.0
+
+# Result stores opened by this process, by path; connections are not shared across processes
+_stores: Dict[str, ResultStore] = {}
+
+
+def find_traces(patterns: Iterable[str]) -> List[str]:
+    """
+    Expands directories and glob patterns into a sorted list of CSV files.
+
+    Args:
+        patterns (Iterable[str]): Directories (searched for *.csv) or glob patterns.
+
+    Returns:
+        List[str]: Unique file paths in sorted order.
+    """
+    files = set()
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            pattern = os.path.join(pattern, "*.csv")
+        files.update(path for path in glob.glob(pattern, recursive=True) if os.path.isfile(path))
+    return sorted(files)
+
+
+def open_store(path: Optional[str]) -> Optional[ResultStore]:
+    """Returns this process's `ResultStore` for `path`, opening it on first use (None for no path)."""
+    if path is None:
+        return None
+    if path not in _stores:
+        _stores[path] = ResultStore(path)
+    return _stores[path]
+
+
+def score_trace(file_path: Union[str, Trace], frequency: float, x_location: int = 2, y_location: int = 3,
+                z_location: int = 4, store: Optional[ResultStore] = None, decimate: bool = False,
+                accel_units: Optional[str] = None) -> Dict[str, object]:
+    """
+    Runs HIC, SI, HIP and GAMBIT on one CSV file, parsing and filtering it only once.
+
+    The criteria are scored by a `TriageEngine`, so the filtered resultant and channel
+    blocks they share are computed once. A failing criterion does not stop the others;
+    its message is collected in the "error" field of the returned row.
+
+    Args:
+        file_path (Union[str, Trace]): Path to the CSV file, or a loaded trace.
+        frequency (float): Sampling frequency (time step in seconds).
+        x_location (int): Column index for X direction data (HIC and SI).
+        y_location (int): Column index for Y direction data (HIC and SI).
+        z_location (int): Column index for Z direction data (HIC and SI).
+        store (Optional[ResultStore]): Store of earlier scores and intermediates to reuse and extend.
+        decimate (bool): Score HIP and GAMBIT at their filter bandwidth; see `TriageEngine`.
+        accel_units (Optional[str]): Units of the ax, ay, az columns, "g" or "mm/s2"; see `TriageEngine`.
+
+    Returns:
+        Dict[str, object]: One summary row keyed by `SUMMARY_FIELDS`.
+    """
+    row = {field: None for field in SUMMARY_FIELDS}
+    row["file"] = file_path.path if isinstance(file_path, Trace) else file_path
+
+    try:
+        trace = file_path if isinstance(file_path, Trace) else load_trace(file_path)
+    except Exception as e:
+        row["error"] = str(e)
+        return row
+
+    engine = TriageEngine(frequency, x_location, y_location, z_location, store=store, decimate=decimate,
+                          accel_units=accel_units)
+    row.update(engine.run(trace, strict=False))
+    return row
+
+
+def score_events(file_path: Union[str, Trace], frequency: float, threshold: float, x_location: int = 2,
+                 y_location: int = 3, z_location: int = 4, off_threshold: Optional[float] = None,
+                 padding_ms: float = 10.0, store: Optional[ResultStore] = None,
+                 decimate: bool = False, accel_units: Optional[str] = None) -> List[Dict[str, object]]:
+    """
+    Splits a long recording into impact events and scores each event separately.
+
+    Events are found on the resultant acceleration in G (`TriageEngine.resultant`, read in
+    `accel_units`) with `detect_events`; only the padded event windows are handed to the
+    calculators. HIC window times are reported from the start of the recording. A recording
+    without events gives one row with event=None and no scores, so that every file appears in
+    the summary; one whose peak stays `EVENT_UNIT_RATIO` times below `threshold` gives an error
+    row instead, since its units are then almost certainly not the ones assumed.
+
+    Args:
+        file_path (Union[str, Trace]): Path to the CSV file, or a loaded trace.
+        frequency (float): Sampling frequency (time step in seconds).
+        threshold (float): Resultant acceleration (G) that starts an event.
+        x_location (int): Column index for X direction data.
+        y_location (int): Column index for Y direction data.
+        z_location (int): Column index for Z direction data.
+        off_threshold (Optional[float]): Resultant acceleration (G) that ends an event (default: half of `threshold`).
+        padding_ms (float): Quiet signal kept before and after each event, in milliseconds.
+        store (Optional[ResultStore]): Store of earlier scores and intermediates to reuse and extend.
+        decimate (bool): Score HIP and GAMBIT at their filter bandwidth; see `TriageEngine`.
+        accel_units (Optional[str]): Units of the ax, ay, az columns, "g" or "mm/s2"; see `TriageEngine`.
+
+    Returns:
+        List[Dict[str, object]]: One summary row per event; a single row with event=None if the resultant
+        never reaches `threshold`, or a single error row if the file cannot be read or its resultant is
+        implausibly far below `threshold`.
+    """
+    path = file_path.path if isinstance(file_path, Trace) else file_path
+    try:
+        trace = file_path if isinstance(file_path, Trace) else load_trace(file_path)
+        resultant = TriageEngine(frequency, x_location, y_location, z_location, accel_units=accel_units).resultant(trace)
+        peak = float(np.max(resultant, initial=0.0))
+        if peak * EVENT_UNIT_RATIO < threshold:
+            raise ValueError(f"Peak resultant {peak:.3g} G is over {EVENT_UNIT_RATIO:g}x below the {threshold:g} G event "
+                             f"threshold; check the acceleration units (accel_units={accel_units!r})")
+    except Exception as e:
+        row = {field: None for field in SUMMARY_FIELDS}
+        row.update(file=path, error=str(e))
+        return [row]
+
+    padding = int(round(padding_ms / 1000 / frequency))
+    rows = []
+    for event, (start, stop) in enumerate(detect_events(resultant, threshold, off_threshold, padding, min_gap=padding)):
+        row = score_trace(trace.slice(start, stop), frequency, x_location, y_location, z_location, store, decimate,
+                          accel_units)
+        offset = start * frequency
+        for name in ("HIC15", "HIC36"):
+            for bound in ("t1", "t2"):
+                if row[f"{name}_{bound}"] is not None:
+                    row[f"{name}_{bound}"] += offset
+        row.update(file=path, event=event, t_start=offset, t_end=stop * frequency)
+        rows.append(row)
+    if not rows:
+        row = {field: None for field in SUMMARY_FIELDS}
+        row.update(file=path, t_start=0.0, t_end=len(trace) * frequency)
+        rows.append(row)
+    return rows
+
+
+def _score_rows(path: str, frequency: float, x_location: int, y_location: int, z_location: int,
+                threshold: Optional[float], off_threshold: Optional[float], padding_ms: float,
+                store_path: Optional[str], decimate: bool, accel_units: Optional[str]) -> List[Dict[str, object]]:
+    store = open_store(store_path)
+    if threshold is None:
+        return [score_trace(path, frequency, x_location, y_location, z_location, store, decimate, accel_units)]
+    return score_events(path, frequency, threshold, x_location, y_location, z_location, off_threshold, padding_ms,
+                        store, decimate, accel_units)
+
+
+def _score_task(args: tuple) -> Tuple[List[Dict[str, object]], Optional[Dict[str, object]]]:
+    *args, profile = args
+    if not profile:
+        return _score_rows(*args), None
+    # Worker processes profile each task on their own and send the counters back with the rows
+    with profiling.profiled() as collected:
+        rows = _score_rows(*args)
+    return rows, collected.to_dict()
+
+
+def run_batch(files: List[str], frequency: float, x_location: int = 2, y_location: int = 3,
+              z_location: int = 4, workers: Optional[int] = None, chunksize: Optional[int] = None,
+              threshold: Optional[float] = None, off_threshold: Optional[float] = None,
+              padding_ms: float = 10.0, store_path: Optional[str] = None,
+              readers: Optional[int] = None, decimate: bool = False,
+              accel_units: Optional[str] = None) -> Iterator[Dict[str, object]]:
+    """
+    Scores files on a process pool, yielding rows in input order as they complete.
+
+    With `readers`, files are read and parsed on that many threads of this process
+    while the pool scores earlier ones (`service.IngestionService`), which keeps the
+    workers busy when reads are slow, e.g. from a network share.
+
+    When profiling is enabled (`profiling.profiled`), the stage counters of the worker
+    processes are merged into the active profile as their rows arrive.
+
+    Args:
+        files (List[str]): CSV files to score.
+        frequency (float): Sampling frequency (time step in seconds).
+        x_location (int): Column index for X direction data (HIC and SI).
+        y_location (int): Column index for Y direction data (HIC and SI).
+        z_location (int): Column index for Z direction data (HIC and SI).
+        workers (Optional[int]): Number of worker processes (default: CPU count).
+        chunksize (Optional[int]): Files sent to a worker per task (default: about four tasks per worker).
+        threshold (Optional[float]): If set, score each impact event above this resultant (G) separately; see `score_events`.
+        off_threshold (Optional[float]): Resultant (G) that ends an event.
+        padding_ms (float): Quiet signal kept around each event, in milliseconds.
+        store_path (Optional[str]): SQLite `ResultStore` shared by all workers, so reruns only compute what changed.
+        readers (Optional[int]): Files read ahead at the same time; not available with `threshold`.
+        decimate (bool): Score HIP and GAMBIT at their filter bandwidth; see `TriageEngine`.
+        accel_units (Optional[str]): Units of the ax, ay, az columns, "g" or "mm/s2"; see `TriageEngine`.
+
+    Yields:
+        Dict[str, object]: One summary row per file, or per event when `threshold` is set.
+    """
+    workers = workers or os.cpu_count() or 1
+    if readers:
+        if threshold is not None:
+            raise ValueError("Reading ahead is not available with event detection")
+        from sentinel_triage.service import iter_responses  # The service imports this module
+
+        requests = ({"id": path, "path": path, "frequency": frequency, "x_location": x_location,
+                     "y_location": y_location, "z_location": z_location, "store": store_path, "decimate": decimate,
+                     "accel_units": accel_units} for path in files)
+        for response in iter_responses(requests, readers=readers, workers=workers):
+            row = {field: None for field in SUMMARY_FIELDS}
+            row["file"] = response.pop("id")
+            row.update(response)
+            yield row
+        return
+    if chunksize is None:
+        chunksize = max(1, len(files) // (workers * 4))
+    profile = profiling.active()
+    remote_profile = profile is not None and workers > 1
+    tasks = ((path, frequency, x_location, y_location, z_location, threshold, off_threshold, padding_ms, store_path,
+              decimate, accel_units, remote_profile) for path in files)
+
+    if workers == 1:
+        for rows, _ in map(_score_task, tasks):
+            yield from rows
+        return
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for rows, counters in executor.map(_score_task, tasks, chunksize=chunksize):
+            if counters is not None:
+                profile.merge(counters)
+            yield from rows
+
+
+def write_summary(rows: Iterable[Dict[str, object]], output_path: str, batch_size: int = 1000) -> int:
+    """
+    Streams summary rows to a CSV file, or to Parquet when the path ends in .parquet.
+
+    A CSV file is flushed at most every `FLUSH_SECONDS` and when the rows run out.
+
+    Args:
+        rows (Iterable[Dict[str, object]]): Rows keyed by `SUMMARY_FIELDS`.
+        output_path (str): Destination file.
+        batch_size (int): Rows buffered per Parquet row group.
+
+    Returns:
+        int: Number of rows written.
+    """
+    count = 0
+    if output_path.lower().endswith(".parquet"):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("Writing Parquet summaries requires pyarrow (pip install pyarrow)")
+
+        schema = pa.schema([("file", pa.string()), ("event", pa.int64())]
+                           + [(field, pa.float64()) for field in SUMMARY_FIELDS[2:-1]]
+                           + [("error", pa.string())])
+        with pq.ParquetWriter(output_path, schema) as writer:
+            buffer = []
+            for row in rows:
+                buffer.append(row)
+                count += 1
+                if len(buffer) >= batch_size:
+                    writer.write_table(pa.Table.from_pylist(buffer, schema=schema))
+                    buffer = []
+            if buffer:
+                writer.write_table(pa.Table.from_pylist(buffer, schema=schema))
+        return count
+
+    with open(output_path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=SUMMARY_FIELDS)
+        writer.writeheader()
+        flushed = time.monotonic()
+        for row in rows:
+            writer.writerow(row)
+            count += 1
+            if time.monotonic() - flushed >= FLUSH_SECONDS:
+                f.flush()
+                flushed = time.monotonic()
+    return count
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Runs the command-line interface (`sentinel-triage batch` or `python -m sentinel_triage.batch`)."""
+    parser = argparse.ArgumentParser(description="Run HIC, SI, HIP and GAMBIT over many CSV traces")
+    parser.add_argument("inputs", nargs="+", help="Directories or glob patterns of CSV files")
+    parser.add_argument("--frequency", type=float, required=True, help="Sampling frequency (time step in seconds, e.g., 0.0001)")
+    parser.add_argument("--output", type=str, default="triage_summary.csv", help="Summary file (.csv or .parquet)")
+    parser.add_argument("--x_location", type=int, default=2, help="Column index for X direction data (HIC and SI)")
+    parser.add_argument("--y_location", type=int, default=3, help="Column index for Y direction data (HIC and SI)")
+    parser.add_argument("--z_location", type=int, default=4, help="Column index for Z direction data (HIC and SI)")
+    parser.add_argument("--workers", type=int, default=None, help="Number of worker processes (default: CPU count)")
+    parser.add_argument("--chunksize", type=int, default=None, help="Files per worker task")
+    parser.add_argument("--event_threshold", type=float, default=None, help="Score each impact above this resultant (G) separately")
+    parser.add_argument("--event_off_threshold", type=float, default=None, help="Resultant (G) that ends an impact (default: half the threshold)")
+    parser.add_argument("--event_padding_ms", type=float, default=10.0, help="Signal kept before and after each impact (ms)")
+    parser.add_argument("--store", type=str, default=None, help="SQLite result store reused across runs")
+    parser.add_argument("--decimate", action="store_true", help="Score HIP and GAMBIT at the rate their filter bandwidth needs")
+    parser.add_argument("--accel_units", choices=ACCEL_UNITS, required=True,
+                        help="Units of the ax, ay, az columns, applied to all four criteria")
+    parser.add_argument("--readers", type=int, default=None, help="Read this many files ahead on threads while the workers score")
+    args = parser.parse_args(argv)
+
+    files = find_traces(args.inputs)
+    if not files:
+        parser.error("No CSV files matched the given inputs")
+    if args.readers and args.event_threshold is not None:
+        parser.error("--readers cannot be combined with --event_threshold")
+
+    rows = run_batch(files, args.frequency, args.x_location, args.y_location, args.z_location,
+                     workers=args.workers, chunksize=args.chunksize, threshold=args.event_threshold,
+                     off_threshold=args.event_off_threshold, padding_ms=args.event_padding_ms, store_path=args.store,
+                     readers=args.readers, decimate=args.decimate, accel_units=args.accel_units)
+    count = write_summary(rows, args.output)
+    print(f"Scored {count} {'event rows' if args.event_threshold is not None else 'traces'}, summary written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,27 @@
+import importlib
+
+# Calculator class name -> module defining it
+CALCULATOR_MODULES = {
+    "HICCalculator": "sentinel_triage.hic",
+    "SICalculator": "sentinel_triage.si",
+    "HIPCalculator": "sentinel_triage.hip",
+    "GAMBITCalculator": "sentinel_triage.gambit",
+}
+
+
+def load_calculator(name: str) -> type:
+    """
+    Imports a calculator class by name, loading only its own module.
+
+    The stand-alone scripts (e.g. `Head Injury Criterion/HIC_Calculator.py`) re-export
+    these same classes.
+
+    Args:
+        name (str): Class name, e.g. "HICCalculator".
+
+    Returns:
+        type: The calculator class.
+    """
+    if name not in CALCULATOR_MODULES:
+        raise ValueError(f"Unknown calculator: {name}")
+    return getattr(importlib.import_module(CALCULATOR_MODULES[name]), name)
@@ -0,0 +1,92 @@
+import argparse
+import importlib
+import os
+import sys
+from typing import List, Optional
+
+# Sub-command -> (module whose main(argv) runs it, summary); a module is imported only when its command runs
+COMMANDS = {
+    "hic": ("sentinel_triage.hic", "HIC15/HIC36 of one CSV file"),
+    "si": ("sentinel_triage.si", "Severity Index of one CSV file"),
+    "hip": ("sentinel_triage.hip", "Head Impact Power of one CSV file"),
+    "gambit": ("sentinel_triage.gambit", "GAMBIT of one CSV file"),
+    "batch": ("sentinel_triage.batch", "All four criteria over many CSV files"),
+    "sweep": ("sentinel_triage.sweep", "Criterion parameter grids over many CSV files, with ROC inputs"),
+    "worker": ("sentinel_triage.worker", "Warm process scoring JSON requests from stdin"),
+    "serve": ("sentinel_triage.service", "Asyncio service overlapping reads with scoring (stdin or HTTP)"),
+    "realtime": ("sentinel_triage.realtime", "Score a live or replayed stream as samples arrive"),
+    "nodout": ("sentinel_triage.lsdyna", "Extract a node's accelerations from LS-DYNA nodout"),
+    "synthetic": ("sentinel_triage.synthetic", "Write a synthetic head impact CSV"),
+}
+
+
+def usage() -> str:
+    """Returns the top-level help text."""
+    lines = ["usage: sentinel-triage [--profile] [--profile_output FILE] [--profile_stacks FILE] <command> [options]",
+             "", "commands:"]
+    lines += [f"  {name:<10} {summary}" for name, (_, summary) in COMMANDS.items()]
+    lines += ["", "profiling (before the command):",
+              "  --profile               Print a per-stage time breakdown to stderr when the command ends",
+              "  --profile_output FILE   Also write cProfile statistics of this process to FILE",
+              "  --profile_stacks FILE   Also write the stage stacks in folded format, for flame graph tools",
+              "", "Run 'sentinel-triage <command> --help' for the options of a command."]
+    return "\n".join(lines)
+
+
+def _parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="sentinel-triage", add_help=False, allow_abbrev=False)
+    parser.add_argument("--profile", action="store_true")
+    parser.add_argument("--profile_output", type=str, default=None)
+    parser.add_argument("--profile_stacks", type=str, default=None)
+    parser.add_argument("command", nargs="?")
+    parser.add_argument("options", nargs=argparse.REMAINDER)  # Everything after the command is its own
+    return parser
+
+
+def _writable(path: str) -> bool:
+    directory = os.path.dirname(os.path.abspath(path))
+    return os.path.isdir(directory) and os.access(directory, os.W_OK) and (not os.path.exists(path) or os.access(path, os.W_OK))
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """
+    Entry point of the `sentinel-triage` console script.
+
+    Args:
+        argv (Optional[List[str]]): Command followed by its options (default: sys.argv[1:]).
+    """
+    argv = sys.argv[1:] if argv is None else list(argv)
+    if not argv or argv[0] in ("-h", "--help"):
+        print(usage())
+        return
+    args = _parser().parse_args(argv)
+    if args.command not in COMMANDS:
+        print(usage(), file=sys.stderr)
+        sys.exit(f"sentinel-triage: unknown command {args.command!r}" if args.command else "sentinel-triage: missing command")
+    sys.argv[0] = f"sentinel-triage {args.command}"  # Program name in the command's own usage messages
+    run = importlib.import_module(COMMANDS[args.command][0]).main
+    if not (args.profile or args.profile_output or args.profile_stacks):
+        run(args.options)
+        return
+
+    # Profiles are written when the command ends, so refuse unwritable paths before it starts
+    for path in (args.profile_output, args.profile_stacks):
+        if path and not _writable(path):
+            sys.exit(f"sentinel-triage: cannot write profile to {path!r}")
+
+    from sentinel_triage import profiling
+
+    profile = None
+    try:
+        with profiling.profiled(args.profile_output) as profile:
+            run(args.options)
+    finally:  # Also when the command exits early, e.g. on a usage error
+        if profile is not None:
+            print(profile.format(), file=sys.stderr)
+            if args.profile_stacks:
+                with open(args.profile_stacks, "w") as f:
+                    f.write(profile.collapsed())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,335 @@
+import warnings
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+
+from sentinel_triage.calculators import load_calculator
+from sentinel_triage.store import ResultStore, array_digest
+from sentinel_triage.traces import KINEMATIC_COLUMNS, Trace, load_trace
+
+# Intermediate stage -> stages it is computed from
+STAGES = {
+    "resultant": (),
+    "resultant_cfc1000": ("resultant",),
+    "resultant_integral": ("resultant_cfc1000",),
+    "kinematics": (),
+    "hip_channels": ("kinematics",),
+    "gambit_channels": ("kinematics",),
+}
+
+# Criterion -> stages its kernel reads
+CRITERIA = {
+    "HIC": ("resultant_cfc1000", "resultant_integral"),
+    "SI": ("resultant_cfc1000",),
+    "HIP": ("kinematics", "hip_channels"),
+    "GAMBIT": ("gambit_channels",),
+}
+
+# Units the linear channels (ax, ay, az) of a trace can be given in. HIC and SI read them as
+# mm/s² and HIP and GAMBIT as G unless the engine is told which one the trace uses.
+ACCEL_UNITS = ("g", "mm/s2")
+MM_PER_G = 9810.0
+
+# Stages worth keeping in a `ResultStore`; the others are cheap views or sums of the raw trace
+STORED_STAGES = ("resultant_cfc1000", "resultant_integral", "hip_channels", "gambit_channels")
+
+
+class TriageEngine:
+    """
+    Scores one trace with several criteria, computing every shared intermediate only once.
+
+    HIC and SI read the same CFC 1000 filtered resultant; HIP and GAMBIT read the same
+    kinematic block, each through its own filter. `run` resolves the stages the requested
+    criteria need from `STAGES`, evaluates each of them once, and hands the results to
+    the criterion kernels.
+
+    With a `ResultStore`, scores and the `STORED_STAGES` are looked up before they are
+    computed, keyed on the trace content and on `parameters`. Changing only a threshold
+    (e.g. `engine.gambit.a_c`) or `limits_ms` then reuses the stored filtered channels.
+
+    The calculators read the linear channels in different units: HIC and SI in mm/s²,
+    HIP and GAMBIT in G. With `accel_units`, the channels are rescaled once, at the
+    "resultant" or "kinematics" stage, so that all four criteria see the same trace.
+    """
+
+    def __init__(self, frequency: float, x_location: int = 2, y_location: int = 3, z_location: int = 4,
+                 limits_ms: Tuple[float, ...] = (15.0, 36.0), store: Optional[ResultStore] = None,
+                 decimate: bool = False, accel_units: Optional[str] = None):
+        """
+        Args:
+            frequency (float): Sampling frequency (time step in seconds).
+            x_location (int): Column index for X direction data (HIC and SI).
+            y_location (int): Column index for Y direction data (HIC and SI).
+            z_location (int): Column index for Z direction data (HIC and SI).
+            limits_ms (Tuple[float, ...]): HIC window limits in milliseconds.
+            store (Optional[ResultStore]): On-disk store of earlier scores and intermediates.
+            decimate (bool): Score HIP and GAMBIT from channels decimated to their filter bandwidth
+                (see `HIPCalculator.decimation_factor`); HIC and SI always run at the full rate.
+            accel_units (Optional[str]): Units of the linear channels, "g" or "mm/s2". None keeps each
+                calculator's own convention (mm/s² for HIC and SI, G for HIP and GAMBIT), which only
+                suits files prepared separately for each pair, and warns.
+        """
+        if accel_units not in ACCEL_UNITS + (None,):
+            raise ValueError(f"Unknown acceleration units {accel_units!r}; choose from {', '.join(ACCEL_UNITS)}")
+        if accel_units is None:
+            warnings.warn("TriageEngine without accel_units reads ax, ay, az as mm/s² for HIC and SI and as G for "
+                          "HIP and GAMBIT, so one pair is off by 9810x; pass accel_units='g' or 'mm/s2'",
+                          UserWarning, stacklevel=2)
+        self.frequency = frequency
+        self.locations = (x_location, y_location, z_location)
+        self.limits_ms = limits_ms
+        self.store = store
+        self.accel_units = accel_units
+        self.hic = load_calculator("HICCalculator")(frequency)
+        self.si = load_calculator("SICalculator")(frequency)
+        self.hip = load_calculator("HIPCalculator")(frequency, decimate=decimate)
+        self.gambit = load_calculator("GAMBITCalculator")(frequency, decimate=decimate)
+        # Each stage works on one trace or on an (n_traces, n_samples, 7) stack; the sample
+        # axis is the last one of a resultant and the second to last one of a channel block
+        self._stages: Dict[str, Callable[[Union[Trace, np.ndarray], Dict[str, object]], np.ndarray]] = {
+            "resultant": lambda source, values: self.resultant(source),
+            "resultant_cfc1000": lambda source, values: self.hic.butter_lowpass_filter(
+                values["resultant"], axis=values["resultant"].ndim - 1),
+            "resultant_integral": lambda source, values: self.hic.cumulative_integral(values["resultant_cfc1000"]),
+            "kinematics": lambda source, values: self.kinematics(source),
+            "hip_channels": lambda source, values: self.hip.apply_filters(
+                values["kinematics"][..., 1:7], axis=values["kinematics"].ndim - 2),
+            "gambit_channels": lambda source, values: self.gambit.apply_filter(
+                values["kinematics"][..., 1:7], axis=values["kinematics"].ndim - 2),
+        }
+
+    def resultant(self, trace: Union[Trace, np.ndarray]) -> np.ndarray:
+        """
+        Computes the unfiltered resultant linear acceleration in G, as HIC and SI read it.
+
+        Args:
+            trace (Union[Trace, np.ndarray]): A loaded trace, or an (n_traces, n_samples, n_columns) stack.
+
+        Returns:
+            np.ndarray: Resultant along the sample axis (the last one).
+        """
+        resultant = self.si.calculate_magnitudes(trace, *self.locations)  # Reads the columns as mm/s²
+        return resultant * MM_PER_G if self.accel_units == "g" else resultant
+
+    def kinematics(self, trace: Union[Trace, np.ndarray]) -> np.ndarray:
+        """
+        Selects the Time, ax, ay, az, alphax, alphay, alphaz block as HIP and GAMBIT read it (linear channels in G).
+
+        Args:
+            trace (Union[Trace, np.ndarray]): A loaded trace, or an (n_traces, n_samples, 7) stack.
+
+        Returns:
+            np.ndarray: The block; a view of the trace unless the linear channels are rescaled.
+        """
+        block = trace.select(KINEMATIC_COLUMNS) if isinstance(trace, Trace) else trace
+        if self.accel_units != "mm/s2":
+            return block
+        block = np.array(block, dtype=float)
+        block[..., 1:4] /= MM_PER_G
+        return block
+
+    @staticmethod
+    def plan(criteria: Iterable[str]) -> List[str]:
+        """
+        Orders the stages needed by `criteria` so that every stage follows its inputs.
+
+        Args:
+            criteria (Iterable[str]): Names from `CRITERIA`.
+
+        Returns:
+            List[str]: Stage names, each listed once.
+        """
+        order = []
+
+        def visit(stage: str) -> None:
+            if stage in order:
+                return
+            for dependency in STAGES[stage]:
+                visit(dependency)
+            order.append(stage)
+
+        for criterion in criteria:
+            if criterion not in CRITERIA:
+                raise ValueError(f"Unknown criterion {criterion!r}; choose from {', '.join(CRITERIA)}")
+            for stage in CRITERIA[criterion]:
+                visit(stage)
+        return order
+
+    def parameters(self, name: str) -> Dict[str, Dict[str, object]]:
+        """
+        Lists every setting a stage or criterion result depends on, including its upstream stages.
+
+        Args:
+            name (str): A name from `STAGES` or `CRITERIA`.
+
+        Returns:
+            Dict[str, Dict[str, object]]: Stage or criterion name -> its own settings.
+        """
+        own = {
+            "resultant": {"locations": list(self.locations), "accel_units": self.accel_units},
+            "resultant_cfc1000": {"calculator": "HICCalculator", "frequency": self.hic.frequency,
+                                  "cutoff": self.hic.cutoff, "order": self.hic.order, "phase": self.hic.phase},
+            "resultant_integral": {"frequency": self.hic.frequency},
+            "kinematics": {"accel_units": self.accel_units},
+            "hip_channels": {"calculator": "HIPCalculator", "frequency": self.hip.frequency, "cutoff": self.hip.cutoff,
+                             "phase": self.hip.phase, "decimation": self.hip.decimation_factor()},
+            "gambit_channels": {"calculator": "GAMBITCalculator", "frequency": self.gambit.frequency,
+                                "cutoff": self.gambit.cutoff, "phase": self.gambit.phase,
+                                "decimation": self.gambit.decimation_factor()},
+            "HIC": {"frequency": self.hic.frequency, "limits_ms": list(self.limits_ms)},
+            "SI": {"frequency": self.si.frequency},
+            "HIP": {},
+            "GAMBIT": {"a_c": self.gambit.a_c, "alpha_c": self.gambit.alpha_c},
+        }
+        parameters = {}
+        pending = [name]
+        while pending:
+            current = pending.pop()
+            if current not in parameters:
+                parameters[current] = own[current]
+                pending.extend(CRITERIA.get(current, ()) + STAGES.get(current, ()))
+        return parameters
+
+    def stages(self, trace: Union[str, Trace, np.ndarray], criteria: Iterable[str] = tuple(CRITERIA),
+               digest: Optional[str] = None) -> Dict[str, object]:
+        """
+        Evaluates the intermediate stages needed by `criteria`.
+
+        A stage that fails is stored as its exception, so the criteria depending on it
+        fail with the same message without recomputing it. A stage found in the store is
+        loaded instead, and the stages it was computed from are skipped.
+
+        Args:
+            trace (Union[str, Trace, np.ndarray]): Path to the CSV file, a loaded trace, or an
+                (n_traces, n_samples, 7) stack in the Time, ax, ay, az, alphax, alphay, alphaz layout.
+            criteria (Iterable[str]): Names from `CRITERIA`.
+            digest (Optional[str]): Content digest of the trace, if already computed.
+
+        Returns:
+            Dict[str, object]: Stage name -> array (or the exception it raised).
+        """
+        if isinstance(trace, str):
+            trace = load_trace(trace)
+        criteria = list(criteria)
+        self.plan(criteria)
+        if self.store is not None and digest is None:
+            digest = array_digest(trace.data if isinstance(trace, Trace) else trace)
+        values = {}
+
+        def resolve(stage: str) -> object:
+            if stage in values:
+                return values[stage]
+            stored = self.store is not None and stage in STORED_STAGES
+            if stored:
+                values[stage] = self.store.get_artifact(digest, stage, self.parameters(stage))
+                if values[stage] is not None:
+                    return values[stage]
+            failed = next((value for value in map(resolve, STAGES[stage]) if isinstance(value, Exception)), None)
+            if failed is not None:
+                values[stage] = failed
+                return failed
+            try:
+                values[stage] = self._stages[stage](trace, values)
+            except Exception as e:
+                values[stage] = e
+                return e
+            if stored:
+                self.store.put_artifact(digest, stage, self.parameters(stage), values[stage])
+            return values[stage]
+
+        for criterion in criteria:
+            for stage in CRITERIA[criterion]:
+                resolve(stage)
+        return values
+
+    def run(self, trace: Union[str, Trace], criteria: Iterable[str] = tuple(CRITERIA),
+            strict: bool = True) -> Dict[str, object]:
+        """
+        Scores one trace with the requested criteria.
+
+        Args:
+            trace (Union[str, Trace]): Path to the CSV file, or a loaded trace.
+            criteria (Iterable[str]): Any of "HIC", "SI", "HIP" and "GAMBIT".
+            strict (bool): Raise the first error; otherwise collect the errors in the "error" field.
+
+        Returns:
+            Dict[str, object]: Scores keyed like `batch.SUMMARY_FIELDS` ("HIC15", "HIC15_t1", ...,
+            "SI", "HIP_m", "GAMBIT") plus "error".
+        """
+        criteria = list(criteria)
+        self.plan(criteria)
+        results = {}
+        digest = None
+        if self.store is not None:
+            if isinstance(trace, str):
+                trace = load_trace(trace)
+            digest = array_digest(trace.data if isinstance(trace, Trace) else trace)
+            for criterion in list(criteria):
+                scores = self.store.get_result(digest, criterion, self.parameters(criterion))
+                if scores is not None:
+                    results.update({key: self._value(value) if isinstance(value, list) else value
+                                    for key, value in scores.items()})
+                    criteria.remove(criterion)
+
+        values = self.stages(trace, criteria, digest)
+        errors = []
+        for criterion in criteria:
+            try:
+                for stage in CRITERIA[criterion]:
+                    if isinstance(values[stage], Exception):
+                        raise values[stage]
+                scores = getattr(self, f"_score_{criterion.lower()}")(values)
+            except Exception as e:
+                if strict:
+                    raise
+                errors.append(f"{criterion}: {e}")
+                continue
+            results.update(scores)
+            if self.store is not None:
+                self.store.put_result(digest, criterion, self.parameters(criterion), scores)
+        results["error"] = "; ".join(errors) or None
+        return results
+
+    def run_stack(self, data: np.ndarray, criteria: Iterable[str] = tuple(CRITERIA)) -> Dict[str, np.ndarray]:
+        """
+        Scores a stack of equal-length traces, with every stage broadcast along the trace axis.
+
+        Args:
+            data (np.ndarray): Array with shape (n_traces, n_samples, 7) in the Time, ax, ay, az,
+                alphax, alphay, alphaz layout (HIC and SI read the columns given to the engine).
+            criteria (Iterable[str]): Any of "HIC", "SI", "HIP" and "GAMBIT".
+
+        Returns:
+            Dict[str, np.ndarray]: The keys of `run`, each holding one value per trace.
+        """
+        data = np.asarray(data, dtype=float)
+        if data.ndim != 3 or data.shape[2] < len(KINEMATIC_COLUMNS):
+            raise ValueError(f"Expected an (n_traces, n_samples, {len(KINEMATIC_COLUMNS)}) array, got shape {data.shape}")
+        results = self.run(data, criteria)
+        del results["error"]
+        return results
+
+    @staticmethod
+    def _value(value: Union[float, np.ndarray]) -> Union[float, np.ndarray]:
+        return float(value) if np.ndim(value) == 0 else np.asarray(value, dtype=float)
+
+    def _score_hic(self, values: Dict[str, object]) -> Dict[str, object]:
+        magnitudes, cumulative = values["resultant_cfc1000"], values["resultant_integral"]
+        if magnitudes.ndim == 2:
+            windows = self.hic.calculate_hic_magnitudes_batch(magnitudes, self.limits_ms, cumulative)
+        else:
+            windows = self.hic.calculate_hic_magnitudes(magnitudes, self.limits_ms, cumulative)
+        scores = {}
+        for name, (hic_value, t1, t2) in windows.items():
+            scores[name], scores[f"{name}_t1"], scores[f"{name}_t2"] = hic_value, t1, t2
+        return scores
+
+    def _score_si(self, values: Dict[str, object]) -> Dict[str, object]:
+        return {"SI": self._value(self.si.severity_index(values["resultant_cfc1000"]))}
+
+    def _score_hip(self, values: Dict[str, object]) -> Dict[str, object]:
+        time = self.hip.decimate_time(values["kinematics"][..., 0])
+        return {"HIP_m": self._value(self.hip.calculate_hip_filtered(time, values["hip_channels"]))}
+
+    def _score_gambit(self, values: Dict[str, object]) -> Dict[str, object]:
+        return {"GAMBIT": self._value(self.gambit.calculate_gambit_filtered(values["gambit_channels"]))}
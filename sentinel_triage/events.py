@@ -0,0 +1,48 @@
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+
+def detect_events(resultant: np.ndarray, on_threshold: float, off_threshold: Optional[float] = None,
+                  padding: int = 0, min_gap: int = 0) -> List[Tuple[int, int]]:
+    """
+    Finds impact windows in a resultant acceleration signal with threshold hysteresis.
+
+    An event starts when the resultant reaches `on_threshold` and lasts until it falls
+    to `off_threshold` or below, so noise around a single threshold does not split one
+    impact into many. Each window is then widened by `padding` samples on both sides,
+    and windows closer than `min_gap` samples are merged.
+
+    Args:
+        resultant (np.ndarray): Resultant acceleration, e.g. from `SICalculator.calculate_magnitudes`.
+        on_threshold (float): Level that starts an event.
+        off_threshold (Optional[float]): Level that ends an event (default: half of `on_threshold`).
+        padding (int): Samples added before and after each event.
+        min_gap (int): Events separated by fewer samples than this are merged.
+
+    Returns:
+        List[Tuple[int, int]]: (start, stop) sample ranges, stop exclusive, in time order.
+    """
+    resultant = np.asarray(resultant, dtype=float)
+    if off_threshold is None:
+        off_threshold = 0.5 * on_threshold
+    if off_threshold > on_threshold:
+        raise ValueError("off_threshold must not exceed on_threshold")
+
+    # 1 = switch on, 0 = switch off, -1 = keep the previous state
+    marks = np.where(resultant >= on_threshold, 1, np.where(resultant <= off_threshold, 0, -1))
+    decided = np.where(marks >= 0, np.arange(len(marks)), 0)
+    np.maximum.accumulate(decided, out=decided)
+    active = marks[decided] == 1
+
+    edges = np.diff(np.concatenate(([0], active.view(np.int8), [0])))
+    starts = np.flatnonzero(edges == 1)
+    stops = np.flatnonzero(edges == -1)
+
+    events = []
+    for start, stop in zip(np.maximum(starts - padding, 0), np.minimum(stops + padding, len(resultant))):
+        if events and start - events[-1][1] < min_gap:
+            events[-1] = (events[-1][0], int(stop))
+        else:
+            events.append((int(start), int(stop)))
+    return events
@@ -0,0 +1,221 @@
+from functools import lru_cache
+from typing import Dict, Tuple
+
+import numpy as np
+
+from sentinel_triage import profiling
+
+# Distinct (order, cutoff, dt, design type) combinations kept in memory
+FILTER_CACHE_SIZE = 128
+
+# SAE J211 channel frequency classes and the -3 dB corner (Hz) used for each, 1.65 x CFC
+CFC_CUTOFFS = {60: 100.0, 180: 300.0, 600: 1000.0, 1000: 1650.0}
+
+# "zero": forward-backward (sosfiltfilt), "causal": single forward pass (sosfilt)
+PHASE_MODES = ("zero", "causal")
+
+# A decimated channel keeps at least this many samples per second for each Hz of its
+# criterion's bandwidth; peaks of components at the bandwidth are then sampled to
+# within 1 - cos(pi / 20), about 1.2%
+DECIMATION_MARGIN = 20.0
+
+# Stopband attenuation (dB) of the anti-aliasing FIR in front of a decimation
+DECIMATION_ATTENUATION = 80.0
+
+
+@lru_cache(maxsize=FILTER_CACHE_SIZE)
+def _design(order: int, cutoff: float, dt: float, btype: str, output: str) -> Tuple[np.ndarray, ...]:
+    from scipy.signal import butter  # SciPy loads on the first design, not on import
+
+    nyquist = 0.5 / dt  # Nyquist frequency
+    normal_cutoff = cutoff / nyquist
+    coefficients = butter(order, normal_cutoff, btype=btype, analog=False, output=output)
+    if output == "sos":
+        coefficients = (coefficients,)
+    for array in coefficients:
+        array.setflags(write=False)  # Shared between every caller of the cache
+    return tuple(coefficients)
+
+
+def butter_lowpass(order: int, cutoff: float, dt: float) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Returns Butterworth low-pass filter coefficients, designing each combination only once.
+
+    Args:
+        order (int): Filter order.
+        cutoff (float): Cutoff frequency in Hz.
+        dt (float): Time step in seconds.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Read-only filter coefficients (b, a).
+    """
+    return _design(int(order), float(cutoff), float(dt), "low", "ba")
+
+
+def butter_lowpass_sos(order: int, cutoff: float, dt: float) -> np.ndarray:
+    """
+    Returns a Butterworth low-pass filter as second-order sections, designing each combination only once.
+
+    Args:
+        order (int): Filter order.
+        cutoff (float): Cutoff frequency in Hz.
+        dt (float): Time step in seconds.
+
+    Returns:
+        np.ndarray: Read-only second-order sections with shape (n_sections, 6).
+    """
+    return _design(int(order), float(cutoff), float(dt), "low", "sos")[0]
+
+
+def cfc_sos(cfc: int, dt: float, order: int = 2) -> np.ndarray:
+    """
+    Returns the second-order sections of an SAE J211 channel frequency class filter.
+
+    Args:
+        cfc (int): Channel frequency class: 60, 180, 600 or 1000.
+        dt (float): Time step in seconds.
+        order (int): Butterworth order of each pass.
+
+    Returns:
+        np.ndarray: Read-only second-order sections.
+    """
+    if cfc not in CFC_CUTOFFS:
+        raise ValueError(f"Unknown CFC {cfc}; choose from {', '.join(map(str, CFC_CUTOFFS))}")
+    return butter_lowpass_sos(order, CFC_CUTOFFS[cfc], dt)
+
+
+@lru_cache(maxsize=FILTER_CACHE_SIZE)
+def _decimation_fir(factor: int, dt: float, bandwidth: float) -> np.ndarray:
+    from scipy.signal import firwin, kaiserord
+
+    # Only content that folds into [0, bandwidth] must be suppressed: the criterion's own filter,
+    # run after decimation, removes whatever lands above it. The stopband can therefore start
+    # at the decimated rate minus the bandwidth, which keeps the FIR short.
+    width = (1.0 / (dt * factor) - 2 * bandwidth) * 2 * dt  # Transition width relative to Nyquist
+    if width <= 0:
+        raise ValueError(f"Decimating by {factor} at dt={dt} leaves no room above the {bandwidth:g} Hz bandwidth")
+    numtaps, beta = kaiserord(DECIMATION_ATTENUATION, min(width, 1.0))
+    taps = firwin(numtaps | 1, 1.0 / factor, window=("kaiser", beta))
+    taps.setflags(write=False)
+    return taps
+
+
+def decimation_factor(dt: float, bandwidth: float, margin: float = DECIMATION_MARGIN, min_rate: float = 0.0) -> int:
+    """
+    Returns the largest integer decimation factor that keeps a channel's rate at or above
+    `margin` times its bandwidth (and at or above `min_rate`).
+
+    Args:
+        dt (float): Time step of the input in seconds.
+        bandwidth (float): Highest frequency (Hz) the criterion reads, e.g. its filter cutoff.
+        margin (float): Decimated samples per second per Hz of bandwidth.
+        min_rate (float): Lowest decimated sampling rate in Hz.
+
+    Returns:
+        int: Decimation factor, 1 when the input is already at or below that rate.
+    """
+    return max(1, int(1.0 / (dt * max(margin * bandwidth, min_rate)) + 1e-9))
+
+
+def decimate(data: np.ndarray, factor: int, dt: float, bandwidth: float, axis: int = 0) -> np.ndarray:
+    """
+    Reduces the sampling rate by an integer factor with an anti-aliased polyphase filter.
+
+    The Kaiser-window FIR (`DECIMATION_ATTENUATION` dB) only protects [0, bandwidth] from
+    aliasing, so it must be followed by a low-pass at or below `bandwidth`, normally the
+    criterion's own filter designed for the decimated time step.
+
+    Args:
+        data (np.ndarray): Input data; any shape with time along `axis`.
+        factor (int): Decimation factor, e.g. from `decimation_factor`.
+        dt (float): Time step of the input in seconds.
+        bandwidth (float): Highest frequency (Hz) that must survive unaliased.
+        axis (int): Time axis of `data`.
+
+    Returns:
+        np.ndarray: Samples 0, factor, 2 * factor, ... of the anti-aliased input (ceil(n / factor) of them).
+    """
+    if factor == 1:
+        return np.asarray(data, dtype=float)
+    from scipy.signal import resample_poly
+
+    with profiling.stage("decimate", np.size(data)):
+        return resample_poly(data, 1, factor, axis=axis, window=_decimation_fir(int(factor), float(dt), float(bandwidth)))
+
+
+def sos_filter(sos: np.ndarray, data: np.ndarray, phase: str = "zero", axis: int = 0) -> np.ndarray:
+    """
+    Applies second-order sections along the time axis.
+
+    Args:
+        sos (np.ndarray): Second-order sections, e.g. from `butter_lowpass_sos` or `cfc_sos`.
+        data (np.ndarray): Input data; any shape with time along `axis`.
+        phase (str): "zero" for a zero-phase forward-backward pass, "causal" for a single forward pass.
+        axis (int): Time axis of `data`.
+
+    Returns:
+        np.ndarray: Filtered data.
+    """
+    from scipy.signal import sosfilt, sosfiltfilt
+
+    sos = np.array(sos, dtype=np.float64)  # scipy's sosfilt needs a writable copy of the cached sections
+    if phase == "zero":
+        with profiling.stage("filter", np.size(data)):
+            return sosfiltfilt(sos, data, axis=axis)
+    if phase == "causal":
+        with profiling.stage("filter", np.size(data)):
+            return sosfilt(sos, data, axis=axis)
+    raise ValueError(f"Unknown phase mode {phase!r}; choose from {', '.join(PHASE_MODES)}")
+
+
+def lowpass(data: np.ndarray, cutoff: float, dt: float, order: int = 2, phase: str = "zero",
+            axis: int = 0) -> np.ndarray:
+    """
+    Applies a Butterworth low-pass filter in second-order-section form.
+
+    Args:
+        data (np.ndarray): Input data; any shape with time along `axis`.
+        cutoff (float): Cutoff frequency in Hz.
+        dt (float): Time step in seconds.
+        order (int): Filter order.
+        phase (str): "zero" or "causal", see `sos_filter`.
+        axis (int): Time axis of `data`.
+
+    Returns:
+        np.ndarray: Filtered data.
+    """
+    return sos_filter(butter_lowpass_sos(order, cutoff, dt), data, phase, axis)
+
+
+def cfc_filter(data: np.ndarray, cfc: int, dt: float, phase: str = "zero", axis: int = 0) -> np.ndarray:
+    """
+    Applies an SAE J211 CFC 60/180/600/1000 filter.
+
+    Args:
+        data (np.ndarray): Input data; any shape with time along `axis`.
+        cfc (int): Channel frequency class: 60, 180, 600 or 1000.
+        dt (float): Time step in seconds.
+        phase (str): "zero" or "causal", see `sos_filter`.
+        axis (int): Time axis of `data`.
+
+    Returns:
+        np.ndarray: Filtered data.
+    """
+    return sos_filter(cfc_sos(cfc, dt), data, phase, axis)
+
+
+def filter_cache_info() -> Dict[str, int]:
+    """
+    Reports the filter-design cache counters for this process.
+
+    Returns:
+        Dict[str, int]: Hits, misses, maximum size and current size of the cache.
+    """
+    info = _design.cache_info()
+    return {"hits": info.hits, "misses": info.misses, "maxsize": info.maxsize, "currsize": info.currsize}
+
+
+def clear_filter_cache() -> None:
+    """Drops every cached design and resets the counters."""
+    _design.cache_clear()
+    _decimation_fir.cache_clear()
@@ -0,0 +1,232 @@
+import numpy as np
+import argparse
+from typing import List, Optional, Union
+
+from sentinel_triage import filters, profiling
+from sentinel_triage.traces import KINEMATIC_COLUMNS, Trace, load_trace
+
+# Cutoff of the GAMBIT filter (400-500 Hz range per Newman, page 4, using 400 Hz as conservative choice)
+BANDWIDTH = 400.0
+A_C = 250.0  # Critical translational acceleration threshold (G), per Newman (1985), page 10
+ALPHA_C = 10000.0  # Critical rotational acceleration threshold (rad/s²), per Newman (1985), page 10
+
+class GAMBITCalculator:
+    def __init__(self, frequency: float, phase: str = "zero", decimate: bool = False):
+        """
+        Initialize with sampling frequency (time step in seconds) and filter phase mode ("zero" or "causal").
+
+        With `decimate`, channels are reduced to about `decimation_margin` × `cutoff` before
+        filtering and the maxima; see `decimation_factor`.
+        """
+        self.frequency = frequency
+        self.dt = frequency  # Time step (e.g., 0.001 s for 1 kHz)
+        self.phase = phase
+        self.cutoff = BANDWIDTH  # Filter corner (Hz)
+        self.decimate = decimate
+        self.decimation_margin = filters.DECIMATION_MARGIN
+        self.a_c = A_C
+        self.alpha_c = ALPHA_C
+
+    def butter_lowpass(self, cutoff: float, order: int = 4):
+        """
+        Create Butterworth low-pass filter coefficients, reusing the shared design cache.
+
+        Args:
+            cutoff (float): Cutoff frequency in Hz (400-500 Hz per Newman, page 4).
+            order (int): Filter order (4th order per Newman, page 4).
+
+        Returns:
+            Tuple: Filter coefficients (b, a).
+        """
+        return filters.butter_lowpass(order, cutoff, self.dt)
+
+    def apply_filter(self, data: np.ndarray, axis: int = 0) -> np.ndarray:
+        """
+        Apply a 400 Hz Butterworth filter per Newman (1985), page 4.
+
+        When decimating, the channels first go through `filters.decimate` and the filter is
+        designed for the decimated time step.
+
+        Args:
+            data (np.ndarray): Input data array, e.g. one time series, an (n_samples, n_channels)
+                block, or an (n_traces, n_samples, n_channels) stack of equal-length traces.
+            axis (int): Time axis of `data` (0 for a single trace, 1 for a stack).
+
+        Returns:
+            np.ndarray: Filtered data, with every `decimation_factor()`-th sample when decimating.
+        """
+        factor = self.decimation_factor()
+        data = filters.decimate(data, factor, self.dt, self.cutoff, axis)
+        filtered = filters.sos_filter(self.filter_sos(self.dt * factor), data, self.phase, axis)
+        return filtered
+
+    def filter_sos(self, dt: Optional[float] = None) -> np.ndarray:
+        """
+        Second-order sections of the 400 Hz (`cutoff`), 4th order Butterworth filter used by `apply_filter`.
+
+        Args:
+            dt (Optional[float]): Time step to design for (default: the calculator's).
+
+        Returns:
+            np.ndarray: Second-order sections, shape (n_sections, 6).
+        """
+        return filters.butter_lowpass_sos(4, self.cutoff, self.dt if dt is None else dt)
+
+    def decimation_factor(self) -> int:
+        """
+        Returns:
+            int: Samples combined into one by `apply_filter` (1 unless `decimate` is set).
+        """
+        if not self.decimate:
+            return 1
+        return filters.decimation_factor(self.dt, self.cutoff, self.decimation_margin)
+
+    @staticmethod
+    def read_csv(file_path: str) -> np.ndarray:
+        """
+        Read CSV file with Time, ax, ay, az, alphax, alphay, alphaz columns.
+
+        Args:
+            file_path (str): Path to CSV file.
+
+        Returns:
+            np.ndarray: Data array with shape (n_samples, 7).
+        """
+        return load_trace(file_path).select(KINEMATIC_COLUMNS)
+
+    def calculate_gambit(self, data: Union[np.ndarray, Trace]) -> float:
+        """
+        Calculate GAMBIT per simplified formula G = (a_m / 250) + (alpha_m / 10000) from Newman (1985), page 10.
+
+        Args:
+            data (Union[np.ndarray, Trace]): Array with columns [Time, ax, ay, az, alphax, alphay, alphaz], or a loaded trace.
+                              ax, ay, az in G; alphax, alphay, alphaz in rad/s².
+
+        Returns:
+            float: GAMBIT value (G).
+        """
+        if isinstance(data, Trace):
+            data = data.select(KINEMATIC_COLUMNS)
+
+        # Apply 400 Hz filter to the ax, ay, az, alphax, alphay, alphaz block at once (per Newman, page 4)
+        filtered = self.apply_filter(data[:, 1:7])
+        return self.calculate_gambit_filtered(filtered)
+
+    def calculate_gambit_filtered(self, filtered: np.ndarray) -> Union[float, np.ndarray]:
+        """
+        Calculate GAMBIT from channels that have already been through `apply_filter`.
+
+        Args:
+            filtered (np.ndarray): Filtered ax, ay, az, alphax, alphay, alphaz block with shape (n_samples, 6),
+                or (n_traces, n_samples, 6) for a stack.
+
+        Returns:
+            Union[float, np.ndarray]: GAMBIT value (G), one per trace for a stack.
+        """
+        with profiling.stage("GAMBIT", np.size(filtered)):
+            # Compute resultant accelerations at each time step
+            a_resultant = np.sqrt(np.sum(filtered[..., :3]**2, axis=-1))  # Resultant translational acceleration (G)
+            alpha_resultant = np.sqrt(np.sum(filtered[..., 3:6]**2, axis=-1))  # Resultant rotational acceleration (rad/s²)
+
+            # Extract maximum values (a_m and alpha_m)
+            a_m = np.max(a_resultant, axis=-1)
+            alpha_m = np.max(alpha_resultant, axis=-1)
+
+        # Calculate GAMBIT (simplified linear form, page 10)
+        gambit = (a_m / self.a_c) + (alpha_m / self.alpha_c)
+        return gambit
+
+    def calculate_gambit_batch(self, data: np.ndarray) -> np.ndarray:
+        """
+        Calculate GAMBIT for a stack of equal-length traces in one call.
+
+        Args:
+            data (np.ndarray): Array with shape (n_traces, n_samples, 7), columns as in `calculate_gambit`.
+
+        Returns:
+            np.ndarray: GAMBIT values (G), one per trace.
+        """
+        data = np.asarray(data, dtype=float)
+        if data.ndim != 3 or data.shape[2] < 7:
+            raise ValueError(f"Expected an (n_traces, n_samples, 7) array, got shape {data.shape}")
+        return self.calculate_gambit_filtered(self.apply_filter(data[:, :, 1:7], axis=1))
+
+    def process_file(self, file_path: Union[str, Trace]) -> float:
+        """
+        Process CSV file and calculate GAMBIT.
+
+        Args:
+            file_path (Union[str, Trace]): Path to CSV file, or a trace already loaded with `load_trace`.
+
+        Returns:
+            float: GAMBIT value (G).
+        """
+        data = file_path if isinstance(file_path, Trace) else self.read_csv(file_path)
+        gambit_value = self.calculate_gambit(data)
+        return gambit_value
+
+
+class StreamingGAMBIT:
+    """Running GAMBIT over filtered channel blocks that arrive one after another."""
+
+    def __init__(self, a_c: float = A_C, alpha_c: float = ALPHA_C):
+        """
+        Args:
+            a_c (float): Critical translational acceleration (G), as `GAMBITCalculator.a_c`.
+            alpha_c (float): Critical rotational acceleration (rad/s²), as `GAMBITCalculator.alpha_c`.
+        """
+        self.a_c = a_c
+        self.alpha_c = alpha_c
+        self.a_m = 0.0
+        self.alpha_m = 0.0
+
+    def update(self, filtered: np.ndarray) -> None:
+        """
+        Adds the next block of filtered channels to the running maxima.
+
+        Args:
+            filtered (np.ndarray): Filtered ax, ay, az, alphax, alphay, alphaz block, shape (n_samples, 6).
+        """
+        filtered = np.asarray(filtered, dtype=float)
+        if len(filtered) == 0:
+            return
+        self.a_m = max(self.a_m, float(np.max(np.sqrt(np.sum(filtered[:, :3]**2, axis=-1)))))
+        self.alpha_m = max(self.alpha_m, float(np.max(np.sqrt(np.sum(filtered[:, 3:6]**2, axis=-1)))))
+
+    def result(self) -> float:
+        """
+        Returns:
+            float: GAMBIT value (G) of all samples seen so far.
+        """
+        return (self.a_m / self.a_c) + (self.alpha_m / self.alpha_c)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Runs the command-line interface (`sentinel-triage gambit` or the stand-alone script)."""
+    # Command-line argument parsing with default file_path
+    parser = argparse.ArgumentParser(description="Calculate GAMBIT from CSV data per Newman (1985).")
+    parser.add_argument("--frequency", type=float, required=True, help="Sampling frequency (time step in seconds, e.g., 0.001 for 1 kHz)")
+    parser.add_argument("--file_path", type=str, 
+                        default='impact_data.csv',  # Adjust default path as needed
+                        help="Path to CSV file with acceleration data")
+    parser.add_argument("--decimate", action="store_true", help="Reduce the channels to the rate GAMBIT's 400 Hz bandwidth needs")
+    args = parser.parse_args(argv)
+
+    # Initialize calculator and compute GAMBIT
+    gambit_calculator = GAMBITCalculator(args.frequency, decimate=args.decimate)
+    print("GAMBIT model used in the provided Python code is the linear method")
+    try:
+        gambit_value = gambit_calculator.process_file(args.file_path)
+        print(f"GAMBIT Value: {gambit_value:.3f}")
+        if gambit_value <= 1.0:
+            print("Result: No unacceptable injury (G ≤ 1)")
+        else:
+            print("Result: Exceeds threshold, injury likely (G > 1)")
+    except Exception as e:
+        print(f"Error: {e}")
+
+    # Example usage: python GAMBIT_Calculator.py --frequency 0.001 --file_path "impact_data.csv"
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,646 @@
+import os
+from collections.abc import Mapping
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+import numpy as np
+import argparse
+
+from sentinel_triage import filters, kernels, profiling
+from sentinel_triage.streaming import CausalFilter, iter_csv_chunks
+from sentinel_triage.traces import Trace, load_trace
+
+# Share of tiles still able to beat the first tile's windows above which `search_windows` stops
+# pruning and sweeps every window length once; flat or noisy signals leave almost every tile open
+SWEEP_FRACTION = 0.125
+
+
+class AccelerationSeries(Mapping):
+    """
+    Filtered resultant acceleration held as two contiguous float64 arrays.
+
+    It reads like the dict returned by `HICCalculator.get_data` (sample index -> (time, magnitude)),
+    but stores 16 bytes per sample instead of a tuple and two boxed floats.
+    """
+
+    __slots__ = ("time", "magnitude")
+
+    def __init__(self, time: np.ndarray, magnitude: np.ndarray):
+        """
+        Args:
+            time (np.ndarray): Sample times in seconds.
+            magnitude (np.ndarray): Resultant acceleration magnitudes (G), one per time.
+        """
+        self.time = np.ascontiguousarray(time, dtype=np.float64)
+        self.magnitude = np.ascontiguousarray(magnitude, dtype=np.float64)
+        if self.time.shape != self.magnitude.shape:
+            raise ValueError(f"time and magnitude differ in shape: {self.time.shape} vs {self.magnitude.shape}")
+
+    def __getitem__(self, index: int) -> Tuple[float, float]:
+        if not 0 <= index < len(self.time):
+            raise KeyError(index)
+        return float(self.time[index]), float(self.magnitude[index])
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(range(len(self.time)))
+
+    def __len__(self) -> int:
+        return len(self.time)
+
+    def __repr__(self) -> str:
+        return f"AccelerationSeries(samples={len(self)})"
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the two arrays."""
+        return self.time.nbytes + self.magnitude.nbytes
+
+    def to_dict(self) -> Dict[int, Tuple[float, float]]:
+        """Returns the legacy sample index -> (time, magnitude) dict."""
+        return dict(enumerate(zip(self.time.tolist(), self.magnitude.tolist())))
+
+
+def _magnitudes(acceleration: Union[AccelerationSeries, Dict[int, Tuple[float, float]], np.ndarray]) -> np.ndarray:
+    """Returns the magnitudes of a series without copying, or gathers them from a legacy dict."""
+    if isinstance(acceleration, AccelerationSeries):
+        return acceleration.magnitude
+    if isinstance(acceleration, dict):
+        return np.fromiter((value[1] for value in acceleration.values()), dtype=float, count=len(acceleration))
+    return np.asarray(acceleration, dtype=float)
+
+
+class HICCalculator:
+    def __init__(self, frequency: float, cutoff: float = 1650.0, order: int = 2, phase: str = "causal"):
+        self.frequency = frequency
+        self.cutoff = cutoff
+        self.order = order
+        self.phase = phase  # "causal" (single pass) or "zero" (forward-backward)
+
+    def butter_lowpass(self):
+        """
+        Creates a Butterworth low-pass filter, reusing the shared design cache.
+
+        Returns:
+            Tuple: Filter coefficients (b, a).
+        """
+        return filters.butter_lowpass(self.order, self.cutoff, self.frequency)
+
+    def butter_lowpass_filter(self, data, axis: int = 0):
+        """
+        Applies a Butterworth low-pass filter to the data as second-order sections.
+
+        Args:
+            data (list): The data to filter.
+            axis (int): Time axis of `data` (1 for an (n_traces, n_samples) stack).
+
+        Returns:
+            np.ndarray: Filtered data.
+        """
+        return filters.lowpass(np.asarray(data, dtype=float), self.cutoff, self.frequency, self.order, self.phase, axis)
+
+    def get_file(self, file_path: str) -> str:
+        """
+        Returns the path to the CSV file.
+        """
+        return file_path.replace(os.sep, os.path.sep)
+
+    def get_series(self, path: Union[str, Trace], x_location: int, y_location: int, z_location: int) -> AccelerationSeries:
+        """
+        Reads acceleration data from a CSV file and calculates the filtered magnitude for each time step.
+
+        Args:
+            path (Union[str, Trace]): Path to the input CSV file, or a trace already loaded with `load_trace`.
+            x_location (int): Column index for X direction data.
+            y_location (int): Column index for Y direction data.
+            z_location (int): Column index for Z direction data.
+
+        Returns:
+            AccelerationSeries: Times and filtered magnitudes as contiguous arrays.
+        """
+        trace = path if isinstance(path, Trace) else load_trace(path)
+        data = trace.data
+
+        magnitudes = np.sqrt(data[:, x_location - 1]**2 + data[:, y_location - 1]**2 + data[:, z_location - 1]**2) / 9810
+        times = np.round(np.arange(len(trace)) * self.frequency, 5)
+
+        # Filter the magnitude data
+        return AccelerationSeries(times, self.butter_lowpass_filter(magnitudes))
+
+    def get_data(self, path: Union[str, Trace], x_location: int, y_location: int, z_location: int) -> Dict[int, Tuple[float, float]]:
+        """
+        Reads acceleration data from a CSV file and calculates the magnitude for each time step.
+
+        Kept for existing callers; `get_series` returns the same samples without a Python object per sample.
+
+        Args:
+            path (Union[str, Trace]): Path to the input CSV file, or a trace already loaded with `load_trace`.
+            x_location (int): Column index for X direction data.
+            y_location (int): Column index for Y direction data.
+            z_location (int): Column index for Z direction data.
+
+        Returns:
+            Dict[int, Tuple[float, float]]: A dictionary with time step as the key and a tuple of time and magnitude.
+        """
+        return self.get_series(path, x_location, y_location, z_location).to_dict()
+
+    def cumulative_integral(self, magnitudes: np.ndarray) -> np.ndarray:
+        """
+        Computes the running trapezoidal integral of the magnitude signal.
+
+        Args:
+            magnitudes (np.ndarray): Filtered acceleration magnitudes (G), or one row per trace.
+
+        Returns:
+            np.ndarray: Cumulative integral with a leading zero, same shape as the input.
+        """
+        magnitudes = np.asarray(magnitudes, dtype=float)
+        with profiling.stage("integrate", magnitudes.size):
+            areas = 0.5 * self.frequency * (magnitudes[..., :-1] + magnitudes[..., 1:])
+            return np.concatenate((np.zeros(magnitudes.shape[:-1] + (1,)), np.cumsum(areas, axis=-1)), axis=-1)
+
+    def calculate_hic(self, acceleration: Union[AccelerationSeries, Dict[int, Tuple[float, float]]],
+                      hic_ms: float) -> Tuple[str, float]:
+        """
+        Calculates the Head Injury Criterion (HIC) over various time windows.
+
+        Args:
+            acceleration (Union[AccelerationSeries, Dict[int, Tuple[float, float]]]): Acceleration data with
+                time and magnitude, from `get_series` (or the legacy dict from `get_data`).
+            hic_ms (float): Time window for HIC calculation in milliseconds.
+
+        Returns:
+            Tuple[str, float]: The time window and the maximum HIC value.
+        """
+        with profiling.stage("HIC", len(acceleration)):
+            hic_s = hic_ms / 1000
+            hic_window = int(hic_ms / (self.frequency * 1000))
+
+            cumulative = self.cumulative_integral(_magnitudes(acceleration))
+
+            # Windows never close on the final sample, as in the original loop over `areas`
+            end = len(cumulative) - 1
+            jitted = kernels.get("hic_fixed")
+            if jitted is not None and end > hic_window:
+                i, hic_value = jitted(cumulative, hic_window, end, hic_s)
+                return f"{i / 100}:{(i + hic_window) / 100}", round(hic_value)
+            integrals = np.maximum(cumulative[hic_window:end] - cumulative[:end - hic_window], 0.0)
+            hic_values = (integrals / hic_s) ** 2.5 * hic_s
+
+            i = int(np.argmax(hic_values))
+            return f"{i / 100}:{(i + hic_window) / 100}", round(hic_values[i])
+
+    @staticmethod
+    def search_windows(cumulative: np.ndarray, magnitudes: np.ndarray, dt: float, max_widths: Iterable[int],
+                       block_size: int = 128, min_end: int = 0) -> Dict[int, Tuple[float, int, int]]:
+        """
+        Finds the governing HIC window for several maximum window widths at once.
+
+        Start and end samples are grouped into blocks, and each (start block, end block)
+        tile of windows is scored from differences of the cumulative integral. Tiles are
+        visited most promising first, and the search stops as soon as no remaining tile
+        can beat the current maxima. A tile's bound uses the fact that a window's mean
+        never exceeds the peak inside it, and its integral never exceeds the positive
+        area the tile covers.
+
+        The pruning pays off when the signal has a clear impact: then only a few tiles
+        are scored and the search takes close to O(N). On a flat or noisy signal almost
+        every tile stays open, and scoring them all would cost O(N * max width) with a
+        large constant. When more than `SWEEP_FRACTION` of the tiles remain open after
+        the most promising one, the search falls back to `sweep_windows`. That costs
+        O(N * max width) with a small constant, so the worst case stays bounded.
+
+        With the Numba backend (`sentinel_triage.kernels`) the same search runs compiled.
+
+        Args:
+            cumulative (np.ndarray): Cumulative integral of the magnitudes, from `cumulative_integral`.
+            magnitudes (np.ndarray): Magnitudes the integral was built from (G).
+            dt (float): Time step in seconds.
+            max_widths (Iterable[int]): Maximum window widths in samples, one per HIC variant.
+            block_size (int): Number of samples per block.
+            min_end (int): Only windows ending at or after this sample are searched, e.g. the
+                windows closed by the newest samples of a stream.
+
+        Returns:
+            Dict[int, Tuple[float, int, int]]: For each width limit, the HIC value and the
+            start and end sample indices of its window.
+        """
+        max_widths = sorted(set(int(w) for w in max_widths))
+        results = {w: (0.0, 0, 0) for w in max_widths}
+        n_points = len(cumulative)
+        if n_points < 2 or max_widths[-1] < 1:
+            return results
+
+        width = max_widths[-1]
+        magnitudes = np.asarray(magnitudes, dtype=float)[:n_points]
+        jitted = kernels.get("hic_search")
+        if jitted is not None:
+            values, starts, ends = jitted(np.ascontiguousarray(cumulative, dtype=float), np.ascontiguousarray(magnitudes),
+                                          float(dt), np.array(max_widths, dtype=np.int64), block_size, min_end,
+                                          SWEEP_FRACTION)
+            return {w: (float(values[j]), int(starts[j]), int(ends[j])) for j, w in enumerate(max_widths)}
+        # (I / T) ** 2.5 * T is monotone in I * T ** -0.6, which avoids a power per window
+        scales = np.concatenate(([0.0], (np.arange(1, width + 1) * dt) ** -0.6))
+
+        if n_points - min_end <= block_size:
+            # Few ends to search, e.g. a stream's newest samples: score all their windows directly
+            ends = np.arange(max(min_end, 1), n_points)
+            lengths = np.arange(1, width + 1)
+            starts = ends[:, None] - lengths[None, :]
+            scores = np.where(starts >= 0, (cumulative[ends, None] - cumulative[np.maximum(starts, 0)]) * scales[1:],
+                              -np.inf)
+            for w in max_widths:
+                if not scores.size:
+                    break
+                k = int(np.argmax(scores[:, :w]))
+                row, column = divmod(k, w)
+                hic_value = max(scores[row, column], 0.0) ** 2.5
+                if hic_value > 0.0:
+                    results[w] = (float(hic_value), int(starts[row, column]), int(ends[row]))
+            return results
+
+        positive = np.maximum(magnitudes, 0.0)
+        positive_area = np.concatenate(([0.0], np.cumsum(0.5 * dt * (positive[:-1] + positive[1:]))))
+
+        # Tile (s, d) holds windows starting in block s and ending in block s + d
+        n_blocks = -(-n_points // block_size)
+        reach = width // block_size + 1
+        peaks = np.full((n_blocks + reach) * block_size, -np.inf)
+        peaks[:n_points] = magnitudes
+        block_peaks = peaks.reshape(-1, block_size).max(axis=1)
+        tile_peaks = np.maximum.accumulate(
+            np.lib.stride_tricks.sliding_window_view(block_peaks, reach + 1)[:n_blocks], axis=1)
+        tile_peaks = np.maximum(tile_peaks, 0.0)
+
+        starts = np.arange(n_blocks)[:, None] * block_size
+        offsets = np.arange(reach + 1)
+        ends = np.minimum(starts + (offsets + 1) * block_size - 1, n_points - 1)
+        tile_areas = positive_area[ends] - positive_area[starts]
+
+        # HIC = (I / T) ** 2.5 * T is largest where I = peak * T meets the area cap
+        shortest = np.maximum((offsets - 1) * block_size + 1, 1) * dt
+        with np.errstate(divide="ignore", invalid="ignore"):
+            crossover = np.where(tile_peaks > 0, tile_areas / tile_peaks, 0.0)
+        bounds = {}
+        for w in max_widths:
+            longest = np.minimum((offsets + 1) * block_size - 1, w) * dt
+            duration = np.clip(crossover, shortest, np.maximum(longest, shortest))
+            bound = np.minimum(tile_peaks ** 2.5 * duration, tile_areas ** 2.5 / duration ** 1.5)
+            bound[:, shortest > longest] = 0.0
+            bound[ends < min_end] = 0.0
+            bounds[w] = bound.ravel()
+
+        order = np.argsort(-bounds[width], kind="stable")
+        remaining = {w: np.maximum.accumulate(bounds[w][order][::-1])[::-1] for w in max_widths}
+
+        for rank, tile in enumerate(order):
+            if all(remaining[w][rank] <= results[w][0] for w in max_widths):
+                break
+            if rank == 1:
+                still_open = np.logical_or.reduce([bounds[w] > results[w][0] for w in max_widths])
+                if np.count_nonzero(still_open) > SWEEP_FRACTION * len(order):
+                    return HICCalculator.sweep_windows(cumulative, dt, max_widths, min_end)
+            if all(bounds[w][tile] <= results[w][0] for w in max_widths):
+                continue
+
+            block, offset = divmod(int(tile), reach + 1)
+            first_start = block * block_size
+            last_start = min(first_start + block_size, n_points - 1)
+            first_end = (block + offset) * block_size
+            last_end = min(first_end + block_size, n_points)
+            if first_start >= last_start or first_end >= last_end:
+                continue
+
+            lengths = (first_end - first_start) + np.arange(last_end - first_end)[None, :] \
+                - np.arange(last_start - first_start)[:, None]
+            integrals = cumulative[None, first_end:last_end] - cumulative[first_start:last_start, None]
+            valid = (lengths >= 1) & (lengths <= width) & (np.arange(first_end, last_end) >= min_end)[None, :]
+            scores = np.where(valid, integrals * scales[np.clip(lengths, 0, width)], -np.inf)
+
+            for w in max_widths:
+                masked = scores if w == width else np.where(lengths <= w, scores, -np.inf)
+                k = int(np.argmax(masked))
+                hic_value = max(masked.flat[k], 0.0) ** 2.5
+                if hic_value > results[w][0]:
+                    start, length = first_start + k // masked.shape[1], int(lengths.flat[k])
+                    results[w] = (float(hic_value), start, start + length)
+
+        return results
+
+    @staticmethod
+    def sweep_windows(cumulative: np.ndarray, dt: float, max_widths: Iterable[int],
+                      min_end: int = 0) -> Dict[int, Tuple[float, int, int]]:
+        """
+        Finds the governing HIC window for several maximum window widths by scoring every window.
+
+        Each window length is one vectorized pass over the start samples; the best window
+        of each width limit is then the best of the lengths up to it. The cost is always
+        max width passes over the signal, which bounds the worst case of `search_windows`.
+
+        Args:
+            cumulative (np.ndarray): Cumulative integral of the magnitudes, from `cumulative_integral`.
+            dt (float): Time step in seconds.
+            max_widths (Iterable[int]): Maximum window widths in samples, one per HIC variant.
+            min_end (int): Only windows ending at or after this sample are searched.
+
+        Returns:
+            Dict[int, Tuple[float, int, int]]: As `search_windows`.
+        """
+        max_widths = sorted(set(int(w) for w in max_widths))
+        results = {w: (0.0, 0, 0) for w in max_widths}
+        n_points = len(cumulative)
+        width = max(min(max_widths[-1], n_points - 1), 0)
+        scores = np.full(width + 1, -np.inf)
+        starts = np.zeros(width + 1, dtype=np.int64)
+        for length in range(1, width + 1):
+            first = max(min_end - length, 0)
+            integrals = cumulative[first + length:] - cumulative[first:n_points - length]
+            if integrals.size:
+                k = int(np.argmax(integrals))
+                scores[length], starts[length] = integrals[k] * (length * dt) ** -0.6, first + k
+
+        for w in max_widths:
+            length = int(np.argmax(scores[:w + 1]))
+            hic_value = max(scores[length], 0.0) ** 2.5
+            if hic_value > 0.0:
+                results[w] = (float(hic_value), int(starts[length]), int(starts[length]) + length)
+        return results
+
+    @staticmethod
+    def search_windows_batch(cumulative: np.ndarray, dt: float, max_widths: Iterable[int],
+                             batch_size: Optional[int] = None) -> Dict[int, Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+        """
+        Finds the governing HIC window of every row of a stack of cumulative integrals.
+
+        The loop runs over window lengths, each scored for all traces and start samples at
+        once. A length is skipped for the traces where it cannot beat the best window found
+        so far: a window's integral never exceeds its length times the largest step, nor the
+        trace's positive area. The worst case costs n_traces * n_samples * max width, which
+        suits many short traces; for one long recording `search_windows` prunes far more work.
+
+        Args:
+            cumulative (np.ndarray): Cumulative integrals with shape (n_traces, n_samples).
+            dt (float): Time step in seconds.
+            max_widths (Iterable[int]): Maximum window widths in samples, one per HIC variant.
+            batch_size (Optional[int]): Traces scored together (default: about 256k samples' worth,
+                which keeps the temporary arrays in cache).
+
+        Returns:
+            Dict[int, Tuple[np.ndarray, np.ndarray, np.ndarray]]: For each width limit, the HIC
+            values and the start and end sample indices of their windows, one per trace.
+        """
+        cumulative = np.asarray(cumulative, dtype=float)
+        max_widths = sorted(set(int(w) for w in max_widths))
+        n_traces, n_points = cumulative.shape
+        batch_size = batch_size or max(1, (1 << 18) // n_points)
+        scores = {w: np.zeros(n_traces) for w in max_widths}
+        starts = {w: np.zeros(n_traces, dtype=np.int64) for w in max_widths}
+        ends = {w: np.zeros(n_traces, dtype=np.int64) for w in max_widths}
+        rows = np.arange(n_traces)
+
+        # Windows never close on the final sample, as in `calculate_hic`
+        for first in range(0, n_traces, batch_size):
+            block = cumulative[first:first + batch_size]
+            steps = np.maximum(np.diff(block[:, :n_points - 1], axis=1), 0.0)
+            peak_step = steps.max(axis=1, initial=0.0)
+            positive_area = steps.sum(axis=1)
+            longest = min(max_widths[-1], n_points - 2)
+
+            # Full-width windows of every limit come first, so the bound prunes from the start
+            seeds = sorted({min(w, longest) for w in max_widths if longest >= 1})
+            for length in seeds + [length for length in range(1, longest + 1) if length not in seeds]:
+                scale = (length * dt) ** -0.6
+                bound = np.minimum(length * peak_step, positive_area) * scale
+                target = np.min([scores[w][first:first + batch_size] for w in max_widths if w >= length], axis=0)
+                active = np.flatnonzero(bound > target)
+                if len(active) == 0:
+                    continue
+                block_rows = rows[first + active]
+                candidates = block[active] if len(active) < len(block) else block
+
+                # (I / T) ** 2.5 * T is monotone in I * T ** -0.6
+                window_scores = (candidates[:, length:n_points - 1] - candidates[:, :n_points - 1 - length]) * scale
+                best = np.argmax(window_scores, axis=1)
+                best_scores = window_scores[np.arange(len(candidates)), best]
+                for w in max_widths:
+                    if length > w:
+                        continue
+                    better = best_scores > scores[w][block_rows]
+                    index = block_rows[better]
+                    scores[w][index] = best_scores[better]
+                    starts[w][index] = best[better]
+                    ends[w][index] = best[better] + length
+
+        return {w: (np.maximum(scores[w], 0.0) ** 2.5, starts[w], ends[w]) for w in max_widths}
+
+    def calculate_hic_batch(self, data: np.ndarray, x_location: int = 2, y_location: int = 3, z_location: int = 4,
+                            limits_ms: Tuple[float, ...] = (15.0, 36.0)) -> Dict[str, Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+        """
+        Calculates HIC for a stack of equal-length traces in one call.
+
+        Args:
+            data (np.ndarray): Array with shape (n_traces, n_samples, n_columns), accelerations in mm/s².
+            x_location (int): Column index for X direction data.
+            y_location (int): Column index for Y direction data.
+            z_location (int): Column index for Z direction data.
+            limits_ms (Tuple[float, ...]): Maximum window lengths in milliseconds.
+
+        Returns:
+            Dict[str, Tuple[np.ndarray, np.ndarray, np.ndarray]]: For each limit (e.g. "HIC15"), the HIC
+            values and the window start and end times (t1, t2) in seconds, one per trace.
+        """
+        data = np.asarray(data, dtype=float)
+        if data.ndim != 3:
+            raise ValueError(f"Expected an (n_traces, n_samples, n_columns) array, got shape {data.shape}")
+        magnitudes = np.sqrt(data[:, :, x_location - 1]**2 + data[:, :, y_location - 1]**2 + data[:, :, z_location - 1]**2) / 9810
+        return self.calculate_hic_magnitudes_batch(self.butter_lowpass_filter(magnitudes, axis=1), limits_ms)
+
+    def calculate_hic_magnitudes_batch(self, magnitudes: np.ndarray, limits_ms: Tuple[float, ...] = (15.0, 36.0),
+                                       cumulative: Optional[np.ndarray] = None
+                                       ) -> Dict[str, Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+        """
+        Calculates HIC for each row of an (n_traces, n_samples) array of filtered resultant magnitudes (G).
+
+        Args:
+            magnitudes (np.ndarray): Filtered resultant acceleration, one row per trace.
+            limits_ms (Tuple[float, ...]): Maximum window lengths in milliseconds.
+            cumulative (Optional[np.ndarray]): Their `cumulative_integral`, if already computed.
+
+        Returns:
+            Dict[str, Tuple[np.ndarray, np.ndarray, np.ndarray]]: Same as `calculate_hic_batch`.
+        """
+        with profiling.stage("HIC", np.size(magnitudes)):
+            if cumulative is None:
+                cumulative = self.cumulative_integral(magnitudes)
+            widths = {limit: int(limit / (self.frequency * 1000) + 1e-9) for limit in limits_ms}
+            windows = self.search_windows_batch(cumulative, self.frequency, widths.values())
+            results = {}
+            for limit, width in widths.items():
+                hic_values, starts, ends = windows[width]
+                results[f"HIC{limit:g}"] = (hic_values, starts * self.frequency, ends * self.frequency)
+        return results
+
+    def calculate_hic_windows(self, acceleration: Union[AccelerationSeries, Dict[int, Tuple[float, float]]],
+                              limits_ms: Tuple[float, ...] = (15.0, 36.0)) -> Dict[str, Tuple[float, float, float]]:
+        """
+        Calculates HIC15, HIC36 (or any other window limits) in a single pass.
+
+        Args:
+            acceleration (Union[AccelerationSeries, Dict[int, Tuple[float, float]]]): Acceleration data with
+                time and magnitude, from `get_series` (or the legacy dict from `get_data`).
+            limits_ms (Tuple[float, ...]): Maximum window lengths in milliseconds.
+
+        Returns:
+            Dict[str, Tuple[float, float, float]]: For each limit (e.g. "HIC15"), the HIC value
+            and the governing window start and end times (t1, t2) in seconds.
+        """
+        return self.calculate_hic_magnitudes(_magnitudes(acceleration), limits_ms)
+
+    def calculate_hic_magnitudes(self, magnitudes: np.ndarray, limits_ms: Tuple[float, ...] = (15.0, 36.0),
+                                 cumulative: Optional[np.ndarray] = None) -> Dict[str, Tuple[float, float, float]]:
+        """
+        Calculates HIC for each window limit from an array of filtered resultant magnitudes (G).
+
+        Args:
+            magnitudes (np.ndarray): Filtered resultant acceleration, one value per time step.
+            limits_ms (Tuple[float, ...]): Maximum window lengths in milliseconds.
+            cumulative (Optional[np.ndarray]): Their `cumulative_integral`, if already computed.
+
+        Returns:
+            Dict[str, Tuple[float, float, float]]: Same as `calculate_hic_windows`.
+        """
+        with profiling.stage("HIC", np.size(magnitudes)):
+            stream = StreamingHIC(self.frequency, limits_ms)
+            magnitudes = np.asarray(magnitudes, dtype=float)
+            if cumulative is None:
+                stream.update(magnitudes)
+            else:
+                # The whole recording in one block, so its final sample never closes a window
+                stream.best.update(self.search_windows(cumulative[:-1], magnitudes, self.frequency, stream.best.keys()))
+        return stream.result()
+
+    def process_stream(self, path: str, x_location: int, y_location: int, z_location: int,
+                       chunk_size: int = 65536, limits_ms: Tuple[float, ...] = (15.0, 36.0)) -> Dict[str, Tuple[float, float, float]]:
+        """
+        Calculates HIC while reading the CSV file in fixed-size blocks, in bounded memory.
+
+        The filter state and the last window's worth of samples carry over between blocks,
+        so the results match `get_series` followed by `calculate_hic_windows`.
+
+        Args:
+            path (str): Path to the input CSV file.
+            x_location (int): Column index for X direction data.
+            y_location (int): Column index for Y direction data.
+            z_location (int): Column index for Z direction data.
+            chunk_size (int): Rows read per block.
+            limits_ms (Tuple[float, ...]): Maximum window lengths in milliseconds.
+
+        Returns:
+            Dict[str, Tuple[float, float, float]]: As returned by `calculate_hic_windows`.
+        """
+        if self.phase != "causal":
+            raise ValueError("Streaming HIC requires the causal filter phase")
+        lowpass = CausalFilter(filters.butter_lowpass_sos(self.order, self.cutoff, self.frequency))
+        stream = StreamingHIC(self.frequency, limits_ms)
+
+        for data in iter_csv_chunks(path, chunk_size):
+            magnitudes = np.sqrt(data[:, x_location - 1]**2 + data[:, y_location - 1]**2 + data[:, z_location - 1]**2) / 9810
+            stream.update(lowpass(magnitudes))
+        return stream.result()
+
+
+class StreamingHIC:
+    """
+    Running HIC window search over magnitude blocks that arrive one after another.
+
+    Only the last window's worth of samples is kept between blocks, so memory stays
+    bounded however long the recording is.
+    """
+
+    def __init__(self, frequency: float, limits_ms: Tuple[float, ...] = (15.0, 36.0)):
+        """
+        Args:
+            frequency (float): Sampling frequency (time step in seconds).
+            limits_ms (Tuple[float, ...]): Maximum window lengths in milliseconds.
+        """
+        self.frequency = frequency
+        self.widths = {limit: int(limit / (frequency * 1000) + 1e-9) for limit in limits_ms}
+        self.best = {width: (0.0, 0, 0) for width in self.widths.values()}
+        self._keep = max(self.widths.values()) + 1
+        self._cumulative = np.empty(0)
+        self._magnitudes = np.empty(0)
+        self._offset = 0  # Sample index of the first buffered sample
+
+    def update(self, magnitudes: np.ndarray) -> None:
+        """
+        Adds the next block of filtered magnitudes (G) and updates the running maxima.
+
+        Args:
+            magnitudes (np.ndarray): Filtered acceleration magnitudes following the previous block.
+        """
+        magnitudes = np.asarray(magnitudes, dtype=float)
+        if len(magnitudes) == 0:
+            return
+
+        if len(self._magnitudes):
+            joined = np.concatenate((self._magnitudes[-1:], magnitudes))
+            areas = 0.5 * self.frequency * (joined[:-1] + joined[1:])
+            cumulative = self._cumulative[-1] + np.cumsum(areas)
+        else:
+            areas = 0.5 * self.frequency * (magnitudes[:-1] + magnitudes[1:])
+            cumulative = np.concatenate(([0.0], np.cumsum(areas)))
+        self._cumulative = np.concatenate((self._cumulative, cumulative))
+        self._magnitudes = np.concatenate((self._magnitudes, magnitudes))
+
+        # The newest sample may be the last of the recording, which never closes a window; the
+        # windows closing on earlier samples were searched by previous updates
+        min_end = max(len(self._cumulative) - len(cumulative) - 1, 0)
+        windows = HICCalculator.search_windows(self._cumulative[:-1], self._magnitudes, self.frequency, self.best.keys(),
+                                               min_end=min_end)
+        for width, (hic_value, start, end) in windows.items():
+            if hic_value > self.best[width][0]:
+                self.best[width] = (hic_value, start + self._offset, end + self._offset)
+
+        drop = max(len(self._cumulative) - self._keep, 0)
+        self._cumulative = self._cumulative[drop:]
+        self._magnitudes = self._magnitudes[drop:]
+        self._offset += drop
+
+    def result(self) -> Dict[str, Tuple[float, float, float]]:
+        """
+        Returns:
+            Dict[str, Tuple[float, float, float]]: For each limit (e.g. "HIC15"), the HIC value
+            and the governing window start and end times (t1, t2) in seconds.
+        """
+        results = {}
+        for limit, width in self.widths.items():
+            hic_value, start, end = self.best[width]
+            results[f"HIC{limit:g}"] = (hic_value, start * self.frequency, end * self.frequency)
+        return results
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Runs the command-line interface (`sentinel-triage hic` or the stand-alone script)."""
+    parser = argparse.ArgumentParser(description="HIC Calculation Script")
+    parser.add_argument("--frequency", type=float, required=True, help="Sampling frequency (e.g., 0.00001)")
+    parser.add_argument("--file_path", type=str, required=True, help="Path to the CSV file")
+    parser.add_argument("--x_location", type=int, required=True, help="Column index for X direction data")
+    parser.add_argument("--y_location", type=int, required=True, help="Column index for Y direction data")
+    parser.add_argument("--z_location", type=int, required=True, help="Column index for Z direction data")
+    parser.add_argument("--chunk_size", type=int, default=None, help="Stream the file in blocks of this many rows")
+
+    args = parser.parse_args(argv)
+
+    hic_calculator = HICCalculator(args.frequency)
+    data_file = hic_calculator.get_file(args.file_path)
+    if args.chunk_size:
+        hic_results = hic_calculator.process_stream(data_file, args.x_location, args.y_location, args.z_location,
+                                                    chunk_size=args.chunk_size)
+    else:
+        acceleration_data = hic_calculator.get_series(data_file, args.x_location, args.y_location, args.z_location)
+        hic_results = hic_calculator.calculate_hic_windows(acceleration_data)
+
+    for name, (hic_value, t1, t2) in hic_results.items():
+        print(f'The {name} value is {round(hic_value)} and was achieved between the time window of '
+              f'{t1 * 1000:.2f}:{t2 * 1000:.2f} ms')
+
+
+if __name__ == "__main__":
+    main()
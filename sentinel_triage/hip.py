@@ -0,0 +1,293 @@
+import numpy as np
+import argparse
+from typing import List, Optional, Union
+
+from sentinel_triage import filters, kernels, profiling
+from sentinel_triage.traces import KINEMATIC_COLUMNS, Trace, load_trace
+
+# HIP formula coefficients (PAGE 4)
+HEAD_MASS = 4.50  # Mass of head (kg)
+HEAD_INERTIA = (0.016, 0.024, 0.022)  # Moments of inertia Ix, Iy, Iz (Nms²)
+COEFFICIENTS = np.array([HEAD_MASS] * 3 + list(HEAD_INERTIA))
+
+# Highest frequency HIP reads: the CFC 180 corner that ends the filter cascade
+BANDWIDTH = filters.CFC_CUTOFFS[180]
+# Decimation keeps the cascade's CFC 1000 corner at 80% of the decimated Nyquist frequency
+MIN_DECIMATED_RATE = filters.CFC_CUTOFFS[1000] / 0.4
+
+class HIPCalculator:
+    def __init__(self, frequency: float, phase: str = "zero", decimate: bool = False):
+        """
+        Initialize with sampling frequency (time step in seconds) and filter phase mode ("zero" or "causal").
+
+        With `decimate`, channels are reduced to about `decimation_margin` × `cutoff` (at least
+        `MIN_DECIMATED_RATE`) before filtering and integration; see `decimation_factor`.
+        """
+        self.frequency = frequency
+        self.dt = frequency  # Time step (e.g., 0.0001 s for 10 kHz)
+        self.phase = phase
+        self.cutoff = BANDWIDTH  # Corner of the second filter stage (Hz), CFC 180 by default
+        self.decimate = decimate
+        self.decimation_margin = filters.DECIMATION_MARGIN
+
+    def butter_lowpass(self, cutoff: float, order: int = 2):
+        """
+        Create Butterworth low-pass filter coefficients, reusing the shared design cache.
+
+        Args:
+            cutoff (float): Cutoff frequency in Hz (e.g., 1650 for CFC 1000, 300 for CFC 180).
+            order (int): Filter order (default 2).
+
+        Returns:
+            Tuple: Filter coefficients (b, a).
+        """
+        return filters.butter_lowpass(order, cutoff, self.dt)
+
+    def butter_lowpass_cascade(self, dt: Optional[float] = None) -> np.ndarray:
+        """
+        Create the CFC 1000 (1650 Hz) followed by CFC 180 (300 Hz, or `cutoff`) cascade as second-order sections.
+
+        Args:
+            dt (Optional[float]): Time step to design for (default: the calculator's).
+
+        Returns:
+            np.ndarray: Second-order sections of both filters, shape (n_sections, 6).
+        """
+        dt = self.dt if dt is None else dt
+        return np.vstack([filters.cfc_sos(1000, dt), filters.butter_lowpass_sos(2, self.cutoff, dt)])
+
+    def decimation_factor(self) -> int:
+        """
+        Returns:
+            int: Samples combined into one by `apply_filters` (1 unless `decimate` is set).
+        """
+        if not self.decimate:
+            return 1
+        return filters.decimation_factor(self.dt, self.cutoff, self.decimation_margin, MIN_DECIMATED_RATE)
+
+    def decimate_time(self, time: np.ndarray) -> np.ndarray:
+        """
+        Keep the time stamps of the samples `apply_filters` returns.
+
+        Args:
+            time (np.ndarray): Time column with samples along the last axis.
+
+        Returns:
+            np.ndarray: Every `decimation_factor()`-th time stamp, starting with the first.
+        """
+        return time[..., ::self.decimation_factor()]
+
+    def apply_filters(self, data: np.ndarray, axis: int = 0) -> np.ndarray:
+        """
+        Apply CFC 1000 (1650 Hz) and CFC 180 (300 Hz) filters as one cascade.
+
+        When decimating, the channels first go through `filters.decimate` and the cascade is
+        designed for the decimated time step.
+
+        Args:
+            data (np.ndarray): Input data array, e.g. one time series, an (n_samples, n_channels)
+                block, or an (n_traces, n_samples, n_channels) stack of equal-length traces.
+            axis (int): Time axis of `data` (0 for a single trace, 1 for a stack).
+
+        Returns:
+            np.ndarray: Filtered data, with every `decimation_factor()`-th sample when decimating.
+        """
+        factor = self.decimation_factor()
+        data = filters.decimate(data, factor, self.dt, self.cutoff, axis)
+        return filters.sos_filter(self.butter_lowpass_cascade(self.dt * factor), data, self.phase, axis)
+
+    @staticmethod
+    def read_csv(file_path: str) -> np.ndarray:
+        """
+        Read CSV file with Time, ax, ay, az, alphax, alphay, alphaz columns.
+
+        Args:
+            file_path (str): Path to CSV file.
+
+        Returns:
+            np.ndarray: Data array with shape (n_samples, 7).
+        """
+        return load_trace(file_path).select(KINEMATIC_COLUMNS)
+
+    def manual_cumtrapz(self, y: np.ndarray, x: np.ndarray = None) -> np.ndarray:
+        """
+        Manually implement cumulative trapezoidal integration.
+        
+        Args:
+            y (np.ndarray): Data to integrate (e.g., ax, ay, az, etc.), one channel per column.
+            x (np.ndarray): Time values or independent variable for integration (default: np.arange(len(y))),
+                either 1-D or one column per trace when `y` is an (n_samples, n_traces, n_channels) stack.
+
+        Returns:
+            np.ndarray: Cumulative integration of y along its first axis.
+        """
+        if x is None:
+            x = np.arange(len(y))  # Default: Use the index as the x values
+        with profiling.stage("integrate", np.size(y)):
+            jitted = kernels.get("cumtrapz")
+            if jitted is not None and np.ndim(y) <= 2 and np.ndim(x) == 1:
+                y = np.asarray(y, dtype=float)
+                integral = jitted(np.ascontiguousarray(y.reshape(len(y), -1)), np.ascontiguousarray(x, dtype=float))
+                return integral.reshape(y.shape)
+            dx = np.diff(x, axis=0)  # Compute the differences between consecutive x values
+            dx = dx.reshape(dx.shape + (1,) * (y.ndim - dx.ndim))  # Broadcast over channels
+            steps = np.cumsum((y[:-1] + y[1:]) * dx / 2, axis=0)  # Cumulative sum with trapezoidal rule
+            integral = np.concatenate((np.zeros((1,) + y.shape[1:]), steps))
+        return integral
+
+    def calculate_hip(self, data: Union[np.ndarray, Trace]) -> float:
+        """
+        Calculate Head Impact Power (HIP) per Equation 7 (PAGE 4).
+
+        Args:
+            data (Union[np.ndarray, Trace]): Array with columns [Time, ax, ay, az, alphax, alphay, alphaz], or a loaded trace.
+
+        Returns:
+            float: Maximum HIP value (HIP_m) in kW.
+        """
+        if isinstance(data, Trace):
+            data = data.select(KINEMATIC_COLUMNS)
+
+        # Extract time and the ax, ay, az, alphax, alphay, alphaz block
+        time = self.decimate_time(data[:, 0])
+        components = data[:, 1:7]
+
+        # Apply filters to all components at once (CFC 1000 + CFC 180)
+        filtered = self.apply_filters(components)
+        return self.calculate_hip_filtered(time, filtered)
+
+    def calculate_hip_filtered(self, time: np.ndarray, filtered: np.ndarray) -> Union[float, np.ndarray]:
+        """
+        Calculate HIP from channels that have already been through `apply_filters`.
+
+        Args:
+            time (np.ndarray): Time column in seconds, shape (n_samples,), or (n_traces, n_samples) for a stack.
+            filtered (np.ndarray): Filtered ax, ay, az, alphax, alphay, alphaz block with shape (n_samples, 6),
+                or (n_traces, n_samples, 6) for a stack.
+
+        Returns:
+            Union[float, np.ndarray]: Maximum HIP value (HIP_m) in kW, one per trace for a stack.
+        """
+        coefficients = COEFFICIENTS
+
+        with profiling.stage("HIP", np.size(filtered)):
+            # With Numba, integration, power and maximum run fused in one pass over one trace
+            jitted = kernels.get("hip_max")
+            if jitted is not None and filtered.ndim == 2:
+                return jitted(np.ascontiguousarray(time, dtype=float), np.ascontiguousarray(filtered, dtype=float),
+                              coefficients) / 1000
+
+            # Compute integrals (velocity changes) using manual cumulative trapezoidal rule,
+            # with the sample axis moved to the front for a stack of traces
+            if filtered.ndim == 3:
+                integrals = np.moveaxis(self.manual_cumtrapz(np.moveaxis(filtered, 1, 0), time.T), 0, 1)
+            else:
+                integrals = self.manual_cumtrapz(filtered, time)
+
+            # Calculate HIP at each time step
+            hip = (filtered * integrals) @ coefficients / 1000  # Convert W to kW
+
+        # Return maximum HIP (HIP_m)
+        return np.max(hip, axis=-1)
+
+    def calculate_hip_batch(self, data: np.ndarray) -> np.ndarray:
+        """
+        Calculate HIP_m for a stack of equal-length traces in one call.
+
+        Filtering, integration and the maximum all run along the sample axis of the whole stack.
+
+        Args:
+            data (np.ndarray): Array with shape (n_traces, n_samples, 7), columns as in `calculate_hip`.
+
+        Returns:
+            np.ndarray: HIP_m in kW, one per trace.
+        """
+        data = np.asarray(data, dtype=float)
+        if data.ndim != 3 or data.shape[2] < 7:
+            raise ValueError(f"Expected an (n_traces, n_samples, 7) array, got shape {data.shape}")
+        filtered = self.apply_filters(data[:, :, 1:7], axis=1)
+        return self.calculate_hip_filtered(self.decimate_time(data[:, :, 0]), filtered)
+
+    def process_file(self, file_path: Union[str, Trace]) -> float:
+        """
+        Process CSV file and calculate HIP.
+
+        Args:
+            file_path (Union[str, Trace]): Path to CSV file, or a trace already loaded with `load_trace`.
+
+        Returns:
+            float: Maximum HIP value (HIP_m) in kW.
+        """
+        data = file_path if isinstance(file_path, Trace) else self.read_csv(file_path)
+        hip_m = self.calculate_hip(data)
+        return hip_m
+
+
+class StreamingHIP:
+    """Running HIP_m over filtered channel blocks that arrive one after another."""
+
+    def __init__(self, frequency: float):
+        """
+        Args:
+            frequency (float): Sampling frequency (time step in seconds).
+        """
+        self.frequency = frequency
+        self.peak = -np.inf
+        self._integrate = HIPCalculator(frequency).manual_cumtrapz
+        self._integrals = np.zeros(len(COEFFICIENTS))
+        self._last_time = None
+        self._last_filtered = None
+
+    def update(self, time: np.ndarray, filtered: np.ndarray) -> None:
+        """
+        Adds the next block of filtered channels and updates the running integrals and maximum.
+
+        Args:
+            time (np.ndarray): Time column of the block in seconds, shape (n_samples,).
+            filtered (np.ndarray): Filtered ax, ay, az, alphax, alphay, alphaz block, shape (n_samples, 6).
+        """
+        time = np.asarray(time, dtype=float)
+        filtered = np.asarray(filtered, dtype=float)
+        if len(time) == 0:
+            return
+        if self._last_time is None:
+            integrals = self._integrate(filtered, time)
+        else:
+            # Continue the trapezoid from the previous block's last sample
+            joined = self._integrate(np.vstack((self._last_filtered, filtered)), np.concatenate(([self._last_time], time)))
+            integrals = self._integrals + joined[1:]
+        hip = (filtered * integrals) @ COEFFICIENTS / 1000  # Convert W to kW
+        self.peak = max(self.peak, float(np.max(hip)))
+        self._integrals = integrals[-1]
+        self._last_time, self._last_filtered = time[-1], filtered[-1:]
+
+    def result(self) -> float:
+        """
+        Returns:
+            float: HIP_m (kW) of all samples seen so far.
+        """
+        return self.peak
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Runs the command-line interface (`sentinel-triage hip` or the stand-alone script)."""
+    # Command-line argument parsing with default file_path
+    parser = argparse.ArgumentParser(description="Calculate HIP from CSV data per Newman (1985).")
+    parser.add_argument("--frequency", type=float, required=True, help="Sampling frequency (time step in seconds, e.g., 0.001 for 1 kHz)")
+    parser.add_argument("--file_path", type=str, 
+                        default='impact_data.csv',  # Adjust default path as needed
+                        help="Path to CSV file with acceleration data")
+    parser.add_argument("--decimate", action="store_true", help="Reduce the channels to the rate HIP's 300 Hz bandwidth needs")
+    args = parser.parse_args(argv)
+
+    # Initialize calculator and compute HIP
+    hip_calculator = HIPCalculator(args.frequency, decimate=args.decimate)
+    try:
+        hip_value = hip_calculator.process_file(args.file_path)
+        print(f"Maximum Head Impact Power (HIP_m): {hip_value:.2f} kW")
+    except Exception as e:
+        print(f"Error: {e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,260 @@
+"""
+Optional Numba-compiled versions of the loop-shaped kernels.
+
+Calculators ask `get(name)` for a compiled kernel and keep their NumPy code as the
+fallback when it returns None. Compiled code is cached on disk (`cache=True`), so
+only the first run on a machine pays for compilation. Both backends agree to a
+relative tolerance of `TOLERANCE`; only the summation order differs. When two HIC
+windows tie exactly, the backends may report different window times.
+"""
+import os
+from typing import Callable, Dict, Optional
+
+import numpy as np
+
+BACKENDS = ("auto", "numpy", "numba")
+
+# Relative difference allowed between the NumPy and Numba results
+TOLERANCE = 1e-9
+
+_backend = os.environ.get("SENTINEL_BACKEND", "auto").lower()
+_kernels: Optional[Dict[str, Callable]] = None
+
+
+def numba_available() -> bool:
+    """Returns True if Numba can be imported."""
+    try:
+        import numba  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def set_backend(name: str) -> None:
+    """
+    Selects the kernel backend for this process.
+
+    Args:
+        name (str): "numba", "numpy", or "auto" for Numba when it is installed (the default,
+            also settable through SENTINEL_BACKEND).
+    """
+    global _backend
+    name = name.lower()
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown backend {name!r}; choose from {', '.join(BACKENDS)}")
+    if name == "numba" and not numba_available():
+        raise ImportError("The numba backend requires numba (pip install numba)")
+    _backend = name
+
+
+def active_backend() -> str:
+    """Returns "numba" or "numpy", the backend kernels currently resolve to."""
+    if _backend == "numpy" or (_backend == "auto" and not numba_available()):
+        return "numpy"
+    return "numba"
+
+
+def get(name: str) -> Optional[Callable]:
+    """
+    Returns the compiled kernel `name`, or None when the NumPy backend is active.
+
+    Args:
+        name (str): One of "cumtrapz", "hip_max", "hic_fixed", "hic_search", "power_integral" or "sosfilt".
+
+    Returns:
+        Optional[Callable]: The jitted function.
+    """
+    global _kernels
+    if active_backend() == "numpy":
+        return None
+    if _kernels is None:
+        _kernels = _compile()
+    return _kernels[name]
+
+
+def _compile() -> Dict[str, Callable]:
+    from numba import njit
+
+    @njit(cache=True)
+    def cumtrapz(y, x):
+        # y: (n_samples, n_channels), x: (n_samples,)
+        n, channels = y.shape
+        out = np.zeros((n, channels))
+        for i in range(1, n):
+            half_dx = 0.5 * (x[i] - x[i - 1])
+            for k in range(channels):
+                out[i, k] = out[i - 1, k] + (y[i - 1, k] + y[i, k]) * half_dx
+        return out
+
+    @njit(cache=True)
+    def hip_max(time, filtered, coefficients):
+        # max over t of sum_k c_k * f_k(t) * integral of f_k, fused into one pass
+        n, channels = filtered.shape
+        integrals = np.zeros(channels)
+        best = -np.inf
+        for i in range(n):
+            power = 0.0
+            for k in range(channels):
+                if i > 0:
+                    integrals[k] += (filtered[i - 1, k] + filtered[i, k]) * (time[i] - time[i - 1]) / 2
+                power += filtered[i, k] * integrals[k] * coefficients[k]
+            if power > best:
+                best = power
+        return best
+
+    @njit(cache=True)
+    def hic_fixed(cumulative, width, end, duration):
+        # Best window of exactly `width` samples ending before `end`
+        best_index, best_value = 0, -np.inf
+        for i in range(end - width):
+            value = max(cumulative[i + width] - cumulative[i], 0.0)
+            if value > best_value:
+                best_index, best_value = i, value
+        return best_index, (best_value / duration) ** 2.5 * duration
+
+    @njit(cache=True)
+    def hic_search(cumulative, magnitudes, dt, widths, block, min_end, sweep_fraction):
+        # The tile search of `HICCalculator.search_windows`, compiled: windows are grouped by
+        # (start block, end block), each tile is bounded from its peak and positive area, and
+        # tiles are scanned best bound first until no remaining tile can beat the maxima.
+        # When more than `sweep_fraction` of the tiles stay open after the first one, every
+        # window length is swept once instead, as in `HICCalculator.sweep_windows`.
+        n = len(cumulative)
+        width = widths[-1]
+        n_widths = len(widths)
+        scores = np.zeros(n_widths)
+        starts = np.zeros(n_widths, dtype=np.int64)
+        ends = np.zeros(n_widths, dtype=np.int64)
+        if n < 2 or width < 1:
+            return scores, starts, ends
+
+        positive_area = np.zeros(n)
+        for i in range(1, n):
+            positive_area[i] = positive_area[i - 1] + 0.5 * dt * (max(magnitudes[i - 1], 0.0) + max(magnitudes[i], 0.0))
+        n_blocks = (n + block - 1) // block
+        block_peaks = np.zeros(n_blocks)
+        for i in range(n):
+            block_peaks[i // block] = max(block_peaks[i // block], magnitudes[i])
+
+        # Bounds are in score units, I * T ** -0.6, which is monotone in HIC
+        reach = width // block + 1
+        bounds = np.zeros(n_blocks * (reach + 1))
+        for first in range(n_blocks):
+            peak = 0.0
+            for offset in range(reach + 1):
+                last = first + offset
+                if last >= n_blocks:
+                    break
+                peak = max(peak, block_peaks[last])
+                last_end = min((last + 1) * block - 1, n - 1)
+                if last_end < min_end:
+                    continue
+                area = positive_area[last_end] - positive_area[first * block]
+                shortest = max((offset - 1) * block + 1, 1) * dt
+                longest = min((offset + 1) * block - 1, width) * dt
+                if shortest > longest or peak <= 0.0 or area <= 0.0:
+                    continue
+                duration = min(max(area / peak, shortest), longest)
+                bounds[first * (reach + 1) + offset] = min(peak * duration, area) * duration ** -0.6
+
+        scales = np.empty(width + 1)
+        scales[0] = 0.0
+        for length in range(1, width + 1):
+            scales[length] = (length * dt) ** -0.6
+
+        # The tile with the highest bound sets a floor first, so only the tiles that can
+        # still beat it are sorted
+        tile = np.argmax(bounds)
+        order = np.empty(0, dtype=np.int64)
+        position = -1
+        sweep = False
+        while bounds[tile] > scores.min():
+            first, offset = tile // (reach + 1), tile % (reach + 1)
+            for s in range(first * block, min((first + 1) * block, n - 1)):
+                # Lengths reaching this tile's end block; width limits split them into
+                # segments, each a plain max reduction that is scanned again only if it wins
+                low = max((first + offset) * block - s, min_end - s, 1)
+                high = min((first + offset + 1) * block - 1 - s, n - 1 - s, width)
+                base = cumulative[s]
+                running = -np.inf
+                running_length = 0
+                for j in range(n_widths):
+                    top = min(high, widths[j])
+                    segment = -np.inf
+                    for length in range(low, top + 1):
+                        segment = max(segment, (cumulative[s + length] - base) * scales[length])
+                    if segment > running:
+                        for length in range(low, top + 1):
+                            if (cumulative[s + length] - base) * scales[length] == segment:
+                                running, running_length = segment, length
+                                break
+                    if running > scores[j]:
+                        scores[j] = running
+                        starts[j] = s
+                        ends[j] = s + running_length
+                    low = max(low, top + 1)
+
+            if position < 0:
+                bounds[tile] = 0.0
+                rest = np.nonzero(bounds > scores.min())[0]
+                if len(rest) > sweep_fraction * len(bounds):
+                    sweep = True
+                    break
+                order = rest[np.argsort(-bounds[rest])]
+            position += 1
+            if position >= len(order):
+                break
+            tile = order[position]
+        if not sweep:
+            return scores ** 2.5, starts, ends
+
+        # Best window of each length, then the best length up to each width limit
+        longest = min(width, n - 1)
+        length_scores = np.full(longest + 1, -np.inf)
+        length_starts = np.zeros(longest + 1, dtype=np.int64)
+        for length in range(1, longest + 1):
+            scale = scales[length]
+            for s in range(max(min_end - length, 0), n - length):
+                value = (cumulative[s + length] - cumulative[s]) * scale
+                if value > length_scores[length]:
+                    length_scores[length], length_starts[length] = value, s
+        for j in range(n_widths):
+            best, best_length = 0.0, 0
+            for length in range(1, min(widths[j], longest) + 1):
+                if length_scores[length] > best:
+                    best, best_length = length_scores[length], length
+            scores[j] = best
+            starts[j] = length_starts[best_length] if best_length else 0
+            ends[j] = starts[j] + best_length
+        return scores ** 2.5, starts, ends
+
+    @njit(cache=True)
+    def power_integral(magnitudes, dx):
+        # Trapezoidal integral of magnitudes ** 2.5, with the power as m * m * sqrt(m)
+        total = 0.0
+        previous = magnitudes[0] * magnitudes[0] * np.sqrt(magnitudes[0])
+        for i in range(1, len(magnitudes)):
+            current = magnitudes[i] * magnitudes[i] * np.sqrt(magnitudes[i])
+            total += (previous + current) * dx / 2
+            previous = current
+        return total
+
+    @njit(cache=True)
+    def sosfilt(sos, x, zi):
+        # Direct form II transposed, as scipy.signal.sosfilt; x: (n_samples, n_channels),
+        # zi: (n_sections, 2, n_channels), updated in place
+        n, channels = x.shape
+        y = np.empty((n, channels))
+        for i in range(n):
+            for c in range(channels):
+                value = x[i, c]
+                for k in range(sos.shape[0]):
+                    out = sos[k, 0] * value + zi[k, 0, c]
+                    zi[k, 0, c] = sos[k, 1] * value - sos[k, 4] * out + zi[k, 1, c]
+                    zi[k, 1, c] = sos[k, 2] * value - sos[k, 5] * out
+                    value = out
+                y[i, c] = value
+        return y
+
+    return {"cumtrapz": cumtrapz, "hip_max": hip_max, "hic_fixed": hic_fixed,
+            "hic_search": hic_search, "power_integral": power_integral, "sosfilt": sosfilt}
@@ -0,0 +1,258 @@
+import argparse
+import os
+import re
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from sentinel_triage.traces import KINEMATIC_COLUMNS, Trace
+
+# ASCII nodout layout: each state prints a translational block and, for nodes with rotational
+# degrees of freedom, a rotational block, one (i10, 1p12e12.4) row per node
+STATE_MARKER = b"n o d a l   p r i n t   o u t"
+BLOCK_MARKER = b" nodal point"
+NODE_WIDTH = 10
+FIELD_WIDTH = 12
+ACCELERATION_FIELDS = (6, 7, 8)  # x/y/z-accl in the translational block, x/y/z-rot acc in the rotational one
+BLOCK_KINDS = ("translational", "rotational")
+
+_TIME = re.compile(rb"at time\s*([-+0-9.EeDd]+)")
+_HISTORY_CARD = re.compile(r"^\*DATABASE_HISTORY_NODE(_ID)?\s*$", re.IGNORECASE)
+
+
+def _fortran_float(field: bytes) -> float:
+    """Parses a Fortran E field, including the "1.2345-100" form used for 3-digit exponents."""
+    try:
+        return float(field)
+    except ValueError:
+        text = field.strip().decode().replace("D", "E").replace("d", "E")
+        return float(re.sub(r"(?<=[0-9.])([-+])(\d+)$", r"E\1\2", text))
+
+
+def _accelerations(line: bytes) -> List[float]:
+    return [_fortran_float(line[NODE_WIDTH + FIELD_WIDTH * k:NODE_WIDTH + FIELD_WIDTH * (k + 1)])
+            for k in ACCELERATION_FIELDS]
+
+
+def _block_kind(line: bytes) -> str:
+    return "rotational" if b"rot" in line else "translational"
+
+
+def _state_time(line: bytes) -> float:
+    match = _TIME.search(line)
+    if match is None:
+        raise ValueError(f"No time in nodout state header: {line.decode(errors='replace').strip()}")
+    return _fortran_float(match.group(1))
+
+
+def history_nodes(key_path: str) -> List[int]:
+    """
+    Lists the node IDs requested under *DATABASE_HISTORY_NODE(_ID) in a keyword deck.
+
+    These are the nodes written to nodout, e.g. the head-form accelerometer node.
+
+    Args:
+        key_path (str): Path to the LS-DYNA keyword (.key/.k) file.
+
+    Returns:
+        List[int]: Node IDs in deck order.
+    """
+    if not os.path.exists(key_path):
+        raise FileNotFoundError(f"File not found: {key_path}")
+    nodes = []
+    in_card, with_title = False, False
+    with open(key_path, "r", errors="replace") as f:
+        for line in f:
+            if line.startswith("*"):
+                match = _HISTORY_CARD.match(line.strip())
+                in_card, with_title = match is not None, bool(match and match.group(1))
+                continue
+            if not in_card or line.startswith("$") or not line.strip():
+                continue
+            if with_title:
+                # _ID variant: one node per card, a 10-character ID followed by its heading
+                nodes.append(int(line[:10]))
+            else:
+                nodes.extend(int(line[i:i + 10]) for i in range(0, min(len(line.rstrip()), 80), 10)
+                             if line[i:i + 10].strip() and int(line[i:i + 10]) != 0)
+    return nodes
+
+
+class NodoutIndex:
+    """Byte offsets of every block in a nodout file and the row of every node within a block."""
+
+    def __init__(self, path: str, times: np.ndarray, offsets: Dict[str, np.ndarray],
+                 rows: Dict[str, Dict[int, int]], row_bytes: Dict[str, int]):
+        """
+        Args:
+            path (str): The indexed nodout file.
+            times (np.ndarray): Time of each state in seconds.
+            offsets (Dict[str, np.ndarray]): Block kind -> byte offset of each state's first node row.
+            rows (Dict[str, Dict[int, int]]): Block kind -> node ID -> row number within the block.
+            row_bytes (Dict[str, int]): Block kind -> length of one node row, or 0 if rows vary in length.
+        """
+        self.path = path
+        self.times = times
+        self.offsets = offsets
+        self.rows = rows
+        self.row_bytes = row_bytes
+
+    def __repr__(self) -> str:
+        return f"NodoutIndex(path={self.path!r}, states={len(self.times)}, nodes={len(self.rows['translational'])})"
+
+    @property
+    def nodes(self) -> List[int]:
+        """Node IDs in output order."""
+        return list(self.rows["translational"])
+
+
+def index_nodout(path: str) -> NodoutIndex:
+    """
+    Indexes a nodout file in one pass without keeping any samples.
+
+    Args:
+        path (str): Path to the ASCII nodout file.
+
+    Returns:
+        NodoutIndex: State times, block offsets and node rows.
+    """
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"File not found: {path}")
+    times = []
+    offsets = {kind: [] for kind in BLOCK_KINDS}
+    rows = {kind: {} for kind in BLOCK_KINDS}
+    lengths = {kind: set() for kind in BLOCK_KINDS}
+    time, kind, recording = None, None, False
+    position = 0
+    with open(path, "rb") as f:
+        for line in f:
+            position += len(line)
+            if STATE_MARKER in line:
+                time, kind, recording = _state_time(line), None, False
+            elif line.startswith(BLOCK_MARKER):
+                kind = _block_kind(line)
+                if kind == "translational" or not offsets["translational"]:
+                    times.append(time)
+                offsets[kind].append(position)
+                recording = len(offsets[kind]) == 1
+            elif recording and line.strip():
+                rows[kind][int(line[:NODE_WIDTH])] = len(rows[kind])
+                lengths[kind].add(len(line))
+            elif recording and rows[kind]:
+                recording = False
+
+    row_bytes = {kind: lengths[kind].pop() if len(lengths[kind]) == 1 else 0 for kind in BLOCK_KINDS}
+    return NodoutIndex(path, np.array(times, dtype=float),
+                       {kind: np.array(offsets[kind], dtype=np.int64) for kind in BLOCK_KINDS}, rows, row_bytes)
+
+
+def _read_indexed(f, index: NodoutIndex, kind: str, node_id: int) -> np.ndarray:
+    """Seeks straight to the node's row in every block of `kind`, scanning the block only if the row moved."""
+    key = b"%*d" % (NODE_WIDTH, node_id)
+    row = index.rows[kind][node_id]
+    values = np.empty((len(index.offsets[kind]), 3))
+    for state, offset in enumerate(index.offsets[kind]):
+        line = b""
+        if index.row_bytes[kind]:
+            f.seek(offset + row * index.row_bytes[kind])
+            line = f.readline()
+        if not line.startswith(key):
+            f.seek(offset)
+            for line in iter(f.readline, b""):
+                if line.startswith(key) or not line.strip():
+                    break
+            if not line.startswith(key):
+                raise ValueError(f"Node {node_id} is missing from state {state} of {index.path}")
+        values[state] = _accelerations(line)
+    return values
+
+
+def read_nodout(path: str, node_id: int, index: Optional[NodoutIndex] = None, linear_scale: float = 1.0,
+                angular_scale: float = 1.0) -> Trace:
+    """
+    Extracts one node's linear and angular accelerations from an ASCII nodout file.
+
+    Without an index the file is streamed once and only the node's own rows are parsed,
+    so memory grows with the number of states, not with the file size. With an index from
+    `index_nodout`, each block is read by seeking to the node's row; this is the faster
+    way to pull several nodes out of the same file.
+
+    Args:
+        path (str): Path to the ASCII nodout file.
+        node_id (int): Node to extract, e.g. the head CG or accelerometer node (see `history_nodes`).
+        index (Optional[NodoutIndex]): Index of `path` from `index_nodout`.
+        linear_scale (float): Factor applied to the linear accelerations (1.0 keeps model units,
+            e.g. mm/s² for HIC and SI; 1 / 9810 gives G for HIP and GAMBIT).
+        angular_scale (float): Factor applied to the angular accelerations.
+
+    Returns:
+        Trace: Columns Time, ax, ay, az, alphax, alphay, alphaz. The angular columns are NaN
+        when the node has no rotational output.
+    """
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"File not found: {path}")
+
+    if index is not None:
+        if node_id not in index.rows["translational"]:
+            raise ValueError(f"Node {node_id} is not in {path}")
+        with open(path, "rb") as f:
+            linear = _read_indexed(f, index, "translational", node_id)
+            angular = (_read_indexed(f, index, "rotational", node_id)
+                       if node_id in index.rows["rotational"] else None)
+        times = index.times
+    else:
+        key = b"%*d" % (NODE_WIDTH, node_id)
+        times, rows = [], {kind: [] for kind in BLOCK_KINDS}
+        time, kind = None, None
+        with open(path, "rb") as f:
+            for line in f:
+                if line.startswith(key) and kind is not None:
+                    rows[kind].append(_accelerations(line))
+                elif STATE_MARKER in line:
+                    time = _state_time(line)
+                elif line.startswith(BLOCK_MARKER):
+                    kind = _block_kind(line)
+                    if kind == "translational":
+                        times.append(time)
+        if not rows["translational"]:
+            raise ValueError(f"Node {node_id} is not in {path}")
+        times = np.array(times, dtype=float)
+        linear = np.array(rows["translational"])
+        angular = np.array(rows["rotational"]) if rows["rotational"] else None
+
+    if angular is not None and len(angular) != len(linear):
+        raise ValueError(f"Node {node_id} has {len(linear)} translational but {len(angular)} rotational states")
+    data = np.empty((len(linear), 7), order="F")
+    data[:, 0] = times
+    data[:, 1:4] = linear * linear_scale
+    data[:, 4:7] = angular * angular_scale if angular is not None else np.nan
+    return Trace(data, KINEMATIC_COLUMNS, path)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Runs the command-line interface (`sentinel-triage nodout` or `python -m sentinel_triage.lsdyna`)."""
+    parser = argparse.ArgumentParser(description="Extract a node's accelerations from an LS-DYNA ASCII nodout file")
+    parser.add_argument("nodout", type=str, help="ASCII nodout file")
+    parser.add_argument("--node", type=int, default=None, help="Node ID (default: first history node of --key)")
+    parser.add_argument("--key", type=str, default=None, help="Keyword deck listing the history nodes")
+    parser.add_argument("--linear_scale", type=float, default=1.0, help="Factor applied to linear accelerations")
+    parser.add_argument("--angular_scale", type=float, default=1.0, help="Factor applied to angular accelerations")
+    parser.add_argument("--output", type=str, default="impact_data.csv", help="Destination CSV file")
+    args = parser.parse_args(argv)
+
+    node = args.node
+    if node is None:
+        if args.key is None:
+            parser.error("Give --node or a --key deck with *DATABASE_HISTORY_NODE")
+        nodes = history_nodes(args.key)
+        if not nodes:
+            parser.error(f"No *DATABASE_HISTORY_NODE entries in {args.key}")
+        node = nodes[0]
+
+    trace = read_nodout(args.nodout, node, linear_scale=args.linear_scale, angular_scale=args.angular_scale)
+    np.savetxt(args.output, trace.data, delimiter=",", header=",".join(trace.columns), comments="", fmt="%.10g")
+    print(f"{len(trace)} samples of node {node} written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
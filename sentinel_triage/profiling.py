@@ -0,0 +1,238 @@
+import contextlib
+import cProfile
+import threading
+import time
+from typing import Dict, Iterator, List, Mapping, Optional
+
+# Counters kept for every stage
+FIELDS = ("calls", "seconds", "self_seconds", "samples", "bytes")
+
+
+class Profile:
+    """
+    Per-stage timers and counters, filled in while the profile is enabled.
+
+    Stages nest: "HIP" includes the "integrate" stage it calls, so "seconds" is the
+    inclusive time and "self_seconds" the time not spent in a nested stage. Each
+    distinct stack of nested stages is also kept, for flame graph tools (`collapsed`).
+    """
+
+    def __init__(self):
+        self.stages: Dict[str, Dict[str, float]] = {}
+        self.stacks: Dict[str, float] = {}  # "HIP;integrate" -> self seconds
+        self.wall_seconds: Optional[float] = None
+        self._lock = threading.Lock()
+        self._local = threading.local()  # Open stages of each thread
+
+    def __repr__(self) -> str:
+        return f"Profile(stages={sorted(self.stages)})"
+
+    def _open(self) -> List["_Stage"]:
+        if not hasattr(self._local, "open"):
+            self._local.open = []
+        return self._local.open
+
+    def record(self, name: str, seconds: float, self_seconds: Optional[float] = None, samples: int = 0, nbytes: int = 0,
+               stack: Optional[str] = None, calls: int = 1) -> None:
+        """
+        Adds one measurement of a stage.
+
+        Args:
+            name (str): Stage name, e.g. "filter".
+            seconds (float): Time spent in the stage, nested stages included.
+            self_seconds (float): Time spent in the stage itself (default: `seconds`).
+            samples (int): Values processed (samples × channels).
+            nbytes (int): Bytes read.
+            stack (Optional[str]): Names of the enclosing stages and this one, joined by ";" (default: `name`).
+            calls (int): Number of calls the measurement covers.
+        """
+        self_seconds = seconds if self_seconds is None else self_seconds
+        with self._lock:
+            counters = self.stages.setdefault(name, dict.fromkeys(FIELDS, 0))
+            counters["calls"] += calls
+            counters["seconds"] += seconds
+            counters["self_seconds"] += self_seconds
+            counters["samples"] += samples
+            counters["bytes"] += nbytes
+            stack = stack or name
+            self.stacks[stack] = self.stacks.get(stack, 0.0) + self_seconds
+
+    def merge(self, data: Mapping[str, object]) -> None:
+        """
+        Adds the counters of another profile, e.g. one collected in a worker process.
+
+        Args:
+            data (Mapping[str, object]): Output of `to_dict`.
+        """
+        with self._lock:
+            for name, counters in data["stages"].items():
+                totals = self.stages.setdefault(name, dict.fromkeys(FIELDS, 0))
+                for field in FIELDS:
+                    totals[field] += counters[field]
+            for stack, seconds in data["stacks"].items():
+                self.stacks[stack] = self.stacks.get(stack, 0.0) + seconds
+
+    def to_dict(self) -> Dict[str, object]:
+        """
+        Returns:
+            Dict[str, object]: "stages" (name -> counters keyed by `FIELDS`), "stacks" (stack -> self
+            seconds) and "wall_seconds"; plain values, so the profile can be pickled or written as JSON.
+        """
+        with self._lock:
+            return {"stages": {name: dict(counters) for name, counters in self.stages.items()},
+                    "stacks": dict(self.stacks), "wall_seconds": self.wall_seconds}
+
+    def format(self) -> str:
+        """
+        Returns:
+            str: A table of the stages, most expensive (by self time) first.
+        """
+        stages = self.to_dict()["stages"]
+        total = sum(counters["self_seconds"] for counters in stages.values()) or 1.0
+        lines = [f"{'stage':<12} {'calls':>8} {'total s':>10} {'self s':>10} {'self %':>7} {'samples':>13} {'MB read':>9}"]
+        for name, counters in sorted(stages.items(), key=lambda item: -item[1]["self_seconds"]):
+            lines.append(f"{name:<12} {counters['calls']:>8} {counters['seconds']:>10.4f} {counters['self_seconds']:>10.4f} "
+                         f"{100 * counters['self_seconds'] / total:>6.1f}% {counters['samples']:>13} "
+                         f"{counters['bytes'] / 2**20:>9.2f}")
+        if self.wall_seconds is not None:
+            lines.append(f"wall time {self.wall_seconds:.4f} s")
+        return "\n".join(lines)
+
+    def collapsed(self) -> str:
+        """
+        Returns:
+            str: One "stage;nested_stage microseconds" line per stack, the folded format read by
+            flamegraph.pl, speedscope and inferno.
+        """
+        return "".join(f"{stack} {round(seconds * 1e6)}\n" for stack, seconds in sorted(self.to_dict()["stacks"].items()))
+
+
+class _Stage:
+    __slots__ = ("profile", "name", "samples", "nbytes", "stack", "start", "nested")
+
+    def __init__(self, profile: Profile, name: str, samples: int, nbytes: int):
+        self.profile = profile
+        self.name = name
+        self.samples = samples
+        self.nbytes = nbytes
+
+    def add(self, samples: int = 0, nbytes: int = 0) -> None:
+        """Counts samples or bytes that were only known once the stage had started."""
+        self.samples += samples
+        self.nbytes += nbytes
+
+    def __enter__(self) -> "_Stage":
+        open_stages = self.profile._open()
+        self.stack = f"{open_stages[-1].stack};{self.name}" if open_stages else self.name
+        self.nested = 0.0
+        open_stages.append(self)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        seconds = time.perf_counter() - self.start
+        open_stages = self.profile._open()
+        open_stages.pop()
+        if open_stages:
+            open_stages[-1].nested += seconds
+        self.profile.record(self.name, seconds, seconds - self.nested, self.samples, self.nbytes, self.stack)
+
+
+class _Disabled:
+    __slots__ = ()
+
+    def add(self, samples: int = 0, nbytes: int = 0) -> None:
+        pass
+
+    def __enter__(self) -> "_Disabled":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        pass
+
+
+_DISABLED = _Disabled()
+
+# Profile the stages report to, or None when profiling is off
+_active: Optional[Profile] = None
+
+
+def stage(name: str, samples: int = 0, nbytes: int = 0):
+    """
+    Times a block of code as one call of a stage, when profiling is enabled.
+
+    When it is not, a shared no-op context is returned, so an instrumented call costs
+    one global lookup.
+
+    Args:
+        name (str): Stage name, e.g. "read_csv", "filter", "integrate" or "HIC".
+        samples (int): Values processed (samples × channels).
+        nbytes (int): Bytes read.
+
+    Returns:
+        A context manager; its `add(samples, nbytes)` counts work found out inside the block.
+    """
+    if _active is None:
+        return _DISABLED
+    return _Stage(_active, name, samples, nbytes)
+
+
+def active() -> Optional[Profile]:
+    """Returns the profile being collected, or None when profiling is off."""
+    return _active
+
+
+def enable(profile: Optional[Profile] = None) -> Profile:
+    """
+    Starts sending stage measurements to `profile` (a new one by default).
+
+    Returns:
+        Profile: The profile now being collected.
+    """
+    global _active
+    _active = profile if profile is not None else Profile()
+    return _active
+
+
+def disable() -> Optional[Profile]:
+    """
+    Stops profiling.
+
+    Returns:
+        Optional[Profile]: The profile that was being collected.
+    """
+    global _active
+    profile, _active = _active, None
+    return profile
+
+
+@contextlib.contextmanager
+def profiled(cprofile_path: Optional[str] = None) -> Iterator[Profile]:
+    """
+    Collects a stage profile of the enclosed block, and optionally a cProfile of it.
+
+    Batch runs started inside the block (`batch.run_batch`) merge the profiles of their
+    worker processes into it.
+
+    Args:
+        cprofile_path (Optional[str]): File to write `cProfile` statistics of this process to, for
+            `python -m pstats`, snakeviz or gprof2dot.
+
+    Yields:
+        Profile: The profile being collected; complete once the block exits.
+    """
+    global _active
+    previous = _active
+    profile = _active = Profile()
+    profiler = cProfile.Profile() if cprofile_path else None
+    start = time.perf_counter()
+    if profiler is not None:
+        profiler.enable()
+    try:
+        yield profile
+    finally:
+        if profiler is not None:
+            profiler.disable()
+            profiler.dump_stats(cprofile_path)
+        profile.wall_seconds = time.perf_counter() - start
+        _active = previous
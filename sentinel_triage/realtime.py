@@ -0,0 +1,201 @@
+import argparse
+import itertools
+import json
+import sys
+import time
+from typing import Dict, IO, Iterable, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+
+from sentinel_triage import filters
+from sentinel_triage.engine import ACCEL_UNITS, TriageEngine
+from sentinel_triage.gambit import StreamingGAMBIT
+from sentinel_triage.hic import StreamingHIC
+from sentinel_triage.hip import StreamingHIP
+from sentinel_triage.si import StreamingSI
+from sentinel_triage.streaming import CausalFilter
+from sentinel_triage.traces import KINEMATIC_COLUMNS, Trace, load_trace
+
+
+class RealtimeTriage:
+    """
+    Scores samples as they arrive, one at a time or in small blocks, keeping every criterion's state.
+
+    Each filter runs causally with its state carried from block to block (`CausalFilter`),
+    HIP integrates its channels with a running trapezoid, GAMBIT and HIP keep running maxima,
+    and HIC only searches the windows the new samples close. An update therefore costs time
+    proportional to the block, plus HIC's bounded window buffer.
+
+    HIC and SI match the post-hoc calculators exactly, since their filters are causal by
+    default. HIP and GAMBIT match `HIPCalculator`/`GAMBITCalculator` with phase="causal":
+    their default zero-phase filters need samples that have not arrived yet.
+
+    The resultant and the kinematic block are built by a `TriageEngine` with the same
+    `accel_units`, so the running scores read the linear channels as the engine does.
+    """
+
+    def __init__(self, frequency: float, x_location: int = 2, y_location: int = 3, z_location: int = 4,
+                 limits_ms: Tuple[float, ...] = (15.0, 36.0), accel_units: Optional[str] = None):
+        """
+        Args:
+            frequency (float): Sampling frequency (time step in seconds).
+            x_location (int): Column index for X direction data (HIC and SI).
+            y_location (int): Column index for Y direction data (HIC and SI).
+            z_location (int): Column index for Z direction data (HIC and SI).
+            limits_ms (Tuple[float, ...]): HIC window limits in milliseconds.
+            accel_units (Optional[str]): Units of the linear channels, "g" or "mm/s2"; see `TriageEngine`.
+        """
+        self._engine = TriageEngine(frequency, x_location, y_location, z_location, limits_ms, accel_units=accel_units)
+        hic, hip, gambit = self._engine.hic, self._engine.hip, self._engine.gambit
+        self.frequency = frequency
+        self.locations = (x_location, y_location, z_location)
+        self.accel_units = accel_units
+        self.samples = 0
+        self.time = None
+        self._resultant_filter = CausalFilter(filters.butter_lowpass_sos(hic.order, hic.cutoff, frequency))
+        self._hip_filter = CausalFilter(hip.butter_lowpass_cascade())
+        self._gambit_filter = CausalFilter(gambit.filter_sos())
+        self.hic = StreamingHIC(frequency, limits_ms)
+        self.si = StreamingSI(frequency)
+        self.hip = StreamingHIP(frequency)
+        self.gambit = StreamingGAMBIT(gambit.a_c, gambit.alpha_c)
+
+    def update(self, block: np.ndarray) -> Dict[str, object]:
+        """
+        Adds the next samples and returns the updated estimates.
+
+        Args:
+            block (np.ndarray): One sample of shape (7,) or a block of shape (n_samples, 7), in the
+                Time, ax, ay, az, alphax, alphay, alphaz layout (HIC and SI read the configured columns).
+
+        Returns:
+            Dict[str, object]: As `result`.
+        """
+        block = np.asarray(block, dtype=float)
+        if block.ndim == 1:
+            block = block[None, :]
+        if len(block) == 0:
+            return self.result()
+        if block.shape[1] < len(KINEMATIC_COLUMNS):
+            raise ValueError(f"Expected samples with {len(KINEMATIC_COLUMNS)} columns, got shape {block.shape}")
+
+        magnitudes = self._resultant_filter(self._engine.resultant(block))
+        self.hic.update(magnitudes)
+        self.si.update(magnitudes)
+        channels = self._engine.kinematics(block)[:, 1:7]
+        self.hip.update(block[:, 0], self._hip_filter(channels))
+        self.gambit.update(self._gambit_filter(channels))
+        self.samples += len(block)
+        self.time = float(block[-1, 0])
+        return self.result()
+
+    def result(self) -> Dict[str, object]:
+        """
+        Returns:
+            Dict[str, object]: "samples" and "time" (of the newest sample) followed by running
+            estimates keyed like `TriageEngine.run` ("HIC15", "HIC15_t1", ..., "SI", "HIP_m", "GAMBIT").
+        """
+        results = {"samples": self.samples, "time": self.time}
+        for name, (hic_value, t1, t2) in self.hic.result().items():
+            results[name], results[f"{name}_t1"], results[f"{name}_t2"] = hic_value, t1, t2
+        results["SI"] = self.si.result()
+        results["HIP_m"] = self.hip.result() if self.samples else None
+        results["GAMBIT"] = self.gambit.result()
+        return results
+
+    def run(self, blocks: Iterable[np.ndarray]) -> Iterator[Dict[str, object]]:
+        """
+        Feeds blocks from a source such as `iter_blocks` or `iter_stream_blocks`.
+
+        Args:
+            blocks (Iterable[np.ndarray]): Consecutive blocks of samples.
+
+        Yields:
+            Dict[str, object]: The estimates after each block.
+        """
+        for block in blocks:
+            yield self.update(block)
+
+
+def iter_blocks(data: Union[Trace, np.ndarray], block_size: int = 1, pace: bool = False) -> Iterator[np.ndarray]:
+    """
+    Replays a recording block by block, as a stand-in for a live sensor.
+
+    Args:
+        data (Union[Trace, np.ndarray]): A loaded trace or an (n_samples, 7) array.
+        block_size (int): Samples per block.
+        pace (bool): Wait until each block's last time stamp has elapsed since the replay began.
+
+    Yields:
+        np.ndarray: Blocks of shape (block_size, 7); the last may be shorter.
+    """
+    if isinstance(data, Trace):
+        data = data.select(KINEMATIC_COLUMNS)
+    data = np.ascontiguousarray(data, dtype=float)
+    began = time.perf_counter()
+    for start in range(0, len(data), block_size):
+        block = data[start:start + block_size]
+        if pace:
+            delay = (block[-1, 0] - data[0, 0]) - (time.perf_counter() - began)
+            if delay > 0:
+                time.sleep(delay)
+        yield block
+
+
+def iter_stream_blocks(stream: IO[str], block_size: int = 1, delimiter: str = ",") -> Iterator[np.ndarray]:
+    """
+    Reads CSV rows from a text stream as they arrive, e.g. stdin or `socket.makefile("r")`.
+
+    A first line that is not numeric is taken as the header and skipped.
+
+    Args:
+        stream (IO[str]): Stream of CSV lines in the Time, ax, ay, az, alphax, alphay, alphaz layout.
+        block_size (int): Rows per block; a block is yielded once that many rows have arrived.
+        delimiter (str): Field delimiter.
+
+    Yields:
+        np.ndarray: Float64 blocks with shape (rows, n_columns); only the last may be shorter.
+    """
+    lines = (line for line in stream if line.strip())
+    first = next(lines, None)
+    if first is None:
+        return
+    try:
+        float(first.split(delimiter)[0])
+        lines = itertools.chain([first], lines)
+    except ValueError:
+        pass  # Header row
+    while True:
+        rows = list(itertools.islice(lines, block_size))
+        if not rows:
+            return
+        yield np.loadtxt(rows, delimiter=delimiter, ndmin=2, dtype=np.float64)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Runs the command-line interface (`sentinel-triage realtime` or `python -m sentinel_triage.realtime`)."""
+    parser = argparse.ArgumentParser(description="Score a live or replayed head impact stream as samples arrive")
+    parser.add_argument("source", type=str, help="CSV file to replay, or - to read rows from stdin as they arrive")
+    parser.add_argument("--frequency", type=float, required=True, help="Sampling frequency (time step in seconds, e.g., 0.0001)")
+    parser.add_argument("--accel_units", choices=ACCEL_UNITS, required=True,
+                        help="Units of the ax, ay, az columns, applied to all four criteria")
+    parser.add_argument("--block_size", type=int, default=16, help="Samples per update")
+    parser.add_argument("--report_every", type=int, default=100, help="Print the estimates every this many updates")
+    parser.add_argument("--pace", action="store_true", help="Replay a file at the speed it was recorded")
+    args = parser.parse_args(argv)
+
+    if args.source == "-":
+        blocks = iter_stream_blocks(sys.stdin, args.block_size)
+    else:
+        blocks = iter_blocks(load_trace(args.source), args.block_size, pace=args.pace)
+
+    scorer = RealtimeTriage(args.frequency, accel_units=args.accel_units)
+    results = scorer.result()
+    for count, results in enumerate(scorer.run(blocks), start=1):
+        if count % args.report_every == 0:
+            print(json.dumps(results), flush=True)
+    print(json.dumps(results), flush=True)
+
+
+if __name__ == "__main__":
+    main()
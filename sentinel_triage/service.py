@@ -0,0 +1,320 @@
+import argparse
+import asyncio
+import collections
+import functools
+import json
+import os
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import AsyncIterator, Dict, IO, Iterable, Iterator, List, Optional
+
+from sentinel_triage.traces import Trace
+from sentinel_triage.worker import Worker, parse_request, warm_up
+
+EXECUTORS = ("process", "thread")
+
+# Worker of each scoring thread; each process of a process pool has its own
+_local = threading.local()
+
+
+def _score_trace(trace: Trace, request: Dict[str, object]) -> Dict[str, object]:
+    if not hasattr(_local, "worker"):
+        _local.worker = Worker()
+    return _local.worker.score(trace, request)
+
+
+class IngestionService:
+    """
+    Asyncio pipeline that reads and parses upcoming traces while earlier ones are scored.
+
+    Requests pass through two bounded queues. Reader tasks take requests from the first,
+    parse the trace on a thread pool and put it on the second; scorer tasks hand the
+    parsed traces to a process pool, where a `Worker` scores them with HIC, SI, HIP and
+    GAMBIT. File reads therefore overlap the numeric work, and a campaign takes about
+    max(I/O, CPU) instead of their sum. When scoring falls behind, the second queue
+    fills, the readers pause, the first queue fills and `submit` waits, so memory stays
+    bounded however fast requests arrive.
+    """
+
+    def __init__(self, readers: int = 4, workers: Optional[int] = None, queue_size: int = 16,
+                 executor: str = "process", warm_frequency: Optional[float] = None):
+        """
+        Args:
+            readers (int): Traces read and parsed at the same time.
+            workers (Optional[int]): Scoring processes or threads (default: CPU count).
+            queue_size (int): Capacity of each queue, so at most this many parsed traces wait for a scorer.
+            executor (str): "process" for a process pool, or "thread" to score on threads, which only
+                overlap the parts of scoring that release the GIL.
+            warm_frequency (Optional[float]): Time step to load SciPy, filters and kernels for when each
+                process starts (see `worker.warm_up`).
+        """
+        if executor not in EXECUTORS:
+            raise ValueError(f"Unknown executor {executor!r}; choose from {', '.join(EXECUTORS)}")
+        self.readers = readers
+        self.workers = workers or os.cpu_count() or 1
+        self.queue_size = queue_size
+        self.executor = executor
+        self.warm_frequency = warm_frequency
+        self.completed = 0
+        self._tasks: List[asyncio.Task] = []
+
+    async def __aenter__(self) -> "IngestionService":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def start(self) -> None:
+        """Creates the queues, the executors and the reader and scorer tasks."""
+        self._requests = asyncio.Queue(self.queue_size)
+        self._parsed = asyncio.Queue(self.queue_size)
+        self._io = ThreadPoolExecutor(self.readers, thread_name_prefix="sentinel-reader")
+        if self.executor == "process":
+            warm = {"initializer": warm_up, "initargs": (self.warm_frequency,)} if self.warm_frequency is not None else {}
+            self._cpu = ProcessPoolExecutor(self.workers, **warm)
+        else:
+            self._cpu = ThreadPoolExecutor(self.workers, thread_name_prefix="sentinel-scorer")
+            if self.warm_frequency is not None:
+                await asyncio.get_running_loop().run_in_executor(self._cpu, warm_up, self.warm_frequency)
+        self._tasks = ([asyncio.create_task(self._run_reader()) for _ in range(self.readers)]
+                       + [asyncio.create_task(self._run_scorer()) for _ in range(self.workers)])
+
+    async def close(self) -> None:
+        """Waits for the submitted requests to finish, then stops the tasks and executors."""
+        await self._requests.join()
+        await self._parsed.join()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._io.shutdown()
+        self._cpu.shutdown()
+
+    def status(self) -> Dict[str, int]:
+        """
+        Returns:
+            Dict[str, int]: Requests waiting to be read ("queued"), parsed traces waiting for a scorer
+            ("parsed") and responses produced so far ("completed").
+        """
+        return {"queued": self._requests.qsize(), "parsed": self._parsed.qsize(), "completed": self.completed}
+
+    async def submit(self, request: Dict[str, object]) -> "asyncio.Future[Dict[str, object]]":
+        """
+        Queues a request, waiting while the pipeline is full.
+
+        Args:
+            request (Dict[str, object]): A request as described in `Worker.handle`.
+
+        Returns:
+            asyncio.Future[Dict[str, object]]: Resolves to the response of `Worker.handle`.
+        """
+        future = asyncio.get_running_loop().create_future()
+        await self._requests.put((request, future))
+        return future
+
+    async def score(self, request: Dict[str, object]) -> Dict[str, object]:
+        """Scores one request and returns its response."""
+        return await (await self.submit(request))
+
+    async def map(self, requests: Iterable[Dict[str, object]]) -> AsyncIterator[Dict[str, object]]:
+        """
+        Scores a stream of requests, keeping the pipeline full.
+
+        Args:
+            requests (Iterable[Dict[str, object]]): Requests as described in `Worker.handle`.
+
+        Yields:
+            Dict[str, object]: Responses in the order of `requests`.
+        """
+        pending = collections.deque()
+        window = 2 * self.queue_size + self.readers + self.workers
+        for request in requests:
+            if len(pending) >= window:
+                yield await pending.popleft()
+            pending.append(await self.submit(request))
+        while pending:
+            yield await pending.popleft()
+
+    def _finish(self, future: asyncio.Future, request: Dict[str, object], response: Dict[str, object]) -> None:
+        self.completed += 1
+        if not future.done():
+            future.set_result({"id": request.get("id"), **response})
+
+    async def _run_reader(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            request, future = await self._requests.get()
+            try:
+                trace = await loop.run_in_executor(self._io, Worker.load, request)
+            except Exception as e:
+                self._finish(future, request, {"error": str(e)})
+            else:
+                await self._parsed.put((trace, request, future))
+            finally:
+                self._requests.task_done()
+
+    async def _run_scorer(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            trace, request, future = await self._parsed.get()
+            try:
+                response = await loop.run_in_executor(self._cpu, _score_trace, trace, request)
+            except Exception as e:
+                response = {"error": str(e)}
+            finally:
+                self._parsed.task_done()
+            self._finish(future, request, response)
+
+
+def iter_responses(requests: Iterable[Dict[str, object]], **options) -> Iterator[Dict[str, object]]:
+    """
+    Runs an `IngestionService` on its own event loop, for callers that are not async.
+
+    Args:
+        requests (Iterable[Dict[str, object]]): Requests as described in `Worker.handle`.
+        **options: Arguments of `IngestionService`.
+
+    Yields:
+        Dict[str, object]: Responses in the order of `requests`.
+    """
+    async def responses() -> AsyncIterator[Dict[str, object]]:
+        async with IngestionService(**options) as service:
+            async for response in service.map(requests):
+                yield response
+
+    loop = asyncio.new_event_loop()
+    stream = responses()
+    try:
+        while True:
+            try:
+                yield loop.run_until_complete(stream.__anext__())
+            except StopAsyncIteration:
+                return
+    finally:
+        loop.run_until_complete(stream.aclose())
+        loop.close()
+
+
+async def serve_stream(service: IngestionService, requests: IO[str], responses: IO[str]) -> int:
+    """
+    Answers JSON requests, one per line of `requests`, with one JSON line each on `responses`.
+
+    Responses are written as they complete, so they may come out of order; match them
+    by "id". Reading stops while the pipeline is full.
+
+    Args:
+        service (IngestionService): A started service.
+        requests (IO[str]): Stream of JSON requests, e.g. stdin; blank lines are skipped.
+        responses (IO[str]): Stream the responses are written and flushed to.
+
+    Returns:
+        int: Number of requests answered.
+    """
+    loop = asyncio.get_running_loop()
+
+    def write(response: Dict[str, object]) -> None:
+        responses.write(json.dumps(response) + "\n")
+        responses.flush()
+
+    pending = []
+    while True:
+        line = await loop.run_in_executor(None, requests.readline)
+        if not line:
+            break
+        if not line.strip():
+            continue
+        try:
+            request = parse_request(line)
+        except ValueError as e:
+            write({"id": None, "error": f"Invalid request: {e}"})
+            continue
+        future = await service.submit(request)
+        future.add_done_callback(lambda done: write(done.result()))
+        pending.append(future)
+    await asyncio.gather(*pending)
+    return len(pending)
+
+
+async def _handle_http(service: IngestionService, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    status, payload = 200, None
+    try:
+        method, target, _ = (await reader.readline()).decode("latin-1").split(" ", 2)
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        body = await reader.readexactly(int(headers.get("content-length", 0)))
+
+        if method == "GET" and target == "/health":
+            payload = service.status()
+        elif method == "POST" and target == "/score":
+            try:
+                request = parse_request(body.decode("utf-8"))
+            except ValueError as e:
+                status, payload = 400, {"id": None, "error": f"Invalid request: {e}"}
+            else:
+                payload = await service.score(request)
+        else:
+            status, payload = 404, {"error": f"No route for {method} {target}"}
+    except (ValueError, asyncio.IncompleteReadError) as e:
+        status, payload = 400, {"error": f"Malformed HTTP request: {e}"}
+
+    body = json.dumps(payload).encode("utf-8")
+    reason = {200: "OK", 400: "Bad Request", 404: "Not Found"}[status]
+    writer.write(f"HTTP/1.1 {status} {reason}\r\nContent-Type: application/json\r\nContent-Length: {len(body)}\r\n"
+                 f"Connection: close\r\n\r\n".encode("latin-1") + body)
+    try:
+        await writer.drain()
+    finally:
+        writer.close()
+
+
+async def serve_http(service: IngestionService, host: str = "127.0.0.1", port: int = 8765) -> None:
+    """
+    Serves `POST /score` (a JSON request as in `Worker.handle`, answered with its response)
+    and `GET /health` (the service's `status`) until cancelled.
+
+    Args:
+        service (IngestionService): A started service.
+        host (str): Interface to listen on; the default only accepts local connections.
+        port (int): TCP port.
+    """
+    server = await asyncio.start_server(functools.partial(_handle_http, service), host, port)
+    async with server:
+        print(f"Listening on http://{host}:{port}", file=sys.stderr, flush=True)
+        await server.serve_forever()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Runs the command-line interface (`sentinel-triage serve` or `python -m sentinel_triage.service`)."""
+    parser = argparse.ArgumentParser(description="Score JSON requests from stdin or HTTP, reading traces while others are scored")
+    parser.add_argument("--http", type=int, default=None, metavar="PORT", help="Serve HTTP on this port instead of reading stdin")
+    parser.add_argument("--host", type=str, default="127.0.0.1", help="Interface for --http")
+    parser.add_argument("--readers", type=int, default=4, help="Traces read and parsed at the same time")
+    parser.add_argument("--workers", type=int, default=None, help="Scoring processes (default: CPU count)")
+    parser.add_argument("--queue_size", type=int, default=16, help="Capacity of the read and score queues")
+    parser.add_argument("--executor", choices=EXECUTORS, default="process", help="Score on processes or threads")
+    parser.add_argument("--warm_frequency", type=float, default=1e-4, help="Time step to load filters and kernels for up front")
+    parser.add_argument("--no_warm_up", action="store_true", help="Skip the warm-up; the first requests pay the start-up")
+    args = parser.parse_args(argv)
+
+    async def run() -> None:
+        async with IngestionService(args.readers, args.workers, args.queue_size, args.executor,
+                                    None if args.no_warm_up else args.warm_frequency) as service:
+            if args.http is not None:
+                await serve_http(service, args.host, args.http)
+            else:
+                await serve_stream(service, sys.stdin, sys.stdout)
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
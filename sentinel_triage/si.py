@@ -0,0 +1,237 @@
+import numpy as np
+import argparse
+from typing import List, Optional, Union
+
+from sentinel_triage import filters, kernels, profiling
+from sentinel_triage.streaming import CausalFilter, iter_csv_chunks
+from sentinel_triage.traces import Trace, load_trace
+
+
+class SICalculator:
+    def __init__(self, frequency: float, cutoff: float = 1650.0, order: int = 2, phase: str = "causal"):
+        self.frequency = frequency
+        self.cutoff = cutoff
+        self.order = order
+        self.phase = phase  # "causal" (single pass) or "zero" (forward-backward)
+
+    def butter_lowpass(self):
+        """
+        Creates Butterworth low-pass filter coefficients, reusing the shared design cache.
+
+        Returns:
+            Tuple: Filter coefficients (b, a).
+        """
+        return filters.butter_lowpass(self.order, self.cutoff, self.frequency)
+
+    def butter_lowpass_filter(self, data: List[float], axis: int = 0) -> np.ndarray:
+        """
+        Applies a Butterworth low-pass filter to the data as second-order sections.
+
+        Args:
+            data (List[float]): The data to filter.
+            axis (int): Time axis of `data` (1 for an (n_traces, n_samples) stack).
+
+        Returns:
+            np.ndarray: Filtered data.
+        """
+        return filters.lowpass(np.asarray(data, dtype=float), self.cutoff, self.frequency, self.order, self.phase, axis)
+
+    @staticmethod
+    def read_csv(path: str) -> np.ndarray:
+        """
+        Reads a CSV file and returns the content as an array.
+
+        Args:
+            path (str): Path to the CSV file.
+
+        Returns:
+            np.ndarray: Parsed CSV data with shape (n_samples, n_columns).
+        """
+        return load_trace(path).data
+
+    def calculate_magnitudes(self, data: Union[np.ndarray, Trace, List[List[float]]], x_idx: int, y_idx: int, z_idx: int) -> np.ndarray:
+        """
+        Calculates the magnitude of acceleration from x, y, and z components.
+
+        Args:
+            data (Union[np.ndarray, Trace, List[List[float]]]): Acceleration data, (n_samples, n_columns)
+                or an (n_traces, n_samples, n_columns) stack.
+            x_idx (int): Column index for X data.
+            y_idx (int): Column index for Y data.
+            z_idx (int): Column index for Z data.
+
+        Returns:
+            np.ndarray: Array of magnitudes.
+        """
+
+        data_array = data.data if isinstance(data, Trace) else np.asarray(data, dtype=float)
+        with profiling.stage("resultant", 3 * data_array[..., 0].size):
+            magnitudes = np.sqrt(data_array[..., x_idx - 1] ** 2 + 
+                                 data_array[..., y_idx - 1] ** 2 + 
+                                 data_array[..., z_idx - 1] ** 2 ) / 9810  # Convert to g
+        return magnitudes
+
+    def calculate_si(self, time_steps: np.ndarray, magnitudes: np.ndarray) -> float:
+        """
+        Calculates the Severity Index (SI).
+
+        Args:
+            time_steps (np.ndarray): Array of time steps.
+            magnitudes (np.ndarray): Array of filtered magnitudes, integrated along the last axis.
+
+        Returns:
+            float: SI value (one per row for 2-D magnitudes).
+        """
+        return self.severity_index(magnitudes, float(time_steps[1] - time_steps[0]))
+
+    def severity_index(self, magnitudes: np.ndarray, dt: Optional[float] = None) -> float:
+        """
+        Calculates the Severity Index (SI) of magnitudes sampled at a fixed time step.
+
+        Args:
+            magnitudes (np.ndarray): Array of filtered magnitudes, integrated along the last axis.
+            dt (Optional[float]): Time step in seconds (default: the calculator's frequency).
+
+        Returns:
+            float: SI value (one per row for 2-D magnitudes).
+        """
+        dt = self.frequency if dt is None else dt
+        with profiling.stage("SI", np.size(magnitudes)):
+            jitted = kernels.get("power_integral")
+            if jitted is not None and np.ndim(magnitudes) == 1 and len(magnitudes):
+                return jitted(np.ascontiguousarray(magnitudes, dtype=float), float(dt))
+            magnitudes_power = magnitudes ** 2.5
+            si = np.trapezoid(magnitudes_power, dx=dt)
+        return si
+
+    def process_file(self, file_path: Union[str, Trace], x_idx: int, y_idx: int, z_idx: int) -> float:
+        """
+        Reads a CSV file, processes the data, and calculates the SI.
+
+        Args:
+            file_path (Union[str, Trace]): Path to the CSV file, or a trace already loaded with `load_trace`.
+            x_idx (int): X column index.
+            y_idx (int): Y column index.
+            z_idx (int): Z column index.
+
+        Returns:
+            float: SI value.
+        """
+        # Read and process data
+        data = file_path if isinstance(file_path, Trace) else self.read_csv(file_path)
+        magnitudes = self.calculate_magnitudes(data, x_idx, y_idx, z_idx)
+
+        # Create time steps
+        time_steps = np.arange(0, len(magnitudes) * self.frequency, self.frequency)
+
+        # Filter data
+        filtered_magnitudes = self.butter_lowpass_filter(magnitudes)
+
+        # Calculate SI
+        return self.calculate_si(time_steps, filtered_magnitudes)
+
+    def calculate_si_batch(self, data: np.ndarray, x_idx: int = 2, y_idx: int = 3, z_idx: int = 4) -> np.ndarray:
+        """
+        Calculates SI for a stack of equal-length traces in one call.
+
+        Args:
+            data (np.ndarray): Array with shape (n_traces, n_samples, n_columns).
+            x_idx (int): X column index.
+            y_idx (int): Y column index.
+            z_idx (int): Z column index.
+
+        Returns:
+            np.ndarray: SI values, one per trace.
+        """
+        data = np.asarray(data, dtype=float)
+        if data.ndim != 3:
+            raise ValueError(f"Expected an (n_traces, n_samples, n_columns) array, got shape {data.shape}")
+        filtered_magnitudes = self.butter_lowpass_filter(self.calculate_magnitudes(data, x_idx, y_idx, z_idx), axis=1)
+        return self.severity_index(filtered_magnitudes)
+
+    def process_stream(self, file_path: str, x_idx: int, y_idx: int, z_idx: int, chunk_size: int = 65536) -> float:
+        """
+        Calculates the SI while reading the CSV file in fixed-size blocks, in bounded memory.
+
+        The filter state and the last sample's power carry over between blocks, so the
+        result matches `process_file`.
+
+        Args:
+            file_path (str): Path to the CSV file.
+            x_idx (int): X column index.
+            y_idx (int): Y column index.
+            z_idx (int): Z column index.
+            chunk_size (int): Rows read per block.
+
+        Returns:
+            float: SI value.
+        """
+        if self.phase != "causal":
+            raise ValueError("Streaming SI requires the causal filter phase")
+        lowpass = CausalFilter(filters.butter_lowpass_sos(self.order, self.cutoff, self.frequency))
+        stream = StreamingSI(self.frequency)
+
+        for data in iter_csv_chunks(file_path, chunk_size):
+            stream.update(lowpass(self.calculate_magnitudes(data, x_idx, y_idx, z_idx)))
+        return stream.result()
+
+
+class StreamingSI:
+    """Running Severity Index over magnitude blocks that arrive one after another."""
+
+    def __init__(self, frequency: float):
+        """
+        Args:
+            frequency (float): Sampling frequency (time step in seconds).
+        """
+        self.frequency = frequency
+        self.total = 0.0
+        self._last_power = None
+
+    def update(self, magnitudes: np.ndarray) -> None:
+        """
+        Adds the next block of filtered magnitudes (G) to the running integral.
+
+        Args:
+            magnitudes (np.ndarray): Filtered acceleration magnitudes following the previous block.
+        """
+        power = np.asarray(magnitudes, dtype=float) ** 2.5
+        if len(power) == 0:
+            return
+        if self._last_power is not None:
+            power = np.concatenate(([self._last_power], power))
+        if len(power) > 1:
+            self.total += np.trapezoid(power, dx=self.frequency)
+        self._last_power = power[-1]
+
+    def result(self) -> float:
+        """
+        Returns:
+            float: SI value of all samples seen so far.
+        """
+        return self.total
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Runs the command-line interface (`sentinel-triage si` or the stand-alone script)."""
+    parser = argparse.ArgumentParser(description="Severity Index Calculation Script")
+    parser.add_argument("--frequency", type=float, required=True, help="Sampling frequency (e.g., 0.00001)")
+    parser.add_argument("--file_path", type=str, required=True, help="Path to the CSV file")
+    parser.add_argument("--x_location", type=int, required=True, help="Column index for X direction data")
+    parser.add_argument("--y_location", type=int, required=True, help="Column index for Y direction data")
+    parser.add_argument("--z_location", type=int, required=True, help="Column index for Z direction data")
+    parser.add_argument("--chunk_size", type=int, default=None, help="Stream the file in blocks of this many rows")
+
+    args = parser.parse_args(argv)
+
+    si_calculator = SICalculator(args.frequency)
+    if args.chunk_size:
+        si_value = si_calculator.process_stream(args.file_path, args.x_location, args.y_location, args.z_location,
+                                                chunk_size=args.chunk_size)
+    else:
+        si_value = si_calculator.process_file(args.file_path, args.x_location, args.y_location, args.z_location)
+    print(f"The SI value is {si_value:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+import hashlib
+import io
+import json
+import os
+import sqlite3
+from typing import Dict, Mapping, Optional
+
+import numpy as np
+
+from sentinel_triage import profiling
+
+# Bump when the meaning of stored artifacts or scores changes; older rows are then ignored
+STORE_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS artifacts (digest TEXT, name TEXT, params TEXT, data BLOB, PRIMARY KEY (digest, name, params));
+CREATE TABLE IF NOT EXISTS results (digest TEXT, name TEXT, params TEXT, scores TEXT, PRIMARY KEY (digest, name, params));
+"""
+
+
+def array_digest(data: np.ndarray) -> str:
+    """
+    Returns the BLAKE2b hex digest of an array's samples and shape.
+
+    Args:
+        data (np.ndarray): A trace's data or a stack of traces.
+
+    Returns:
+        str: Digest identifying the content, wherever it was loaded from.
+    """
+    data = np.asarray(data, dtype=np.float64)
+    digest = hashlib.blake2b(digest_size=20)
+    digest.update(repr(data.shape).encode())
+    # Fortran-ordered traces are hashed through their transpose, which avoids a copy
+    digest.update(np.ascontiguousarray(data.T if data.flags.f_contiguous else data).data)
+    return digest.hexdigest()
+
+
+def _params_key(params: Mapping[str, object]) -> str:
+    return json.dumps({"version": STORE_VERSION, **params}, sort_keys=True, default=float)
+
+
+class ResultStore:
+    """
+    On-disk SQLite store of criterion scores and the intermediate arrays behind them.
+
+    Entries are keyed on the content digest of the trace (`array_digest`), the name of
+    the criterion or stage, and every parameter it depends on (calculator, cutoff,
+    order, phase, time step, thresholds, window limits). A rerun with one parameter
+    changed reuses everything upstream of it: a new GAMBIT threshold or HIC window
+    limit costs a lookup of the filtered channels instead of a re-filter. Several
+    processes may share one store file.
+    """
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path (str): SQLite database file, created if missing.
+        """
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._connection = sqlite3.connect(path, timeout=60.0, isolation_level=None)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.executescript(_SCHEMA)
+
+    def __repr__(self) -> str:
+        return f"ResultStore(path={self.path!r})"
+
+    def __enter__(self) -> "ResultStore":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Closes the database connection."""
+        self._connection.close()
+
+    def _get(self, table: str, column: str, digest: str, name: str, params: Mapping[str, object]):
+        with profiling.stage("store") as timer:
+            row = self._connection.execute(f"SELECT {column} FROM {table} WHERE digest = ? AND name = ? AND params = ?",
+                                           (digest, name, _params_key(params))).fetchone()
+            timer.add(nbytes=0 if row is None else len(row[0]))
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return row[0]
+
+    def _put(self, table: str, digest: str, name: str, params: Mapping[str, object], value) -> None:
+        with profiling.stage("store"):
+            self._connection.execute(f"INSERT OR REPLACE INTO {table} VALUES (?, ?, ?, ?)",
+                                     (digest, name, _params_key(params), value))
+
+    def get_artifact(self, digest: str, name: str, params: Mapping[str, object]) -> Optional[np.ndarray]:
+        """
+        Looks up an intermediate array, e.g. a filtered channel block or a cumulative integral.
+
+        Args:
+            digest (str): Content digest of the trace.
+            name (str): Stage name, e.g. "hip_channels".
+            params (Mapping[str, object]): Parameters the stage was computed with.
+
+        Returns:
+            Optional[np.ndarray]: The stored array, or None.
+        """
+        blob = self._get("artifacts", "data", digest, name, params)
+        return None if blob is None else np.load(io.BytesIO(blob), allow_pickle=False)
+
+    def put_artifact(self, digest: str, name: str, params: Mapping[str, object], data: np.ndarray) -> None:
+        """Stores an intermediate array under the same key as `get_artifact`."""
+        buffer = io.BytesIO()
+        np.save(buffer, np.asarray(data), allow_pickle=False)
+        self._put("artifacts", digest, name, params, buffer.getvalue())
+
+    def get_result(self, digest: str, name: str, params: Mapping[str, object]) -> Optional[Dict[str, object]]:
+        """
+        Looks up the scores of one criterion.
+
+        Args:
+            digest (str): Content digest of the trace.
+            name (str): Criterion name, e.g. "GAMBIT".
+            params (Mapping[str, object]): Parameters of the criterion and of every stage it reads.
+
+        Returns:
+            Optional[Dict[str, object]]: The stored scores (lists for a stack of traces), or None.
+        """
+        scores = self._get("results", "scores", digest, name, params)
+        return None if scores is None else json.loads(scores)
+
+    def put_result(self, digest: str, name: str, params: Mapping[str, object], scores: Mapping[str, object]) -> None:
+        """Stores the scores of one criterion under the same key as `get_result`."""
+        scores = {key: value.tolist() if isinstance(value, np.ndarray) else value for key, value in scores.items()}
+        self._put("results", digest, name, params, json.dumps(scores))
+
+    def info(self) -> Dict[str, int]:
+        """
+        Reports the store's lookup counters and size.
+
+        Returns:
+            Dict[str, int]: Hits and misses in this process, and the number of stored artifacts and results.
+        """
+        artifacts = self._connection.execute("SELECT COUNT(*) FROM artifacts").fetchone()[0]
+        results = self._connection.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+        return {"hits": self.hits, "misses": self.misses, "artifacts": artifacts, "results": results}
+
+    def clear(self) -> None:
+        """Deletes every stored artifact and result."""
+        self._connection.execute("DELETE FROM artifacts")
+        self._connection.execute("DELETE FROM results")
+        self._connection.execute("VACUUM")
@@ -0,0 +1,86 @@
+import itertools
+from typing import Iterator
+
+import numpy as np
+
+from sentinel_triage import kernels, profiling
+
+# Blocks up to this many samples are filtered by a plain recurrence; scipy's per-call
+# overhead dominates below that
+SMALL_BLOCK = 4
+
+
+def iter_csv_chunks(path: str, chunk_size: int = 65536, delimiter: str = ",") -> Iterator[np.ndarray]:
+    """
+    Reads a CSV file with a header row in fixed-size blocks of rows.
+
+    Args:
+        path (str): Path to the CSV file.
+        chunk_size (int): Rows per block.
+        delimiter (str): Field delimiter.
+
+    Yields:
+        np.ndarray: Float64 blocks with shape (rows, n_columns); only the last may be shorter.
+    """
+    with open(path, "r") as f:
+        f.readline()  # Skip header row
+        while True:
+            lines = list(itertools.islice(f, chunk_size))
+            if not lines:
+                return
+            yield np.loadtxt(lines, delimiter=delimiter, ndmin=2, dtype=np.float64)
+
+
+class CausalFilter:
+    """Single-pass SOS filter whose state carries over from one block to the next."""
+
+    def __init__(self, sos: np.ndarray):
+        """
+        Args:
+            sos (np.ndarray): Second-order sections, e.g. from `filters.butter_lowpass_sos`.
+        """
+        self.sos = np.array(sos, dtype=np.float64)
+        self.zi = None
+
+    def __call__(self, block: np.ndarray, axis: int = 0) -> np.ndarray:
+        """
+        Filters the next block, starting from where the previous block left off.
+
+        Args:
+            block (np.ndarray): Samples with time along `axis`.
+            axis (int): Time axis of `block`.
+
+        Returns:
+            np.ndarray: Filtered block, identical to the matching slice of a whole-record `sosfilt`.
+        """
+        block = np.asarray(block, dtype=np.float64)
+        with profiling.stage("filter", block.size):
+            return self._filter(block, axis)
+
+    def _filter(self, block: np.ndarray, axis: int) -> np.ndarray:
+        if self.zi is None:
+            shape = list(block.shape)
+            shape[axis] = 2
+            self.zi = np.zeros((len(self.sos),) + tuple(shape))
+
+        # With time first, zi is (n_sections, 2, channels...) and the recurrence can run in place
+        jitted = kernels.get("sosfilt")
+        if axis % block.ndim == 0 and (jitted is not None or len(block) <= SMALL_BLOCK):
+            samples = block.reshape(len(block), -1)
+            state = self.zi.reshape(len(self.sos), 2, -1)
+            if jitted is not None:
+                return jitted(self.sos, np.ascontiguousarray(samples), state).reshape(block.shape)
+            filtered = np.empty_like(samples)
+            for i, value in enumerate(samples):
+                for (b0, b1, b2, _, a1, a2), z in zip(self.sos, state):
+                    out = b0 * value + z[0]
+                    z[0] = b1 * value - a1 * out + z[1]
+                    z[1] = b2 * value - a2 * out
+                    value = out
+                filtered[i] = value
+            return filtered.reshape(block.shape)
+
+        from scipy.signal import sosfilt
+
+        filtered, self.zi = sosfilt(self.sos, block, axis=axis, zi=self.zi)
+        return filtered
@@ -0,0 +1,498 @@
+import argparse
+import contextlib
+import csv
+import itertools
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
+
+import numpy as np
+
+from sentinel_triage import filters, gambit, hip
+from sentinel_triage.batch import find_traces, open_store
+from sentinel_triage.engine import ACCEL_UNITS, TriageEngine
+from sentinel_triage.store import array_digest
+from sentinel_triage.traces import Trace, load_trace
+
+# Swept parameter -> values used when a grid leaves it out (the calculators' defaults)
+DEFAULT_GRID = {
+    "hic_cutoff": [filters.CFC_CUTOFFS[1000]],  # CFC 1000 resultant filter of HIC and SI (Hz)
+    "hic_limits_ms": [15.0, 36.0],
+    "hip_cutoff": [hip.BANDWIDTH],  # Second stage of the HIP cascade (Hz)
+    "hip_mass": [hip.HEAD_MASS],
+    "hip_inertia": [list(hip.HEAD_INERTIA)],
+    "gambit_cutoff": [gambit.BANDWIDTH],
+    "gambit_a_c": [gambit.A_C],
+    "gambit_alpha_c": [gambit.ALPHA_C],
+}
+
+# Criterion -> grid parameters combined into its parameter sets, outermost first
+SET_PARAMETERS = {
+    "HIC": ("hic_cutoff", "hic_limits_ms"),
+    "SI": ("hic_cutoff",),
+    "HIP": ("hip_cutoff", "hip_mass", "hip_inertia"),
+    "GAMBIT": ("gambit_cutoff", "gambit_a_c", "gambit_alpha_c"),
+}
+
+# Bump when the layout of checkpoint records changes
+CHECKPOINT_VERSION = 1
+
+# Largest (samples × parameter sets) block of HIP power evaluated at once
+MAX_BLOCK = 1 << 22
+
+
+def make_grid(grid: Optional[Mapping[str, object]] = None) -> Dict[str, list]:
+    """
+    Completes a parameter grid with `DEFAULT_GRID` and checks its values.
+
+    Args:
+        grid (Optional[Mapping[str, object]]): Parameter -> list of values, e.g. {"gambit_a_c": [200, 250, 300]};
+            a single value may be given without a list. "hip_inertia" values are (Ix, Iy, Iz) triples.
+
+    Returns:
+        Dict[str, list]: Every parameter of `DEFAULT_GRID` with its values as floats.
+    """
+    grid = dict(grid or {})
+    unknown = set(grid) - set(DEFAULT_GRID)
+    if unknown:
+        raise ValueError(f"Unknown sweep parameters {', '.join(sorted(unknown))}; choose from {', '.join(DEFAULT_GRID)}")
+    complete = {}
+    for name, default in DEFAULT_GRID.items():
+        values = grid.get(name, default)
+        if name == "hip_inertia":
+            values = [values] if np.ndim(values) == 1 else values
+            values = [[float(value) for value in triple] for triple in values]
+            if any(len(triple) != 3 for triple in values):
+                raise ValueError(f"hip_inertia values must be (Ix, Iy, Iz) triples, got {grid[name]!r}")
+        else:
+            values = [float(value) for value in np.atleast_1d(values)]
+        if not values:
+            raise ValueError(f"Sweep parameter {name} has no values")
+        complete[name] = values
+    return complete
+
+
+def parameter_sets(grid: Mapping[str, list]) -> Dict[str, List[Dict[str, object]]]:
+    """
+    Lists the parameter sets each criterion is scored with.
+
+    Args:
+        grid (Mapping[str, list]): Output of `make_grid`.
+
+    Returns:
+        Dict[str, List[Dict[str, object]]]: Criterion -> one dict of `SET_PARAMETERS` values per set,
+        in the order of the scores `sweep_trace` returns.
+    """
+    return {criterion: [dict(zip(names, values)) for values in itertools.product(*(grid[name] for name in names))]
+            for criterion, names in SET_PARAMETERS.items()}
+
+
+def _stages(engine: TriageEngine, trace: Trace, criteria: List[str], digest: Optional[str]) -> Dict[str, object]:
+    values = engine.stages(trace, criteria, digest)
+    failed = next((value for value in values.values() if isinstance(value, Exception)), None)
+    if failed is not None:
+        raise failed
+    return values
+
+
+@contextlib.contextmanager
+def _restore_cutoff(calculator) -> Iterator[None]:
+    # The sweep sets each cutoff on the engine's calculators; put the original back for later callers
+    original = calculator.cutoff
+    try:
+        yield
+    finally:
+        calculator.cutoff = original
+
+
+def _sweep_resultant(engine: TriageEngine, trace: Trace, grid: Mapping[str, list],
+                     digest: Optional[str]) -> Dict[str, List[float]]:
+    hic_scores, si_scores = [], []
+    with _restore_cutoff(engine.hic):
+        for cutoff in grid["hic_cutoff"]:
+            engine.hic.cutoff = cutoff
+            values = _stages(engine, trace, ["HIC", "SI"], digest)
+            magnitudes, cumulative = values["resultant_cfc1000"], values["resultant_integral"]
+            # All window limits come out of one search
+            windows = engine.hic.calculate_hic_magnitudes(magnitudes, tuple(grid["hic_limits_ms"]), cumulative)
+            hic_scores += [float(windows[f"HIC{limit:g}"][0]) for limit in grid["hic_limits_ms"]]
+            si_scores.append(float(engine.si.severity_index(magnitudes)))
+    return {"HIC": hic_scores, "SI": si_scores}
+
+
+def _sweep_hip(engine: TriageEngine, trace: Trace, grid: Mapping[str, list],
+               digest: Optional[str]) -> Dict[str, List[float]]:
+    coefficients = np.array([[mass] * 3 + inertia for mass, inertia in itertools.product(grid["hip_mass"],
+                                                                                          grid["hip_inertia"])])
+    scores = []
+    with _restore_cutoff(engine.hip):
+        for cutoff in grid["hip_cutoff"]:
+            engine.hip.cutoff = cutoff
+            values = _stages(engine, trace, ["HIP"], digest)
+            filtered = values["hip_channels"]
+            time = engine.hip.decimate_time(values["kinematics"][:, 0])
+            # HIP is linear in the mass and inertias, so each channel's power term is computed once
+            # and every coefficient set is one column of a matrix product
+            power = filtered * engine.hip.manual_cumtrapz(filtered, time)
+            step = max(1, MAX_BLOCK // max(len(power), 1))
+            for start in range(0, len(coefficients), step):
+                scores += (np.max(power @ coefficients[start:start + step].T, axis=0) / 1000).tolist()
+    return {"HIP": scores}
+
+
+def _sweep_gambit(engine: TriageEngine, trace: Trace, grid: Mapping[str, list],
+                  digest: Optional[str]) -> Dict[str, List[float]]:
+    scores = []
+    with _restore_cutoff(engine.gambit):
+        for cutoff in grid["gambit_cutoff"]:
+            engine.gambit.cutoff = cutoff
+            filtered = _stages(engine, trace, ["GAMBIT"], digest)["gambit_channels"]
+            a_m = np.max(np.sqrt(np.sum(filtered[:, :3] ** 2, axis=1)))
+            alpha_m = np.max(np.sqrt(np.sum(filtered[:, 3:6] ** 2, axis=1)))
+            scores += np.add.outer(a_m / np.array(grid["gambit_a_c"]),
+                                   alpha_m / np.array(grid["gambit_alpha_c"])).ravel().tolist()
+    return {"GAMBIT": scores}
+
+
+def sweep_trace(path: str, frequency: float, grid: Optional[Mapping[str, object]] = None, x_location: int = 2,
+                y_location: int = 3, z_location: int = 4, store_path: Optional[str] = None,
+                decimate: bool = False, accel_units: Optional[str] = None) -> Dict[str, object]:
+    """
+    Scores one trace with every parameter set of a grid, loading it once and filtering it once per cutoff.
+
+    Window limits, thresholds and head properties do not change the filtered channels, so
+    they are evaluated together on the same arrays: every HIC limit comes out of one window
+    search, GAMBIT's thresholds broadcast over the two peak resultants, and HIP's masses and
+    inertias are one matrix product over the per-channel power terms.
+
+    Args:
+        path (str): CSV file to score.
+        frequency (float): Sampling frequency (time step in seconds).
+        grid (Optional[Mapping[str, object]]): Parameter grid; see `make_grid`.
+        x_location (int): Column index for X direction data (HIC and SI).
+        y_location (int): Column index for Y direction data (HIC and SI).
+        z_location (int): Column index for Z direction data (HIC and SI).
+        store_path (Optional[str]): `ResultStore` of filtered channels shared with earlier sweeps and batch runs.
+        decimate (bool): Score HIP and GAMBIT at their filter bandwidth; see `TriageEngine`.
+        accel_units (Optional[str]): Units of the linear channels, "g" or "mm/s2"; see `TriageEngine`.
+
+    Returns:
+        Dict[str, object]: "file", "scores" (criterion -> one score per set of `parameter_sets`; criteria
+        that failed are left out) and "error".
+    """
+    grid = make_grid(grid)
+    record = {"file": path, "scores": {}, "error": None}
+    try:
+        trace = load_trace(path)
+    except Exception as e:
+        record["error"] = str(e)
+        return record
+
+    engine = TriageEngine(frequency, x_location, y_location, z_location, store=open_store(store_path), decimate=decimate,
+                          accel_units=accel_units)
+    digest = array_digest(trace.data) if engine.store is not None else None
+    errors = []
+    for criteria, evaluate in ((("HIC", "SI"), _sweep_resultant), (("HIP",), _sweep_hip), (("GAMBIT",), _sweep_gambit)):
+        try:
+            record["scores"].update(evaluate(engine, trace, grid, digest))
+        except Exception as e:
+            errors.append(f"{'/'.join(criteria)}: {e}")
+    record["error"] = "; ".join(errors) or None
+    return record
+
+
+def _sweep_task(args: tuple) -> Dict[str, object]:
+    return sweep_trace(*args)
+
+
+class Checkpoint:
+    """
+    Append-only JSON lines file of finished cases, so an interrupted sweep resumes where it stopped.
+
+    The first line records the sweep's settings; a checkpoint is only resumed by a sweep
+    with the same settings. Each finished case is then written and synced as one line, and
+    a line cut short by the interruption is dropped when the file is reopened.
+    """
+
+    def __init__(self, path: str, settings: Mapping[str, object]):
+        """
+        Args:
+            path (str): Checkpoint file, created if missing.
+            settings (Mapping[str, object]): Frequency, grid and the other settings of the sweep.
+        """
+        self.path = path
+        self.completed: Dict[str, Dict[str, object]] = {}
+        header = json.loads(json.dumps({"version": CHECKPOINT_VERSION, **settings}))
+        valid = 0
+        if os.path.exists(path):
+            with open(path, "rb") as f:
+                for number, line in enumerate(iter(f.readline, b"")):
+                    try:
+                        entry = json.loads(line) if line.endswith(b"\n") else None
+                    except ValueError:
+                        entry = None
+                    if entry is None:
+                        break  # Cut short by an interruption; everything after it is rewritten
+                    if number == 0 and entry != header:
+                        raise ValueError(f"Checkpoint {path} was written by a sweep with different settings; "
+                                         "use a new checkpoint file")
+                    if number > 0:
+                        self.completed[entry["file"]] = entry
+                    valid = f.tell()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._file = open(path, "r+b" if os.path.exists(path) else "wb")
+        self._file.truncate(valid)
+        self._file.seek(valid)
+        if valid == 0:
+            self._write(header)
+
+    def __repr__(self) -> str:
+        return f"Checkpoint(path={self.path!r}, completed={len(self.completed)})"
+
+    def _write(self, entry: Mapping[str, object]) -> None:
+        self._file.write((json.dumps(entry) + "\n").encode("utf-8"))
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def add(self, record: Mapping[str, object]) -> None:
+        """Records a finished case (a `sweep_trace` result)."""
+        self._write(record)
+        self.completed[record["file"]] = dict(record)
+
+    def close(self) -> None:
+        """Closes the file."""
+        self._file.close()
+
+
+def run_sweep(files: List[str], frequency: float, grid: Optional[Mapping[str, object]] = None, x_location: int = 2,
+              y_location: int = 3, z_location: int = 4, workers: Optional[int] = None,
+              checkpoint_path: Optional[str] = None, store_path: Optional[str] = None,
+              decimate: bool = False, accel_units: Optional[str] = None) -> Iterator[Dict[str, object]]:
+    """
+    Sweeps a grid over many files on a process pool, one file per task.
+
+    With a checkpoint, cases it already holds are yielded from it first, and every case
+    finished now is appended as soon as it completes. Cases without any score, such as
+    files that could not be read, are not recorded, so a resumed sweep retries them.
+
+    Args:
+        files (List[str]): CSV files to score.
+        frequency (float): Sampling frequency (time step in seconds).
+        grid (Optional[Mapping[str, object]]): Parameter grid; see `make_grid`.
+        x_location (int): Column index for X direction data (HIC and SI).
+        y_location (int): Column index for Y direction data (HIC and SI).
+        z_location (int): Column index for Z direction data (HIC and SI).
+        workers (Optional[int]): Number of worker processes (default: CPU count).
+        checkpoint_path (Optional[str]): `Checkpoint` file to resume from and extend.
+        store_path (Optional[str]): `ResultStore` of filtered channels shared by the workers.
+        decimate (bool): Score HIP and GAMBIT at their filter bandwidth; see `TriageEngine`.
+        accel_units (Optional[str]): Units of the linear channels, "g" or "mm/s2"; see `TriageEngine`.
+
+    Yields:
+        Dict[str, object]: One `sweep_trace` record per file, in completion order.
+    """
+    grid = make_grid(grid)
+    workers = workers or os.cpu_count() or 1
+    checkpoint = None
+    if checkpoint_path is not None:
+        checkpoint = Checkpoint(checkpoint_path, {"frequency": frequency, "grid": grid, "decimate": decimate,
+                                                  "locations": [x_location, y_location, z_location],
+                                                  "accel_units": accel_units})
+    try:
+        done = checkpoint.completed if checkpoint is not None else {}
+        yield from (done[path] for path in files if path in done)
+        tasks = [(path, frequency, grid, x_location, y_location, z_location, store_path, decimate, accel_units)
+                 for path in files if path not in done]
+
+        def finish(record: Dict[str, object]) -> Dict[str, object]:
+            if checkpoint is not None and record["scores"]:
+                checkpoint.add(record)
+            return record
+
+        if workers == 1:
+            for task in tasks:
+                yield finish(_sweep_task(task))
+            return
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for future in as_completed([executor.submit(_sweep_task, task) for task in tasks]):
+                yield finish(future.result())
+    finally:
+        if checkpoint is not None:
+            checkpoint.close()
+
+
+def load_labels(path: str) -> Dict[str, int]:
+    """
+    Reads case outcomes from a CSV file with "file" and "outcome" columns (1 injured, 0 not).
+
+    Args:
+        path (str): Labels file; "file" holds the trace path or its file name.
+
+    Returns:
+        Dict[str, int]: File -> outcome.
+    """
+    with open(path, newline="") as f:
+        reader = csv.DictReader(f)
+        if not {"file", "outcome"} <= set(reader.fieldnames or ()):
+            raise ValueError(f"Labels file {path} needs 'file' and 'outcome' columns, got {reader.fieldnames}")
+        labels = {}
+        for row in reader:
+            outcome = int(float(row["outcome"]))
+            if outcome not in (0, 1):
+                raise ValueError(f"Outcome of {row['file']} must be 0 or 1, got {row['outcome']!r}")
+            labels[row["file"]] = outcome
+    return labels
+
+
+def roc_curve(scores: Iterable[float], outcomes: Iterable[int]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Computes the receiver operating characteristic of a score as a predictor of injury.
+
+    Args:
+        scores (Iterable[float]): One score per case; cases without a finite score are left out.
+        outcomes (Iterable[int]): 1 for an injured case, 0 otherwise.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray, np.ndarray]: Thresholds (descending, starting at +inf), and the
+        false and true positive rates of calling every case scoring at or above each threshold injured.
+    """
+    scores = np.asarray(list(scores), dtype=float)
+    outcomes = np.asarray(list(outcomes), dtype=bool)
+    keep = np.isfinite(scores)
+    scores, outcomes = scores[keep], outcomes[keep]
+    positives = int(outcomes.sum())
+    if positives == 0 or positives == len(outcomes):
+        raise ValueError("A ROC curve needs both injured and uninjured cases")
+    order = np.argsort(-scores, kind="stable")
+    scores, outcomes = scores[order], outcomes[order]
+    last = np.append(np.flatnonzero(np.diff(scores)), len(scores) - 1)  # Last case of each distinct score
+    tpr = np.cumsum(outcomes)[last] / positives
+    fpr = np.cumsum(~outcomes)[last] / (len(outcomes) - positives)
+    return np.append(np.inf, scores[last]), np.append(0.0, fpr), np.append(0.0, tpr)
+
+
+def write_sweep(records: Iterable[Mapping[str, object]], grid: Mapping[str, list], output_dir: str,
+                labels: Optional[Mapping[str, int]] = None) -> Dict[str, str]:
+    """
+    Writes the risk-curve inputs of a sweep, and with outcomes its ROC curves.
+
+    Args:
+        records (Iterable[Mapping[str, object]]): `sweep_trace` records.
+        grid (Mapping[str, list]): Grid the records were computed with (`make_grid` output).
+        output_dir (str): Directory for the files, created if missing.
+        labels (Optional[Mapping[str, int]]): Outcome per file path or file name (`load_labels`).
+
+    Returns:
+        Dict[str, str]: "risk_inputs" (one row per criterion, parameter set and case, the input of a
+        logistic risk curve), plus "roc" (curve points) and "auc" (area per set) when `labels` are given.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    records = sorted(records, key=lambda record: record["file"])
+    sets = parameter_sets(grid)
+    labels = labels or {}
+    outcomes = {record["file"]: labels.get(record["file"], labels.get(os.path.basename(record["file"])))
+                for record in records}
+    paths = {"risk_inputs": os.path.join(output_dir, "risk_inputs.csv")}
+
+    with open(paths["risk_inputs"], "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["criterion", "set", "parameters", "file", "outcome", "score"])
+        for criterion, criterion_sets in sets.items():
+            for index, parameters in enumerate(criterion_sets):
+                for record in records:
+                    scores = record["scores"].get(criterion)
+                    writer.writerow([criterion, index, json.dumps(parameters), record["file"], outcomes[record["file"]],
+                                     None if scores is None else scores[index]])
+
+    labelled = [record for record in records if outcomes[record["file"]] is not None]
+    if not labelled:
+        return paths
+    paths["roc"] = os.path.join(output_dir, "roc.csv")
+    paths["auc"] = os.path.join(output_dir, "auc.csv")
+    with open(paths["roc"], "w", newline="") as roc_file, open(paths["auc"], "w", newline="") as auc_file:
+        roc_writer, auc_writer = csv.writer(roc_file), csv.writer(auc_file)
+        roc_writer.writerow(["criterion", "set", "threshold", "fpr", "tpr"])
+        auc_writer.writerow(["criterion", "set", "parameters", "cases", "injured", "auc"])
+        for criterion, criterion_sets in sets.items():
+            scores = np.array([record["scores"].get(criterion, [np.nan] * len(criterion_sets)) for record in labelled])
+            injured = np.array([outcomes[record["file"]] for record in labelled])
+            for index, parameters in enumerate(criterion_sets):
+                scored = np.isfinite(scores[:, index])
+                row = [criterion, index, json.dumps(parameters), int(scored.sum()), int(injured[scored].sum())]
+                try:
+                    thresholds, fpr, tpr = roc_curve(scores[:, index], injured)
+                except ValueError:
+                    auc_writer.writerow(row + [None])
+                    continue
+                roc_writer.writerows([criterion, index, threshold, x, y] for threshold, x, y in zip(thresholds, fpr, tpr))
+                auc_writer.writerow(row + [float(np.trapezoid(tpr, fpr))])
+    return paths
+
+
+def _inertia(value: str) -> List[float]:
+    values = [float(part) for part in value.split(",")]
+    if len(values) != 3:
+        raise argparse.ArgumentTypeError(f"Expected Ix,Iy,Iz, got {value!r}")
+    return values
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Runs the command-line interface (`sentinel-triage sweep` or `python -m sentinel_triage.sweep`)."""
+    parser = argparse.ArgumentParser(description="Score many CSV traces under a grid of criterion parameters "
+                                                 "and write ROC and risk-curve inputs")
+    parser.add_argument("inputs", nargs="+", help="Directories or glob patterns of CSV files")
+    parser.add_argument("--frequency", type=float, required=True, help="Sampling frequency (time step in seconds, e.g., 0.0001)")
+    parser.add_argument("--grid", type=str, default=None, help="JSON file of parameter -> list of values")
+    for name in DEFAULT_GRID:
+        if name != "hip_inertia":
+            parser.add_argument(f"--{name}", type=float, nargs="+", default=None, help=f"Values of {name}")
+    parser.add_argument("--hip_inertia", type=_inertia, nargs="+", default=None, help="Ix,Iy,Iz triples (Nms²)")
+    parser.add_argument("--labels", type=str, default=None, help="CSV with file and outcome (0/1) columns, for ROC curves")
+    parser.add_argument("--output_dir", type=str, default="sweep_results", help="Directory for the result files")
+    parser.add_argument("--checkpoint", type=str, default=None,
+                        help="Checkpoint file to resume from (default: checkpoint.jsonl in the output directory)")
+    parser.add_argument("--x_location", type=int, default=2, help="Column index for X direction data (HIC and SI)")
+    parser.add_argument("--y_location", type=int, default=3, help="Column index for Y direction data (HIC and SI)")
+    parser.add_argument("--z_location", type=int, default=4, help="Column index for Z direction data (HIC and SI)")
+    parser.add_argument("--workers", type=int, default=None, help="Number of worker processes (default: CPU count)")
+    parser.add_argument("--store", type=str, default=None, help="SQLite result store of filtered channels reused across runs")
+    parser.add_argument("--decimate", action="store_true", help="Score HIP and GAMBIT at the rate their filter bandwidth needs")
+    parser.add_argument("--accel_units", choices=ACCEL_UNITS, required=True,
+                        help="Units of the ax, ay, az columns, applied to all four criteria")
+    args = parser.parse_args(argv)
+
+    files = find_traces(args.inputs)
+    if not files:
+        parser.error("No CSV files matched the given inputs")
+    grid = {}
+    if args.grid:
+        with open(args.grid) as f:
+            grid.update(json.load(f))
+    grid.update({name: getattr(args, name) for name in DEFAULT_GRID if getattr(args, name) is not None})
+    try:
+        grid = make_grid(grid)
+    except ValueError as e:
+        parser.error(str(e))
+    labels = load_labels(args.labels) if args.labels else None
+
+    checkpoint = args.checkpoint or os.path.join(args.output_dir, "checkpoint.jsonl")
+    records, failed = [], 0
+    try:
+        for record in run_sweep(files, args.frequency, grid, args.x_location, args.y_location, args.z_location,
+                                workers=args.workers, checkpoint_path=checkpoint, store_path=args.store,
+                                decimate=args.decimate, accel_units=args.accel_units):
+            records.append(record)
+            if record["error"]:
+                failed += 1
+                print(f"{record['file']}: {record['error']}")
+    except ValueError as e:  # A checkpoint of a different sweep
+        parser.error(str(e))
+    paths = write_sweep(records, grid, args.output_dir, labels)
+    sets = sum(len(criterion_sets) for criterion_sets in parameter_sets(grid).values())
+    print(f"Swept {len(records)} traces over {sets} parameter sets ({failed} with errors); "
+          f"results written to {', '.join(paths.values())}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+import argparse
+from typing import List, Optional
+
+import numpy as np
+
+from sentinel_triage.traces import KINEMATIC_COLUMNS
+
+PULSE_SHAPES = ("half-sine", "haversine", "multi-peak")
+
+# Fixed loading directions, so every criterion sees all three axes
+LINEAR_DIRECTION = np.array([0.8, 0.5, 0.33]) / np.linalg.norm([0.8, 0.5, 0.33])
+ANGULAR_DIRECTION = np.array([0.3, 0.9, 0.3]) / np.linalg.norm([0.3, 0.9, 0.3])
+
+
+def pulse(shape: str, t: np.ndarray, width: float, n_peaks: int = 3) -> np.ndarray:
+    """
+    Evaluates a unit-amplitude impact pulse that starts at t = 0.
+
+    Args:
+        shape (str): "half-sine", "haversine" or "multi-peak" (decaying half-sines back to back).
+        t (np.ndarray): Times in seconds relative to the pulse onset.
+        width (float): Duration of one pulse in seconds.
+        n_peaks (int): Number of peaks of the "multi-peak" shape.
+
+    Returns:
+        np.ndarray: Pulse values in [0, 1].
+    """
+    inside = (t >= 0) & (t <= width)
+    if shape == "half-sine":
+        return np.where(inside, np.sin(np.pi * np.clip(t, 0, width) / width), 0.0)
+    if shape == "haversine":
+        return np.where(inside, 0.5 * (1 - np.cos(2 * np.pi * np.clip(t, 0, width) / width)), 0.0)
+    if shape == "multi-peak":
+        total = np.zeros_like(t, dtype=float)
+        for k in range(n_peaks):
+            total += 0.6 ** k * pulse("half-sine", t - k * width, width)
+        return total
+    raise ValueError(f"Unknown pulse shape {shape!r}; choose from {', '.join(PULSE_SHAPES)}")
+
+
+def synthetic_trace(shape: str = "half-sine", rate_hz: float = 10000.0, duration_s: float = 0.1,
+                    peak_g: float = 100.0, peak_alpha: float = 6000.0, pulse_ms: float = 10.0,
+                    onset_s: Optional[float] = None, n_peaks: int = 3, noise_g: float = 0.0,
+                    seed: int = 0) -> np.ndarray:
+    """
+    Generates a head impact in the Time, ax, ay, az, alphax, alphay, alphaz layout.
+
+    Args:
+        shape (str): Pulse shape, see `pulse`.
+        rate_hz (float): Sampling rate in Hz.
+        duration_s (float): Recording length in seconds.
+        peak_g (float): Peak resultant linear acceleration (G).
+        peak_alpha (float): Peak resultant angular acceleration (rad/s²).
+        pulse_ms (float): Duration of one pulse in milliseconds (shortened to fit short recordings).
+        onset_s (Optional[float]): Pulse start time (default: 10% into the recording).
+        n_peaks (int): Number of peaks of the "multi-peak" shape.
+        noise_g (float): Standard deviation of Gaussian noise added to every channel, in G
+            (scaled by peak_alpha / peak_g for the angular channels).
+        seed (int): Seed for the noise generator.
+
+    Returns:
+        np.ndarray: Array with shape (n_samples, 7).
+    """
+    n_samples = int(round(duration_s * rate_hz))
+    time = np.arange(n_samples) / rate_hz
+    if onset_s is None:
+        onset_s = 0.1 * duration_s
+    width = min(pulse_ms / 1000, 0.8 * duration_s / (n_peaks if shape == "multi-peak" else 1))
+
+    profile = pulse(shape, time - onset_s, width, n_peaks)
+    data = np.empty((n_samples, 7))
+    data[:, 0] = time
+    data[:, 1:4] = profile[:, None] * peak_g * LINEAR_DIRECTION
+    data[:, 4:7] = profile[:, None] * peak_alpha * ANGULAR_DIRECTION
+    if noise_g:
+        rng = np.random.default_rng(seed)
+        data[:, 1:4] += rng.normal(0, noise_g, (n_samples, 3))
+        data[:, 4:7] += rng.normal(0, noise_g * peak_alpha / peak_g, (n_samples, 3))
+    return data
+
+
+def write_trace_csv(data: np.ndarray, path: str) -> None:
+    """
+    Writes a synthetic trace with the Time, ax, ay, az, alphax, alphay, alphaz header.
+
+    Args:
+        data (np.ndarray): Array with shape (n_samples, 7).
+        path (str): Destination CSV file.
+    """
+    np.savetxt(path, data, delimiter=",", header=",".join(KINEMATIC_COLUMNS), comments="", fmt="%.10g")
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Runs the command-line interface (`sentinel-triage synthetic` or `python -m sentinel_triage.synthetic`)."""
+    parser = argparse.ArgumentParser(description="Generate a synthetic head impact CSV")
+    parser.add_argument("--shape", choices=PULSE_SHAPES, default="half-sine", help="Pulse shape")
+    parser.add_argument("--rate", type=float, default=10000.0, help="Sampling rate in Hz")
+    parser.add_argument("--duration", type=float, default=0.1, help="Recording length in seconds")
+    parser.add_argument("--peak_g", type=float, default=100.0, help="Peak resultant linear acceleration (G)")
+    parser.add_argument("--noise_g", type=float, default=0.0, help="Noise standard deviation (G)")
+    parser.add_argument("--output", type=str, default="synthetic_impact.csv", help="Destination CSV file")
+    args = parser.parse_args(argv)
+
+    write_trace_csv(synthetic_trace(args.shape, args.rate, args.duration, args.peak_g, noise_g=args.noise_g), args.output)
+    print(f"Synthetic {args.shape} trace written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,267 @@
+import hashlib
+import json
+import os
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from sentinel_triage import profiling
+
+# Column layout expected by the HIP and GAMBIT calculators
+KINEMATIC_COLUMNS = ["Time", "ax", "ay", "az", "alphax", "alphay", "alphaz"]
+
+PARSERS = ("pyarrow", "pandas", "numpy")
+
+# Binary cache written next to each parsed CSV; set SENTINEL_TRACE_CACHE=0 to disable
+CACHE_SUFFIX = ".trace.npy"
+CACHE_META_SUFFIX = ".trace.json"
+CACHE_VERSION = 1
+
+
+class Trace:
+    """Column-oriented float64 samples of one recording, parsed once and shared by every calculator."""
+
+    def __init__(self, data: np.ndarray, columns: List[str], path: Optional[str] = None):
+        """
+        Args:
+            data (np.ndarray): Samples with shape (n_samples, n_columns).
+            columns (List[str]): Column names, one per column of `data`.
+            path (Optional[str]): File the samples were read from, if any.
+        """
+        data = np.asfortranarray(data, dtype=np.float64)
+        if data.ndim != 2 or data.shape[1] != len(columns):
+            raise ValueError(f"Expected {len(columns)} columns, got data with shape {data.shape}")
+        self.data = data
+        self.columns = list(columns)
+        self.path = path
+        self._index = {name: i for i, name in enumerate(self.columns)}
+
+    def __len__(self) -> int:
+        return self.data.shape[0]
+
+    def __repr__(self) -> str:
+        return f"Trace(path={self.path!r}, samples={len(self)}, columns={self.columns})"
+
+    def column(self, name: str) -> np.ndarray:
+        """
+        Returns one column by name without copying.
+
+        Args:
+            name (str): Column name.
+
+        Returns:
+            np.ndarray: Contiguous view of the column.
+        """
+        try:
+            return self.data[:, self._index[name]]
+        except KeyError:
+            raise KeyError(f"Trace has no column {name!r}; available columns: {self.columns}")
+
+    def select(self, names: Iterable[str]) -> np.ndarray:
+        """
+        Returns the named columns as an (n_samples, len(names)) array.
+
+        Args:
+            names (Iterable[str]): Column names in the desired order.
+
+        Returns:
+            np.ndarray: The full data array when the names match the trace's layout, otherwise a copy.
+        """
+        names = list(names)
+        if names == self.columns:
+            return self.data
+        missing = [name for name in names if name not in self._index]
+        if missing:
+            raise ValueError(f"CSV must have columns: {', '.join(names)}")
+        return self.data[:, [self._index[name] for name in names]]
+
+    def slice(self, start: int, stop: int) -> "Trace":
+        """
+        Returns the samples in [start, stop) as a new trace.
+
+        Args:
+            start (int): First sample index.
+            stop (int): Sample index one past the last.
+
+        Returns:
+            Trace: The selected rows under the same column names.
+        """
+        return Trace(self.data[start:stop], self.columns, self.path)
+
+    def rename(self, column_map: Dict[str, str]) -> "Trace":
+        """
+        Maps source column names onto the names the calculators expect.
+
+        Args:
+            column_map (Dict[str, str]): Source header name -> canonical name, e.g. {"AccX": "ax"}.
+
+        Returns:
+            Trace: A trace sharing this trace's data under the new names.
+        """
+        return Trace(self.data, [column_map.get(name, name) for name in self.columns], self.path)
+
+
+def _read_pyarrow(path: str, delimiter: str):
+    from pyarrow import csv as pa_csv
+
+    table = pa_csv.read_csv(path, parse_options=pa_csv.ParseOptions(delimiter=delimiter))
+    data = np.empty((table.num_rows, table.num_columns), dtype=np.float64, order="F")
+    for i, column in enumerate(table.columns):
+        data[:, i] = column.to_numpy(zero_copy_only=False)
+    return data, table.column_names
+
+
+def _read_pandas(path: str, delimiter: str):
+    import pandas as pd
+
+    frame = pd.read_csv(path, sep=delimiter, dtype=np.float64, engine="c")
+    return frame.to_numpy(dtype=np.float64), list(frame.columns)
+
+
+def _read_numpy(path: str, delimiter: str):
+    with open(path, "r") as f:
+        header = f.readline().rstrip("\r\n").split(delimiter)
+    data = np.loadtxt(path, delimiter=delimiter, skiprows=1, ndmin=2, dtype=np.float64)
+    if data.size == 0:
+        data = data.reshape(0, len(header))
+    return data, header
+
+
+_READERS = {"pyarrow": _read_pyarrow, "pandas": _read_pandas, "numpy": _read_numpy}
+
+
+def available_parser() -> str:
+    """Returns the fastest CSV parser installed: pyarrow, then pandas, then NumPy."""
+    for name, module in (("pyarrow", "pyarrow.csv"), ("pandas", "pandas")):
+        try:
+            __import__(module)
+            return name
+        except ImportError:
+            continue
+    return "numpy"
+
+
+def file_digest(path: str, chunk_size: int = 1 << 20) -> str:
+    """Returns the BLAKE2b hex digest of a file's contents."""
+    digest = hashlib.blake2b(digest_size=20)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _cache_enabled() -> bool:
+    return os.environ.get("SENTINEL_TRACE_CACHE", "1").lower() not in ("0", "false", "no", "off")
+
+
+def _read_cache(path: str, stat: os.stat_result, delimiter: str) -> Optional[Trace]:
+    """
+    Memory-maps the cached samples of `path` if they are still valid.
+
+    The cache is trusted when the source's size and mtime match the sidecar. When only
+    the mtime changed (e.g. the file was touched or copied), the content hash decides,
+    and the sidecar is refreshed so the next load takes the fast path again.
+    """
+    cache_path, meta_path = path + CACHE_SUFFIX, path + CACHE_META_SUFFIX
+    try:
+        with open(meta_path, "r") as f:
+            meta = json.load(f)
+        if meta.get("version") != CACHE_VERSION or meta["delimiter"] != delimiter \
+                or meta["size"] != stat.st_size:
+            return None
+        if meta["mtime_ns"] != stat.st_mtime_ns:
+            if meta["digest"] != file_digest(path):
+                return None
+            meta["mtime_ns"] = stat.st_mtime_ns
+            _write_json(meta_path, meta)
+        data = np.load(cache_path, mmap_mode="r")
+    except (OSError, ValueError, KeyError):
+        return None
+    if data.shape != tuple(meta["shape"]):
+        return None
+    return Trace(data, meta["columns"], path)
+
+
+def _write_json(path: str, payload: dict) -> None:
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, "w") as f:
+        json.dump(payload, f)
+    os.replace(temp_path, path)
+
+
+def _write_cache(trace: Trace, stat: os.stat_result, delimiter: str) -> None:
+    """Writes the samples as a Fortran-ordered .npy file plus a JSON sidecar; failures are ignored."""
+    path = trace.path
+    cache_path = path + CACHE_SUFFIX
+    temp_path = f"{cache_path}.{os.getpid()}.tmp"
+    try:
+        with open(temp_path, "wb") as f:
+            np.save(f, trace.data)
+        os.replace(temp_path, cache_path)
+        _write_json(path + CACHE_META_SUFFIX, {
+            "version": CACHE_VERSION,
+            "delimiter": delimiter,
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "digest": file_digest(path),
+            "columns": trace.columns,
+            "shape": list(trace.data.shape),
+        })
+    except OSError:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+
+def load_trace(path: str, column_map: Optional[Dict[str, str]] = None, delimiter: str = ",",
+               parser: str = "auto", cache: Optional[bool] = None) -> Trace:
+    """
+    Parses a CSV file with a header row into a `Trace` in a single bulk read.
+
+    The first load writes a binary copy next to the file (`<file>.trace.npy` plus a
+    `<file>.trace.json` sidecar). Later loads memory-map that copy instead of parsing,
+    so column slices are zero-copy views of the cache file.
+
+    Args:
+        path (str): Path to the CSV file.
+        column_map (Optional[Dict[str, str]]): Source header name -> canonical name.
+        delimiter (str): Field delimiter.
+        parser (str): "pyarrow", "pandas", "numpy" or "auto" for the fastest installed one.
+        cache (Optional[bool]): Use the binary cache (default: on unless SENTINEL_TRACE_CACHE=0).
+
+    Returns:
+        Trace: The parsed samples.
+    """
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"File not found: {path}")
+    if cache is None:
+        cache = _cache_enabled()
+
+    stat = os.stat(path)
+    trace = None
+    if cache:
+        with profiling.stage("read_cache") as timer:
+            trace = _read_cache(path, stat, delimiter)
+            if trace is not None:
+                timer.add(trace.data.size, trace.data.nbytes)
+    if trace is not None:
+        return trace.rename(column_map) if column_map else trace
+
+    if parser == "auto":
+        parser = available_parser()
+    if parser not in _READERS:
+        raise ValueError(f"Unknown parser {parser!r}; choose from {', '.join(PARSERS)}")
+
+    with profiling.stage("read_csv", nbytes=stat.st_size) as timer:
+        try:
+            data, columns = _READERS[parser](path, delimiter)
+        except Exception as e:
+            raise RuntimeError(f"Error reading file {path}: {e}")
+        timer.add(data.size)
+
+    trace = Trace(data, [str(name).strip() for name in columns], path)
+    if cache:
+        with profiling.stage("write_cache", data.size):
+            _write_cache(trace, stat, delimiter)
+    if column_map:
+        trace = trace.rename(column_map)
+    return trace
@@ -0,0 +1,160 @@
+import argparse
+import json
+import sys
+from typing import Dict, IO, List, Optional, Tuple
+
+from sentinel_triage.batch import open_store
+from sentinel_triage.engine import ACCEL_UNITS, CRITERIA, TriageEngine
+from sentinel_triage.traces import KINEMATIC_COLUMNS, Trace, load_trace
+
+
+def warm_up(frequency: float = 1e-4) -> None:
+    """
+    Scores a short synthetic trace so that SciPy, the filter designs for `frequency` and
+    any Numba kernels are loaded before the first real request arrives.
+
+    Args:
+        frequency (float): Time step in seconds the requests are expected to use.
+    """
+    from sentinel_triage.synthetic import synthetic_trace
+
+    data = synthetic_trace("half-sine", 1 / frequency, 0.05)
+    TriageEngine(frequency, accel_units="g").run(Trace(data, KINEMATIC_COLUMNS))
+
+
+def parse_request(line: str) -> Dict[str, object]:
+    """
+    Parses one JSON request.
+
+    Args:
+        line (str): A JSON object, as described in `Worker.handle`.
+
+    Returns:
+        Dict[str, object]: The request.
+    """
+    request = json.loads(line)
+    if not isinstance(request, dict):
+        raise ValueError("Request must be a JSON object")
+    return request
+
+
+class Worker:
+    """
+    Long-lived scorer that answers JSON requests, one per line, without restarting Python.
+
+    Engines are kept per (frequency, column locations, HIC limits, store, decimation, units) combination, so
+    repeated requests reuse the filter designs, compiled kernels and open store.
+    """
+
+    def __init__(self):
+        self._engines: Dict[Tuple, TriageEngine] = {}
+
+    def engine(self, frequency: float, locations: Tuple[int, int, int], limits_ms: Tuple[float, ...],
+               store_path: Optional[str], decimate: bool = False, accel_units: Optional[str] = None) -> TriageEngine:
+        """Returns the cached engine for these settings, creating it on first use."""
+        key = (frequency, locations, limits_ms, store_path, decimate, accel_units)
+        if key not in self._engines:
+            self._engines[key] = TriageEngine(frequency, *locations, limits_ms=limits_ms, store=open_store(store_path),
+                                              decimate=decimate, accel_units=accel_units)
+        return self._engines[key]
+
+    @staticmethod
+    def load(request: Dict[str, object]) -> Trace:
+        """
+        Loads the trace a request refers to.
+
+        Args:
+            request (Dict[str, object]): A request as described in `handle`.
+
+        Returns:
+            Trace: The parsed "path" file, or the "data" rows.
+        """
+        if "frequency" not in request:
+            raise ValueError("Request needs a 'frequency'")
+        if "path" in request:
+            return load_trace(request["path"])
+        if "data" in request:
+            return Trace(request["data"], KINEMATIC_COLUMNS)
+        raise ValueError("Request needs a 'path' or 'data'")
+
+    def score(self, trace: Trace, request: Dict[str, object]) -> Dict[str, object]:
+        """
+        Scores a loaded trace with the settings of a request.
+
+        Args:
+            trace (Trace): The trace from `load`.
+            request (Dict[str, object]): A request as described in `handle`.
+
+        Returns:
+            Dict[str, object]: The scores of `TriageEngine.run`, including "error".
+        """
+        if request.get("accel_units") is None:
+            raise ValueError(f"Request needs 'accel_units' ({' or '.join(map(repr, ACCEL_UNITS))})")
+        locations = (int(request.get("x_location", 2)), int(request.get("y_location", 3)),
+                     int(request.get("z_location", 4)))
+        limits_ms = tuple(float(limit) for limit in request.get("limits_ms", (15.0, 36.0)))
+        engine = self.engine(float(request["frequency"]), locations, limits_ms, request.get("store"),
+                             bool(request.get("decimate", False)), request["accel_units"])
+        return engine.run(trace, request.get("criteria", tuple(CRITERIA)), strict=False)
+
+    def handle(self, request: Dict[str, object]) -> Dict[str, object]:
+        """
+        Scores one request.
+
+        Args:
+            request (Dict[str, object]): "frequency" (time step in seconds), "accel_units" ("g" or "mm/s2";
+                see `TriageEngine`) and either "path" (a CSV file) or "data" (rows in the Time, ax, ay, az,
+                alphax, alphay, alphaz layout). Optional: "id" (echoed back), "criteria", "x_location",
+                "y_location", "z_location", "limits_ms", "store" (a `ResultStore` path) and "decimate".
+
+        Returns:
+            Dict[str, object]: The request's "id", the scores of `TriageEngine.run` and "error".
+        """
+        response = {"id": request.get("id")}
+        try:
+            response.update(self.score(self.load(request), request))
+        except Exception as e:
+            response["error"] = str(e)
+        return response
+
+    def serve(self, requests: IO[str], responses: IO[str]) -> int:
+        """
+        Answers every line of `requests` with one line of JSON on `responses` until end of input.
+
+        Args:
+            requests (IO[str]): Stream of JSON requests, one per line; blank lines are skipped.
+            responses (IO[str]): Stream the responses are written and flushed to.
+
+        Returns:
+            int: Number of requests answered.
+        """
+        count = 0
+        for line in requests:
+            if not line.strip():
+                continue
+            try:
+                request = parse_request(line)
+            except ValueError as e:
+                response = {"id": None, "error": f"Invalid request: {e}"}
+            else:
+                response = self.handle(request)
+            responses.write(json.dumps(response) + "\n")
+            responses.flush()
+            count += 1
+        return count
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Runs the command-line interface (`sentinel-triage worker` or `python -m sentinel_triage.worker`)."""
+    parser = argparse.ArgumentParser(description="Score JSON requests from stdin in one warm process, one response line each")
+    parser.add_argument("--warm_frequency", type=float, default=1e-4, help="Time step to load filters and kernels for up front")
+    parser.add_argument("--no_warm_up", action="store_true", help="Skip the warm-up; the first request pays the start-up")
+    args = parser.parse_args(argv)
+
+    if not args.no_warm_up:
+        warm_up(args.warm_frequency)
+    Worker().serve(sys.stdin, sys.stdout)
+
+
+if __name__ == "__main__":
+    main()
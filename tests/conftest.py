@@ -0,0 +1,23 @@
+import numpy as np
+import pytest
+
+from sentinel_triage import kernels
+
+BACKENDS = ["numpy"] + (["numba"] if kernels.numba_available() else [])
+
+
+@pytest.fixture(params=BACKENDS)
+def backend(request, monkeypatch):
+    """Runs a test once per available kernel backend."""
+    monkeypatch.setattr(kernels, "_backend", request.param)
+    return request.param
+
+
+@pytest.fixture(params=[0, 1, 2])
+def magnitudes(request) -> np.ndarray:
+    """Positive resultant (G) with two pulses of different width on top of noise."""
+    n_samples = 800
+    rng = np.random.default_rng(request.param)
+    t = np.arange(n_samples)
+    pulses = 120 * np.exp(-0.5 * ((t - 0.3 * n_samples) / 12) ** 2) + 60 * np.exp(-0.5 * ((t - 0.7 * n_samples) / 60) ** 2)
+    return pulses + np.abs(rng.normal(0.0, 2.0, n_samples))
@@ -0,0 +1,46 @@
+import csv
+
+import pytest
+
+from sentinel_triage import batch
+from sentinel_triage.synthetic import synthetic_trace, write_trace_csv
+
+DT = 1e-4
+
+
+def test_cli_requires_units(tmp_path, capsys):
+    write_trace_csv(synthetic_trace("half-sine", 1 / DT, 0.05, 80.0), str(tmp_path / "trace.csv"))
+    with pytest.raises(SystemExit):
+        batch.main([str(tmp_path), "--frequency", str(DT), "--output", str(tmp_path / "summary.csv")])
+    assert "--accel_units" in capsys.readouterr().err
+    assert not (tmp_path / "summary.csv").exists()
+
+
+def test_cli_writes_one_row_per_trace(tmp_path):
+    for shape in ("half-sine", "haversine"):
+        write_trace_csv(synthetic_trace(shape, 1 / DT, 0.05, 80.0), str(tmp_path / f"{shape}.csv"))
+    output = tmp_path / "summary.csv"
+    batch.main([str(tmp_path), "--frequency", str(DT), "--accel_units", "g", "--workers", "1", "--output", str(output)])
+    with open(output, newline="") as f:
+        rows = list(csv.DictReader(f))
+    assert [row["file"].rsplit("/", 1)[-1] for row in rows] == ["half-sine.csv", "haversine.csv"]
+    assert all(not row["error"] and float(row["HIC15"]) > 0 for row in rows)
+
+
+def test_summary_is_not_flushed_per_row(tmp_path, monkeypatch):
+    flushes = []
+    real_open = open
+
+    def counting_open(*args, **kwargs):
+        f = real_open(*args, **kwargs)
+        flush = f.flush
+        f.flush = lambda: flushes.append(1) or flush()
+        return f
+
+    monkeypatch.setattr("builtins.open", counting_open)
+    rows = [dict.fromkeys(batch.SUMMARY_FIELDS, None) | {"file": f"case{i}.csv"} for i in range(500)]
+    output = tmp_path / "summary.csv"
+    assert batch.write_summary(rows, str(output)) == 500
+    assert len(flushes) < 5
+    with real_open(output, newline="") as f:
+        assert [row["file"] for row in csv.DictReader(f)] == [row["file"] for row in rows]
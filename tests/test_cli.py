@@ -0,0 +1,23 @@
+import pytest
+
+from sentinel_triage import cli
+
+
+@pytest.mark.parametrize("option", ["--profile_output", "--profile_stacks"])
+def test_unwritable_profile_is_refused_before_the_command(tmp_path, option):
+    output = tmp_path / "impact.csv"
+    with pytest.raises(SystemExit, match="cannot write profile"):
+        cli.main([option, str(tmp_path / "missing" / "x.prof"), "synthetic", "--output", str(output)])
+    assert not output.exists()
+
+
+def test_profile_is_written(tmp_path, capsys):
+    stats, stacks, output = tmp_path / "x.prof", tmp_path / "stacks.txt", tmp_path / "impact.csv"
+    cli.main(["--profile_output", str(stats), "--profile_stacks", str(stacks), "synthetic", "--output", str(output)])
+    assert output.exists() and stats.stat().st_size > 0 and stacks.exists()
+    assert capsys.readouterr().err
+
+
+def test_unknown_command(capsys):
+    with pytest.raises(SystemExit, match="unknown command 'nope'"):
+        cli.main(["nope"])
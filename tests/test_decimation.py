@@ -0,0 +1,69 @@
+import math
+
+import numpy as np
+import pytest
+
+from sentinel_triage import filters
+from sentinel_triage.gambit import GAMBITCalculator
+from sentinel_triage.hip import HIPCalculator
+from sentinel_triage.synthetic import synthetic_trace
+
+RATE_HZ = 1_000_000
+DT = 1 / RATE_HZ
+# Worst-case error from sampling a peak at the bandwidth with `DECIMATION_MARGIN` samples per cycle
+PEAK_BOUND = 1 - math.cos(math.pi / filters.DECIMATION_MARGIN)
+
+
+@pytest.mark.parametrize("dt, bandwidth, min_rate, factor", [
+    (1e-6, 300.0, 0.0, 166),
+    (1e-6, 300.0, 10_000.0, 100),
+    (1e-6, 400.0, 0.0, 125),
+    (1e-4, 300.0, 0.0, 1),
+    (1e-3, 400.0, 0.0, 1),
+])
+def test_decimation_factor(dt, bandwidth, min_rate, factor):
+    assert filters.decimation_factor(dt, bandwidth, min_rate=min_rate) == factor
+
+
+def test_factor_one_passes_through():
+    data = np.arange(10.0)
+    np.testing.assert_array_equal(filters.decimate(data, 1, DT, 300.0), data)
+
+
+def test_decimation_without_room_above_the_bandwidth_is_refused():
+    with pytest.raises(ValueError, match="leaves no room"):
+        filters.decimate(np.zeros(1000), 20, 1e-4, 400.0)
+
+
+@pytest.mark.parametrize("bandwidth", [300.0, 400.0])
+def test_peak_at_the_bandwidth_stays_within_the_bound(bandwidth):
+    factor = filters.decimation_factor(DT, bandwidth)
+    time = np.arange(200_000) * DT
+    tone = np.sin(2 * np.pi * bandwidth * time)
+    decimated = filters.decimate(tone, factor, DT, bandwidth)
+    assert len(decimated) == math.ceil(len(tone) / factor)
+    middle = decimated[len(decimated) // 4:-len(decimated) // 4]
+    assert 1 - PEAK_BOUND - 1e-3 <= np.abs(middle).max() <= 1 + 1e-3
+
+
+@pytest.mark.parametrize("bandwidth", [300.0, 400.0])
+def test_content_folding_into_the_band_is_suppressed(bandwidth):
+    factor = filters.decimation_factor(DT, bandwidth)
+    time = np.arange(200_000) * DT
+    # Aliases to bandwidth / 2 at the decimated rate
+    tone = np.sin(2 * np.pi * (1 / (DT * factor) - bandwidth / 2) * time)
+    decimated = filters.decimate(tone, factor, DT, bandwidth)
+    middle = decimated[len(decimated) // 4:-len(decimated) // 4]
+    # Within 20 dB of the design attenuation, which the Kaiser estimate only approximates
+    assert np.abs(middle).max() < 10 ** ((20 - filters.DECIMATION_ATTENUATION) / 20)
+
+
+@pytest.mark.parametrize("calculator, method", [(HIPCalculator, "calculate_hip"),
+                                                (GAMBITCalculator, "calculate_gambit")])
+@pytest.mark.parametrize("shape", ["half-sine", "haversine", "multi-peak"])
+def test_decimated_criteria_stay_within_the_bound(calculator, method, shape):
+    data = synthetic_trace(shape, RATE_HZ, 0.05, 80.0, noise_g=0.5, seed=1)
+    full_rate = getattr(calculator(DT), method)(data)
+    decimated_calculator = calculator(DT, decimate=True)
+    assert decimated_calculator.decimation_factor() > 1
+    assert getattr(decimated_calculator, method)(data) == pytest.approx(full_rate, rel=PEAK_BOUND)
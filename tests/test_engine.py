@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+
+from sentinel_triage.engine import MM_PER_G, TriageEngine
+from sentinel_triage.synthetic import synthetic_trace
+from sentinel_triage.traces import KINEMATIC_COLUMNS, Trace
+
+DT = 1e-4
+
+
+def test_engine_warns_without_units():
+    with pytest.warns(UserWarning, match="accel_units"):
+        TriageEngine(DT)
+
+
+def test_engine_rejects_unknown_units():
+    with pytest.raises(ValueError, match="Unknown acceleration units"):
+        TriageEngine(DT, accel_units="m/s2")
+
+
+def test_units_give_the_same_scores():
+    data = synthetic_trace("half-sine", 1 / DT, 0.05, 80.0)
+    scaled = data.copy()
+    scaled[:, 1:4] *= MM_PER_G
+    in_g = TriageEngine(DT, accel_units="g").run(Trace(data, KINEMATIC_COLUMNS))
+    in_mm = TriageEngine(DT, accel_units="mm/s2").run(Trace(scaled, KINEMATIC_COLUMNS))
+    assert in_g.keys() == in_mm.keys()
+    for name in ("HIC15", "HIC36", "HIP_m", "GAMBIT"):
+        assert in_mm[name] == pytest.approx(in_g[name], rel=1e-9)
+    assert 100 < in_g["HIC15"] < 1000 and 0.1 < in_g["GAMBIT"] < 10
+
+
+@pytest.mark.filterwarnings("ignore:TriageEngine without accel_units")
+@pytest.mark.parametrize("accel_units", [None, "g", "mm/s2"])
+def test_run_stack_matches_run(backend, accel_units):
+    stack = np.stack([synthetic_trace(shape, 1 / DT, 0.05, peak, noise_g=0.5, seed=i)
+                      for i, (shape, peak) in enumerate([("half-sine", 80.0), ("haversine", 120.0), ("multi-peak", 60.0)])])
+    if accel_units == "mm/s2":
+        stack[..., 1:4] *= MM_PER_G
+    engine = TriageEngine(DT, accel_units=accel_units)
+    stacked = engine.run_stack(stack)
+    for i, data in enumerate(stack):
+        single = engine.run(Trace(data, KINEMATIC_COLUMNS))
+        for name, values in stacked.items():
+            assert values[i] == pytest.approx(single[name], rel=1e-9, nan_ok=True)
+
+
+def test_severity_index_takes_the_time_step():
+    engine = TriageEngine(DT, accel_units="g")
+    magnitudes = np.abs(np.random.default_rng(0).normal(10.0, 3.0, (2, 400)))
+    expected = [engine.si.calculate_si(np.arange(len(row)) * DT, row) for row in magnitudes]
+    assert engine.si.severity_index(magnitudes) == pytest.approx(expected)
+    assert engine.si.severity_index(magnitudes[0], 2 * DT) == pytest.approx(2 * expected[0])
@@ -0,0 +1,76 @@
+import numpy as np
+import pytest
+
+from sentinel_triage.batch import score_events, score_trace
+from sentinel_triage.engine import MM_PER_G
+from sentinel_triage.events import detect_events
+from sentinel_triage.synthetic import synthetic_trace, write_trace_csv
+from sentinel_triage.traces import KINEMATIC_COLUMNS, Trace
+
+DT = 1e-4
+
+
+def two_impacts() -> np.ndarray:
+    data = synthetic_trace("half-sine", 1 / DT, 0.1, 80.0, onset_s=0.02)
+    data[:, 1:] += synthetic_trace("half-sine", 1 / DT, 0.1, 60.0, onset_s=0.07)[:, 1:]
+    return data
+
+
+def test_hysteresis_keeps_one_event():
+    resultant = np.array([0, 12, 7, 11, 6, 4, 0, 0, 15, 0], dtype=float)
+    assert detect_events(resultant, 10) == [(1, 5), (8, 9)]
+    assert detect_events(resultant, 10, off_threshold=8) == [(1, 2), (3, 4), (8, 9)]
+
+
+def test_padding_and_merging():
+    resultant = np.zeros(30)
+    resultant[[5, 12, 25]] = 20
+    assert detect_events(resultant, 10, padding=2) == [(3, 8), (10, 15), (23, 28)]
+    assert detect_events(resultant, 10, padding=2, min_gap=3) == [(3, 15), (23, 28)]
+    assert detect_events(resultant, 10, padding=30) == [(0, 30)]
+
+
+def test_rejects_off_threshold_above_on_threshold():
+    with pytest.raises(ValueError, match="off_threshold"):
+        detect_events(np.zeros(5), 10, off_threshold=11)
+
+
+@pytest.mark.parametrize("accel_units", ["g", "mm/s2"])
+def test_score_events_rows(accel_units):
+    data = two_impacts()
+    if accel_units == "mm/s2":
+        data[:, 1:4] *= MM_PER_G
+    trace = Trace(data, KINEMATIC_COLUMNS, path="two_impacts.csv")
+    rows = score_events(trace, DT, 10.0, accel_units=accel_units)
+    assert [row["event"] for row in rows] == [0, 1]
+    assert all(row["file"] == "two_impacts.csv" and row["error"] is None for row in rows)
+    assert rows[0]["t_end"] < rows[1]["t_start"]
+    assert rows[0]["t_start"] <= rows[0]["HIC15_t1"] < rows[0]["HIC15_t2"] <= rows[0]["t_end"]
+    assert rows[0]["HIC15"] > rows[1]["HIC15"] > 0
+
+    # The first impact alone scores as its own padded window of the recording
+    alone = score_trace(trace.slice(int(round(rows[0]["t_start"] / DT)), int(round(rows[0]["t_end"] / DT))), DT,
+                        accel_units=accel_units)
+    assert alone["GAMBIT"] == pytest.approx(rows[0]["GAMBIT"])
+
+
+def test_quiet_recording_keeps_a_row(tmp_path):
+    path = str(tmp_path / "quiet.csv")
+    write_trace_csv(synthetic_trace("half-sine", 1 / DT, 0.05, 5.0), path)
+    rows = score_events(path, DT, 10.0, accel_units="g")
+    assert len(rows) == 1
+    assert rows[0]["file"] == path and rows[0]["event"] is None and rows[0]["error"] is None
+    assert rows[0]["t_start"] == 0.0 and rows[0]["t_end"] == pytest.approx(0.05)
+    assert rows[0]["HIC15"] is None
+
+
+def test_wrong_units_give_an_error_row():
+    trace = Trace(two_impacts(), KINEMATIC_COLUMNS, path="in_g.csv")
+    rows = score_events(trace, DT, 10.0, accel_units="mm/s2")
+    assert len(rows) == 1 and rows[0]["event"] is None
+    assert "check the acceleration units" in rows[0]["error"]
+
+
+def test_unreadable_file_gives_an_error_row(tmp_path):
+    rows = score_events(str(tmp_path / "missing.csv"), DT, 10.0, accel_units="g")
+    assert len(rows) == 1 and rows[0]["error"]
@@ -0,0 +1,78 @@
+import numpy as np
+import pytest
+from scipy import signal
+
+from sentinel_triage import filters
+
+
+@pytest.fixture
+def empty_cache():
+    filters.clear_filter_cache()
+    yield
+    filters.clear_filter_cache()
+
+
+def test_designs_are_cached(empty_cache):
+    first = filters.butter_lowpass(4, 300, 1e-4)
+    second = filters.butter_lowpass(4.0, 300.0, 1e-4)  # Same key after normalization
+    assert second is first
+    assert filters.filter_cache_info()["misses"] == 1 and filters.filter_cache_info()["hits"] == 1
+
+    filters.butter_lowpass_sos(4, 300, 1e-4)  # Another output form is another design
+    filters.butter_lowpass(4, 300, 1e-5)
+    info = filters.filter_cache_info()
+    assert (info["misses"], info["currsize"], info["maxsize"]) == (3, 3, filters.FILTER_CACHE_SIZE)
+
+
+def test_cached_designs_match_scipy_and_are_read_only(empty_cache):
+    b, a = filters.butter_lowpass(2, 1650, 1e-4)
+    expected_b, expected_a = signal.butter(2, 1650 / 5000, btype="low")
+    np.testing.assert_allclose(b, expected_b)
+    np.testing.assert_allclose(a, expected_a)
+    with pytest.raises(ValueError):
+        b[0] = 1.0
+
+
+def test_clear_resets_the_counters(empty_cache):
+    filters.butter_lowpass(2, 1000, 1e-4)
+    filters.clear_filter_cache()
+    assert filters.filter_cache_info() == {"hits": 0, "misses": 0, "maxsize": filters.FILTER_CACHE_SIZE, "currsize": 0}
+
+
+@pytest.mark.parametrize("cfc", sorted(filters.CFC_CUTOFFS))
+def test_cfc_corner_is_at_its_cutoff(cfc):
+    dt = 1e-5
+    sos = filters.cfc_sos(cfc, dt)
+    _, response = signal.sosfreqz(sos, worN=[filters.CFC_CUTOFFS[cfc]], fs=1 / dt)
+    assert 20 * np.log10(abs(response[0])) == pytest.approx(-3.01, abs=0.05)
+
+
+def test_unknown_cfc_and_phase():
+    with pytest.raises(ValueError, match="Unknown CFC"):
+        filters.cfc_sos(100, 1e-4)
+    with pytest.raises(ValueError, match="Unknown phase mode"):
+        filters.cfc_filter(np.zeros(32), 1000, 1e-4, phase="backward")
+
+
+def test_phase_modes_match_scipy():
+    data = np.random.default_rng(0).normal(size=500)
+    sos = np.array(filters.cfc_sos(180, 1e-4))
+    np.testing.assert_allclose(filters.cfc_filter(data, 180, 1e-4), signal.sosfiltfilt(sos, data))
+    np.testing.assert_allclose(filters.cfc_filter(data, 180, 1e-4, phase="causal"), signal.sosfilt(sos, data))
+
+
+def test_stack_filters_along_the_time_axis():
+    stack = np.random.default_rng(1).normal(size=(3, 400, 6))
+    filtered = filters.lowpass(stack, 300.0, 1e-4, order=4, axis=1)
+    for i in range(3):
+        np.testing.assert_allclose(filtered[i], filters.lowpass(stack[i], 300.0, 1e-4, order=4), atol=1e-12)
+
+
+def test_sections_stay_stable_at_a_low_relative_cutoff():
+    # An 8th-order 100 Hz corner at 1 MHz: rounding pushes the poles of the (b, a) form outside
+    # the unit circle, the second-order sections stay stable
+    dt = 1e-6
+    step = np.ones(60_000)
+    filtered = filters.lowpass(step, filters.CFC_CUTOFFS[60], dt, order=8, phase="causal")
+    assert np.all(np.isfinite(filtered)) and filtered.max() < 1.2
+    assert filtered[-1] == pytest.approx(1.0, abs=0.01)
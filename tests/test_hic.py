@@ -0,0 +1,100 @@
+import numpy as np
+import pytest
+
+from sentinel_triage.hic import HICCalculator, StreamingHIC
+from sentinel_triage.synthetic import synthetic_trace, write_trace_csv
+
+DT = 1e-4
+LIMITS_MS = (5.0, 15.0, 36.0)
+
+
+def brute_force_windows(magnitudes: np.ndarray, dt: float, limits_ms) -> dict:
+    """Every window up to each limit, never closing on the final sample, as the original loop did."""
+    cumulative = HICCalculator(dt).cumulative_integral(magnitudes)
+    results = {}
+    for limit in limits_ms:
+        width = int(limit / (dt * 1000) + 1e-9)
+        best = (0.0, 0, 0)
+        for end in range(1, len(magnitudes) - 1):
+            for start in range(max(end - width, 0), end):
+                duration = (end - start) * dt
+                value = ((cumulative[end] - cumulative[start]) / duration) ** 2.5 * duration
+                if value > best[0]:
+                    best = (value, start, end)
+        results[f"HIC{limit:g}"] = (best[0], best[1] * dt, best[2] * dt)
+    return results
+
+
+def test_search_matches_brute_force(backend, magnitudes):
+    expected = brute_force_windows(magnitudes, DT, LIMITS_MS)
+    windows = HICCalculator(DT).calculate_hic_magnitudes(magnitudes, LIMITS_MS)
+    for name, (value, t1, t2) in expected.items():
+        assert windows[name][0] == pytest.approx(value, rel=1e-9)
+        assert windows[name][1:] == pytest.approx((t1, t2))
+
+
+def test_search_with_precomputed_integral(backend, magnitudes):
+    calculator = HICCalculator(DT)
+    direct = calculator.calculate_hic_magnitudes(magnitudes, LIMITS_MS)
+    reused = calculator.calculate_hic_magnitudes(magnitudes, LIMITS_MS, calculator.cumulative_integral(magnitudes))
+    assert reused == pytest.approx(direct, rel=1e-12)
+
+
+@pytest.mark.parametrize("block_sizes", [[1], [3, 1, 7], [64], [129, 5, 300]])
+def test_streaming_matches_whole_record(backend, magnitudes, block_sizes):
+    expected = HICCalculator(DT).calculate_hic_magnitudes(magnitudes, LIMITS_MS)
+    stream = StreamingHIC(DT, LIMITS_MS)
+    start, sizes = 0, iter(block_sizes * len(magnitudes))
+    while start < len(magnitudes):
+        size = next(sizes)
+        stream.update(magnitudes[start:start + size])
+        start += size
+    for name, (value, t1, t2) in stream.result().items():
+        assert value == pytest.approx(expected[name][0], rel=1e-9)
+        assert (t1, t2) == pytest.approx(expected[name][1:])
+
+
+@pytest.mark.parametrize("chunk_size", [1, 97, 65536])
+def test_process_stream_matches_whole_file(backend, tmp_path, chunk_size):
+    data = synthetic_trace("multi-peak", 1 / DT, 0.08, noise_g=0.5)
+    data[:, 1:4] *= 9810  # HIC reads mm/s²
+    path = str(tmp_path / "impact_data.csv")
+    write_trace_csv(data, path)
+
+    calculator = HICCalculator(DT)
+    expected = calculator.calculate_hic_windows(calculator.get_series(path, 2, 3, 4), LIMITS_MS)
+    streamed = calculator.process_stream(path, 2, 3, 4, chunk_size=chunk_size, limits_ms=LIMITS_MS)
+    for name, (value, t1, t2) in streamed.items():
+        assert value == pytest.approx(expected[name][0], rel=1e-9)
+        assert (t1, t2) == pytest.approx(expected[name][1:])
+
+
+def flat_magnitudes(seed: int = 0) -> np.ndarray:
+    """Level signal with noise, where nearly every tile of the window search stays open."""
+    return 50.0 + np.random.default_rng(seed).normal(0.0, 1.0, 800)
+
+
+def test_flat_signal_falls_back_to_the_sweep(backend, monkeypatch):
+    magnitudes = flat_magnitudes()
+    expected = brute_force_windows(magnitudes, DT, LIMITS_MS)
+    sweeps = []
+    sweep_windows = HICCalculator.sweep_windows
+    monkeypatch.setattr(HICCalculator, "sweep_windows",
+                        staticmethod(lambda *args: sweeps.append(args) or sweep_windows(*args)))
+    windows = HICCalculator(DT).calculate_hic_magnitudes(magnitudes, LIMITS_MS)
+    assert len(sweeps) == (backend == "numpy")  # The Numba kernel sweeps inline
+    for name, (value, t1, t2) in expected.items():
+        assert windows[name][0] == pytest.approx(value, rel=1e-9)
+        assert windows[name][1:] == pytest.approx((t1, t2))
+
+
+@pytest.mark.parametrize("min_end", [0, 300, 798])
+def test_sweep_matches_search(magnitudes, min_end):
+    cumulative = HICCalculator(DT).cumulative_integral(magnitudes)[:-1]
+    widths = [50, 150, 360]
+    searched = HICCalculator.search_windows(cumulative, magnitudes, DT, widths, min_end=min_end)
+    swept = HICCalculator.sweep_windows(cumulative, DT, widths, min_end)
+    for w in widths:
+        assert swept[w][0] == pytest.approx(searched[w][0], rel=1e-9)
+        assert swept[w][1:] == searched[w][1:]
+        assert swept[w][2] >= min_end or swept[w][0] == 0.0
@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+
+from sentinel_triage import kernels
+from sentinel_triage.engine import TriageEngine
+from sentinel_triage.hic import HICCalculator
+from sentinel_triage.synthetic import PULSE_SHAPES, synthetic_trace
+
+pytestmark = pytest.mark.skipif(not kernels.numba_available(), reason="numba is not installed")
+
+
+def _on_backends(monkeypatch, score):
+    results = {}
+    for name in ("numpy", "numba"):
+        monkeypatch.setattr(kernels, "_backend", name)
+        results[name] = score()
+    return results["numpy"], results["numba"]
+
+
+def test_hic_search_backends_agree(monkeypatch, magnitudes):
+    calculator = HICCalculator(1e-4)
+    cumulative = calculator.cumulative_integral(magnitudes)
+    numpy_windows, numba_windows = _on_backends(
+        monkeypatch, lambda: calculator.search_windows(cumulative[:-1], magnitudes, 1e-4, [50, 150, 360]))
+    for width, (value, start, end) in numpy_windows.items():
+        assert numba_windows[width][0] == pytest.approx(value, rel=kernels.TOLERANCE)
+        assert numba_windows[width][1:] == (start, end)
+
+
+@pytest.mark.parametrize("min_end", [0, 20_000])
+def test_hic_sweep_backends_agree(monkeypatch, min_end):
+    magnitudes = 50.0 + np.random.default_rng(0).normal(0.0, 1.0, 40_000)
+    cumulative = HICCalculator(1e-4).cumulative_integral(magnitudes)[:-1]
+    numpy_windows, numba_windows = _on_backends(
+        monkeypatch, lambda: HICCalculator.search_windows(cumulative, magnitudes, 1e-4, [150, 360], min_end=min_end))
+    assert numpy_windows == HICCalculator.sweep_windows(cumulative, 1e-4, [150, 360], min_end)
+    for width, (value, start, end) in numpy_windows.items():
+        assert numba_windows[width][0] == pytest.approx(value, rel=kernels.TOLERANCE)
+        assert numba_windows[width][1:] == (start, end)
+
+
+@pytest.mark.parametrize("shape", PULSE_SHAPES)
+def test_criteria_backends_agree(monkeypatch, shape):
+    data = synthetic_trace(shape, 10_000, 0.1, noise_g=0.5)
+    data[:, 1:4] *= 9810
+    numpy_scores, numba_scores = _on_backends(monkeypatch, lambda: TriageEngine(1e-4, accel_units="mm/s2").run(data))
+    for name in ("HIC15", "HIC36", "SI", "HIP_m", "GAMBIT"):
+        assert numba_scores[name] == pytest.approx(numpy_scores[name], rel=kernels.TOLERANCE, nan_ok=True)
@@ -0,0 +1,97 @@
+import numpy as np
+import pytest
+
+from sentinel_triage.lsdyna import _fortran_float, history_nodes, index_nodout, read_nodout
+
+NODES = (101, 102, 7)
+ROTATIONAL_NODES = (101, 102)
+TIMES = (0.0, 1.0e-4, 2.0e-4)
+
+
+def accelerations(node, state, rotational):
+    base = node * 10.0 + state + (0.5 if rotational else 0.0)
+    return [base, -base, base * 2.0]
+
+
+def row(node, state, rotational):
+    fields = [0.0] * 6 + accelerations(node, state, rotational) + [0.0] * 3
+    return "%10d" % node + "".join("%12.4E" % value for value in fields) + "\n"
+
+
+def write_nodout(path):
+    lines = [" ls-dyna nodout\n", "\n"]
+    for state, time in enumerate(TIMES):
+        lines.append(f" n o d a l   p r i n t   o u t   for time step{state + 1:>8}   ( at time {time:.7E} )\n\n")
+        lines.append(" nodal point  x-disp     y-disp      z-disp      x-vel       y-vel       z-vel"
+                     "      x-accl      y-accl      z-accl      x-coor      y-coor      z-coor\n")
+        lines.extend(row(node, state, False) for node in NODES)
+        lines.append("\n")
+        lines.append(" nodal point  x-rot      y-rot       z-rot       x-rot vel   y-rot vel   z-rot vel"
+                     "   x-rot acc   y-rot acc   z-rot acc\n")
+        lines.extend(row(node, state, True) for node in ROTATIONAL_NODES)
+        lines.append("\n")
+    with open(path, "w") as f:
+        f.writelines(lines)
+
+
+@pytest.fixture
+def nodout(tmp_path):
+    path = str(tmp_path / "nodout")
+    write_nodout(path)
+    return path
+
+
+@pytest.mark.parametrize("node", NODES)
+def test_streaming_and_indexed_reads_agree(nodout, node):
+    index = index_nodout(nodout)
+    streamed = read_nodout(nodout, node, linear_scale=2.0)
+    indexed = read_nodout(nodout, node, index=index, linear_scale=2.0)
+    np.testing.assert_array_equal(streamed.data, indexed.data)
+    np.testing.assert_allclose(streamed.data[:, 0], TIMES)
+    expected = [accelerations(node, state, False) for state in range(len(TIMES))]
+    np.testing.assert_allclose(streamed.data[:, 1:4], np.array(expected) * 2.0)
+
+
+def test_node_without_rotational_output_has_nan_angular_columns(nodout):
+    trace = read_nodout(nodout, 7, index=index_nodout(nodout))
+    assert np.isnan(trace.data[:, 4:7]).all()
+    rotational = read_nodout(nodout, 102)
+    expected = [accelerations(102, state, True) for state in range(len(TIMES))]
+    np.testing.assert_allclose(rotational.data[:, 4:7], expected)
+
+
+def test_index_lists_nodes_and_states(nodout):
+    index = index_nodout(nodout)
+    assert index.nodes == list(NODES)
+    assert set(index.rows["rotational"]) == set(ROTATIONAL_NODES)
+    assert len(index.offsets["translational"]) == len(index.offsets["rotational"]) == len(TIMES)
+    np.testing.assert_allclose(index.times, TIMES)
+
+
+def test_unknown_node_is_rejected(nodout):
+    with pytest.raises(ValueError):
+        read_nodout(nodout, 999)
+    with pytest.raises(ValueError):
+        read_nodout(nodout, 999, index=index_nodout(nodout))
+
+
+@pytest.mark.parametrize("field, value", [
+    (b"  1.2345E-03", 1.2345e-3),
+    (b"  1.2345-100", 1.2345e-100),
+    (b" -2.5000+101", -2.5e101),
+    (b"  3.0000D+02", 300.0),
+])
+def test_fortran_float_forms(field, value):
+    assert _fortran_float(field) == pytest.approx(value)
+
+
+def test_history_nodes_reads_both_card_variants(tmp_path):
+    path = tmp_path / "model.key"
+    path.write_text("*KEYWORD\n"
+                    "*DATABASE_HISTORY_NODE\n"
+                    "$     nid1      nid2\n"
+                    "       101       102         0\n"
+                    "*DATABASE_HISTORY_NODE_ID\n"
+                    "         7head accelerometer\n"
+                    "*END\n")
+    assert history_nodes(str(path)) == [101, 102, 7]
@@ -0,0 +1,47 @@
+import io
+
+import numpy as np
+import pytest
+
+from sentinel_triage.engine import MM_PER_G, TriageEngine
+from sentinel_triage.realtime import RealtimeTriage, iter_blocks, iter_stream_blocks
+from sentinel_triage.synthetic import synthetic_trace
+from sentinel_triage.traces import KINEMATIC_COLUMNS, Trace
+
+DT = 1e-4
+SCORES = ("HIC15", "HIC15_t1", "HIC15_t2", "HIC36", "HIC36_t1", "HIC36_t2", "SI", "HIP_m", "GAMBIT")
+
+
+def recording(accel_units: str) -> np.ndarray:
+    data = synthetic_trace("multi-peak", 1 / DT, 0.08, noise_g=0.5)
+    if accel_units == "mm/s2":
+        data[:, 1:4] *= MM_PER_G
+    return data
+
+
+@pytest.mark.parametrize("accel_units", ["g", "mm/s2"])
+@pytest.mark.parametrize("block_size", [1, 16, 1000])
+def test_final_scores_match_engine(backend, accel_units, block_size):
+    data = recording(accel_units)
+    engine = TriageEngine(DT, accel_units=accel_units)
+    engine.hip.phase = engine.gambit.phase = "causal"
+    expected = engine.run(Trace(data, KINEMATIC_COLUMNS))
+
+    results = list(RealtimeTriage(DT, accel_units=accel_units).run(iter_blocks(data, block_size)))
+    assert results[-1]["samples"] == len(data) and results[-1]["time"] == data[-1, 0]
+    for name in SCORES:
+        assert results[-1][name] == pytest.approx(expected[name], rel=1e-7, nan_ok=True)
+
+
+def test_units_give_the_same_running_scores():
+    in_g = RealtimeTriage(DT, accel_units="g").update(recording("g"))
+    in_mm = RealtimeTriage(DT, accel_units="mm/s2").update(recording("mm/s2"))
+    for name in SCORES:
+        assert in_mm[name] == pytest.approx(in_g[name], rel=1e-9, nan_ok=True)
+
+
+def test_stream_blocks_skip_the_header():
+    stream = io.StringIO("Time,ax,ay,az,alphax,alphay,alphaz\n" + "".join(f"{i},1,2,3,4,5,6\n" for i in range(5)))
+    blocks = list(iter_stream_blocks(stream, block_size=2))
+    assert [len(block) for block in blocks] == [2, 2, 1]
+    assert np.concatenate(blocks)[:, 0].tolist() == [0, 1, 2, 3, 4]
@@ -0,0 +1,81 @@
+import asyncio
+import io
+import json
+import time
+
+import pytest
+
+from sentinel_triage import service
+from sentinel_triage.service import IngestionService, iter_responses, serve_stream
+from sentinel_triage.synthetic import synthetic_trace
+from sentinel_triage.worker import Worker
+
+DT = 1e-4
+PEAKS = (40.0, 60.0, 80.0, 100.0, 120.0)
+
+
+@pytest.fixture(scope="module")
+def requests():
+    return [{"id": f"trace-{i}", "data": synthetic_trace("haversine", 1 / DT, 0.03, peak).tolist(),
+             "frequency": DT, "accel_units": "g", "criteria": ["HIC", "GAMBIT"]} for i, peak in enumerate(PEAKS)]
+
+
+@pytest.fixture
+def reversed_completion(monkeypatch):
+    """Delays each request by its position, so the last request submitted finishes first."""
+    score = service._score_trace
+
+    def delayed(trace, request):
+        time.sleep(0.05 * (len(PEAKS) - int(request["id"].split("-")[1])))
+        return score(trace, request)
+
+    monkeypatch.setattr(service, "_score_trace", delayed)
+
+
+def expected(request):
+    return Worker().handle(request)
+
+
+def test_map_yields_in_request_order(requests, reversed_completion):
+    responses = list(iter_responses(requests, readers=2, workers=len(PEAKS), executor="thread"))
+    assert [response["id"] for response in responses] == [request["id"] for request in requests]
+    for request, response in zip(requests, responses):
+        assert response == expected(request)
+
+
+def test_serve_stream_matches_responses_by_id(requests, reversed_completion):
+    lines = ["not json"] + [json.dumps(request) for request in requests]
+    lines.insert(3, json.dumps({"id": "missing", "path": "no/such/trace.csv", "frequency": DT, "accel_units": "g"}))
+    out = io.StringIO()
+
+    async def run():
+        async with IngestionService(readers=2, workers=len(PEAKS), executor="thread") as ingestion:
+            return await serve_stream(ingestion, io.StringIO("\n".join(lines) + "\n\n"), out)
+
+    assert asyncio.run(run()) == len(requests) + 1
+    responses = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert responses[0] == {"id": None, "error": responses[0]["error"]}
+    assert responses[0]["error"].startswith("Invalid request")
+    by_id = {response["id"]: response for response in responses[1:]}
+    assert len(by_id) == len(responses) - 1
+    assert by_id.pop("missing") == {"id": "missing", "error": "File not found: no/such/trace.csv"}
+    order = [response["id"] for response in responses[1:] if response["id"] != "missing"]
+    assert order != [request["id"] for request in requests]
+    for request in requests:
+        assert by_id[request["id"]] == json.loads(json.dumps(expected(request)))
+
+
+def test_status_counts_completed_requests(requests):
+    async def run():
+        async with IngestionService(readers=1, workers=1, executor="thread") as ingestion:
+            responses = [await ingestion.score(request) for request in requests[:2]]
+            return responses, ingestion.status()
+
+    responses, status = asyncio.run(run())
+    assert [response["id"] for response in responses] == ["trace-0", "trace-1"]
+    assert status == {"queued": 0, "parsed": 0, "completed": 2}
+
+
+def test_unknown_executor_is_rejected():
+    with pytest.raises(ValueError, match="Unknown executor"):
+        IngestionService(executor="fiber")
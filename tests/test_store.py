@@ -0,0 +1,98 @@
+import json
+
+import numpy as np
+import pytest
+
+from sentinel_triage.engine import TriageEngine
+from sentinel_triage.store import ResultStore, array_digest
+from sentinel_triage.synthetic import synthetic_trace
+from sentinel_triage.traces import KINEMATIC_COLUMNS, Trace
+
+DT = 1e-4
+
+
+@pytest.fixture
+def trace():
+    return Trace(synthetic_trace("half-sine", 1 / DT, 0.05, 80.0, noise_g=0.5, seed=0), KINEMATIC_COLUMNS)
+
+
+@pytest.fixture
+def store(tmp_path):
+    with ResultStore(str(tmp_path / "store.sqlite")) as store:
+        yield store
+
+
+def counting_engine(store, computed):
+    """An engine that records the name of every stage it computes instead of loading."""
+    engine = TriageEngine(DT, store=store, accel_units="g")
+    for stage, compute in list(engine._stages.items()):
+        engine._stages[stage] = lambda source, values, stage=stage, compute=compute: (
+            computed.append(stage) or compute(source, values))
+    return engine
+
+
+def test_digest_follows_content_and_shape():
+    data = np.asfortranarray(np.arange(12.0).reshape(4, 3))
+    assert array_digest(data) == array_digest(np.asfortranarray(data.copy()))
+    assert array_digest(data) != array_digest(np.asfortranarray(data.reshape(3, 4)))
+    changed = data.copy()
+    changed[2, 1] += 1e-12
+    assert array_digest(data) != array_digest(changed)
+
+
+def test_artifacts_and_results_round_trip(store):
+    data = np.linspace(0.0, 1.0, 10).reshape(5, 2)
+    store.put_artifact("abc", "hip_channels", {"cutoff": 300}, data)
+    np.testing.assert_array_equal(store.get_artifact("abc", "hip_channels", {"cutoff": 300}), data)
+    assert store.get_artifact("abc", "hip_channels", {"cutoff": 200}) is None
+    store.put_result("abc", "HIC", {"limits_ms": [15.0]}, {"HIC15": np.array([1.0, 2.0])})
+    assert store.get_result("abc", "HIC", {"limits_ms": [15.0]}) == {"HIC15": [1.0, 2.0]}
+    assert store.info() == {"hits": 2, "misses": 1, "artifacts": 1, "results": 1}
+    store.clear()
+    assert store.info()["artifacts"] == store.info()["results"] == 0
+
+
+def test_stored_scores_match_and_skip_every_stage(store, trace):
+    fresh = TriageEngine(DT, accel_units="g").run(trace)
+    computed = []
+    first = counting_engine(store, computed).run(trace)
+    assert json.dumps(first, sort_keys=True) == json.dumps(fresh, sort_keys=True)
+    assert computed
+    computed.clear()
+    second = counting_engine(store, computed).run(trace)
+    assert computed == []
+    assert json.dumps(second, sort_keys=True) == json.dumps(fresh, sort_keys=True)
+
+
+def test_threshold_change_reuses_the_filtered_channels(store, trace):
+    computed = []
+    counting_engine(store, computed).run(trace, ["GAMBIT", "HIC"])
+    computed.clear()
+    engine = counting_engine(store, computed)
+    engine.gambit.a_c = 200.0
+    engine.limits_ms = (15.0,)
+    results = engine.run(trace, ["GAMBIT", "HIC"])
+    assert computed == []
+    reference = TriageEngine(DT, accel_units="g")
+    reference.gambit.a_c = 200.0
+    assert results["GAMBIT"] == reference.run(trace, ["GAMBIT"])["GAMBIT"]
+    assert "HIC36" not in results
+
+
+def test_filter_change_invalidates_downstream_stages(store, trace):
+    computed = []
+    counting_engine(store, computed).run(trace, ["HIC"])
+    computed.clear()
+    engine = counting_engine(store, computed)
+    engine.hic.cutoff = 1000.0
+    engine.run(trace, ["HIC"])
+    assert computed == ["resultant", "resultant_cfc1000", "resultant_integral"]
+
+
+def test_units_are_part_of_the_key(store, trace):
+    counting_engine(store, []).run(trace, ["HIP"])
+    computed = []
+    engine = counting_engine(store, computed)
+    engine.accel_units = "mm/s2"
+    engine.run(trace, ["HIP"])
+    assert "hip_channels" in computed
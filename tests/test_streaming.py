@@ -0,0 +1,31 @@
+import numpy as np
+import pytest
+from scipy.signal import sosfilt
+
+from sentinel_triage import filters
+from sentinel_triage.streaming import CausalFilter
+
+
+@pytest.mark.parametrize("seed", range(5))
+@pytest.mark.parametrize("channels", [(), (6,)])
+def test_causal_filter_blocks_match_whole_record(backend, seed, channels):
+    rng = np.random.default_rng(seed)
+    data = rng.normal(size=(2000,) + channels)
+    sos = filters.butter_lowpass_sos(4, 400.0, 1e-4)
+    expected = sosfilt(np.array(sos), data, axis=0)
+
+    lowpass = CausalFilter(sos)
+    blocks, start = [], 0
+    while start < len(data):
+        size = int(rng.choice([1, 2, 4, 5, 31, 256]))
+        blocks.append(lowpass(data[start:start + size]))
+        start += size
+    np.testing.assert_allclose(np.concatenate(blocks), expected, rtol=1e-9, atol=1e-12)
+
+
+def test_causal_filter_along_second_axis(backend):
+    data = np.random.default_rng(0).normal(size=(3, 500))
+    sos = filters.cfc_sos(1000, 1e-4)
+    lowpass = CausalFilter(sos)
+    filtered = np.concatenate([lowpass(data[:, :123], axis=1), lowpass(data[:, 123:], axis=1)], axis=1)
+    np.testing.assert_allclose(filtered, sosfilt(np.array(sos), data, axis=1), rtol=1e-9, atol=1e-12)
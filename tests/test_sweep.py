@@ -0,0 +1,133 @@
+import csv
+import json
+
+import numpy as np
+import pytest
+
+from sentinel_triage import sweep
+from sentinel_triage.engine import TriageEngine
+from sentinel_triage.gambit import GAMBITCalculator
+from sentinel_triage.hic import HICCalculator
+from sentinel_triage.synthetic import synthetic_trace, write_trace_csv
+from sentinel_triage.traces import load_trace
+
+DT = 1e-4
+
+
+@pytest.fixture
+def cases(tmp_path):
+    paths = []
+    for i, peak in enumerate([40.0, 60.0, 80.0, 100.0]):
+        path = str(tmp_path / f"case{i}.csv")
+        write_trace_csv(synthetic_trace("half-sine", 1 / DT, 0.05, peak), path)
+        paths.append(path)
+    return paths
+
+
+def test_default_grid_follows_the_calculators():
+    calculator = GAMBITCalculator(DT)
+    grid = sweep.make_grid()
+    assert grid["gambit_a_c"] == [calculator.a_c] and grid["gambit_alpha_c"] == [calculator.alpha_c]
+    assert grid["gambit_cutoff"] == [calculator.cutoff]
+    assert grid["hic_cutoff"] == [HICCalculator(DT).cutoff]
+
+
+def test_default_grid_matches_engine(cases):
+    record = sweep.sweep_trace(cases[2], DT, accel_units="g")
+    expected = TriageEngine(DT, accel_units="g").run(cases[2])
+    assert record["error"] is None
+    assert record["scores"]["HIC"] == pytest.approx([expected["HIC15"], expected["HIC36"]])
+    assert record["scores"]["HIP"] == pytest.approx([expected["HIP_m"]])
+    assert record["scores"]["GAMBIT"] == pytest.approx([expected["GAMBIT"]])
+
+
+def test_grid_order_matches_parameter_sets(cases):
+    grid = sweep.make_grid({"gambit_cutoff": [300, 400], "gambit_a_c": [200, 250], "hip_mass": [4.0, 4.5]})
+    record = sweep.sweep_trace(cases[2], DT, grid, accel_units="g")
+    for criterion, sets in sweep.parameter_sets(grid).items():
+        assert len(record["scores"][criterion]) == len(sets)
+    engine = TriageEngine(DT, accel_units="g")
+    engine.gambit.cutoff, engine.gambit.a_c = 300.0, 250.0
+    index = sweep.parameter_sets(grid)["GAMBIT"].index({"gambit_cutoff": 300.0, "gambit_a_c": 250.0,
+                                                         "gambit_alpha_c": 10000.0})
+    assert record["scores"]["GAMBIT"][index] == pytest.approx(engine.run(cases[2], ["GAMBIT"])["GAMBIT"])
+
+
+def test_sweep_restores_the_engine_cutoffs(cases):
+    engine = TriageEngine(DT, accel_units="g")
+    before = engine.run(cases[0])
+    grid = sweep.make_grid({"hic_cutoff": [800, 1200], "hip_cutoff": [200, 250], "gambit_cutoff": [300, 350]})
+    trace = load_trace(cases[0])
+    for evaluate in (sweep._sweep_resultant, sweep._sweep_hip, sweep._sweep_gambit):
+        evaluate(engine, trace, grid, None)
+    assert (engine.hic.cutoff, engine.hip.cutoff, engine.gambit.cutoff) == (1650.0, sweep.hip.BANDWIDTH, 400.0)
+    assert engine.run(cases[0]) == pytest.approx(before, nan_ok=True)
+
+
+def test_checkpoint_resumes_only_missing_cases(cases, tmp_path, monkeypatch):
+    checkpoint = str(tmp_path / "checkpoint.jsonl")
+    records = sweep.run_sweep(cases, DT, workers=1, checkpoint_path=checkpoint, accel_units="g")
+    first = [next(records), next(records)]
+    records.close()  # Interrupted after two cases
+
+    scored = []
+    monkeypatch.setattr(sweep, "_sweep_task", lambda task: scored.append(task[0]) or sweep.sweep_trace(*task))
+    resumed = list(sweep.run_sweep(cases, DT, workers=1, checkpoint_path=checkpoint, accel_units="g"))
+    assert scored == cases[2:]
+    assert json.dumps(resumed[:2]) == json.dumps(first)  # SI can be NaN
+    assert sorted(record["file"] for record in resumed) == cases
+
+
+def test_checkpoint_of_another_sweep_is_refused(cases, tmp_path):
+    checkpoint = str(tmp_path / "checkpoint.jsonl")
+    list(sweep.run_sweep(cases[:1], DT, workers=1, checkpoint_path=checkpoint, accel_units="g"))
+    with pytest.raises(ValueError, match="different settings"):
+        list(sweep.run_sweep(cases[:1], DT, workers=1, checkpoint_path=checkpoint, accel_units="mm/s2"))
+
+
+def test_checkpoint_drops_a_line_cut_short(cases, tmp_path):
+    checkpoint = tmp_path / "checkpoint.jsonl"
+    list(sweep.run_sweep(cases[:2], DT, workers=1, checkpoint_path=str(checkpoint), accel_units="g"))
+    lines = checkpoint.read_bytes().splitlines(keepends=True)
+    checkpoint.write_bytes(b"".join(lines[:-1]) + lines[-1][:20])
+    settings = json.loads(lines[0])
+    del settings["version"]
+    restored = sweep.Checkpoint(str(checkpoint), settings)
+    restored.close()
+    assert list(restored.completed) == [json.loads(lines[1])["file"]]
+    assert checkpoint.read_bytes() == b"".join(lines[:-1])
+
+
+def test_roc_curve():
+    thresholds, fpr, tpr = sweep.roc_curve([0.9, 0.8, 0.8, 0.3, np.nan], [1, 1, 0, 0, 1])
+    assert thresholds.tolist() == [np.inf, 0.9, 0.8, 0.3]
+    assert fpr.tolist() == [0.0, 0.0, 0.5, 1.0]
+    assert tpr.tolist() == [0.0, 0.5, 1.0, 1.0]
+    with pytest.raises(ValueError, match="both injured and uninjured"):
+        sweep.roc_curve([1.0, 2.0], [1, 1])
+
+
+def test_write_sweep_with_labels(cases, tmp_path):
+    grid = sweep.make_grid({"gambit_a_c": [200, 250]})
+    records = list(sweep.run_sweep(cases, DT, grid, workers=1, accel_units="g"))
+    labels = {f"case{i}.csv": int(i >= 2) for i in range(len(cases))}
+    paths = sweep.write_sweep(records, grid, str(tmp_path / "results"), labels)
+    assert set(paths) == {"risk_inputs", "roc", "auc"}
+
+    with open(paths["risk_inputs"], newline="") as f:
+        rows = list(csv.DictReader(f))
+    sets = sum(len(criterion_sets) for criterion_sets in sweep.parameter_sets(grid).values())
+    assert len(rows) == sets * len(cases)
+    with open(paths["auc"], newline="") as f:
+        auc = {(row["criterion"], int(row["set"])): row for row in csv.DictReader(f)}
+    # Every criterion grows with the peak, and the two largest peaks are the injured cases
+    assert float(auc["GAMBIT", 0]["auc"]) == float(auc["HIC", 0]["auc"]) == 1.0
+    assert auc["GAMBIT", 1]["cases"] == "4" and auc["GAMBIT", 1]["injured"] == "2"
+
+
+def test_cli_requires_units(tmp_path, capsys):
+    write_trace_csv(synthetic_trace("half-sine", 1 / DT, 0.05, 80.0), str(tmp_path / "trace.csv"))
+    with pytest.raises(SystemExit):
+        sweep.main([str(tmp_path), "--frequency", str(DT), "--output_dir", str(tmp_path / "results")])
+    assert "--accel_units" in capsys.readouterr().err
+    assert not (tmp_path / "results").exists()
@@ -0,0 +1,103 @@
+import json
+import os
+
+import numpy as np
+import pytest
+
+from sentinel_triage import traces
+from sentinel_triage.traces import CACHE_META_SUFFIX, CACHE_SUFFIX, load_trace
+
+
+@pytest.fixture
+def parses(monkeypatch):
+    """Counts the CSV parses of the NumPy reader."""
+    count = []
+    reader = traces._READERS["numpy"]
+    monkeypatch.setitem(traces._READERS, "numpy", lambda *args: count.append(1) or reader(*args))
+    return count
+
+
+def write_csv(path, rows) -> None:
+    with open(path, "w") as f:
+        f.write("Time,ax,ay,az\n")
+        f.writelines(",".join(f"{value:g}" for value in row) + "\n" for row in rows)
+
+
+def test_second_load_maps_the_cache(tmp_path, parses):
+    path = str(tmp_path / "trace.csv")
+    write_csv(path, [[0, 1, 2, 3], [1, 4, 5, 6]])
+    first = load_trace(path, parser="numpy")
+    second = load_trace(path, parser="numpy")
+    assert len(parses) == 1
+    assert os.path.exists(path + CACHE_SUFFIX) and os.path.exists(path + CACHE_META_SUFFIX)
+    assert second.data.flags.f_contiguous
+    assert second.columns == first.columns == ["Time", "ax", "ay", "az"]
+    np.testing.assert_array_equal(second.data, first.data)
+
+
+def test_changed_size_reparses(tmp_path, parses):
+    path = str(tmp_path / "trace.csv")
+    write_csv(path, [[0, 1, 2, 3]])
+    load_trace(path, parser="numpy")
+    write_csv(path, [[0, 1, 2, 3], [1, 4, 5, 6]])
+    assert len(load_trace(path, parser="numpy")) == 2
+    assert len(parses) == 2
+
+
+def test_same_size_new_content_reparses(tmp_path, parses):
+    path = str(tmp_path / "trace.csv")
+    write_csv(path, [[0, 1, 2, 3]])
+    load_trace(path, parser="numpy")
+    stat = os.stat(path)
+    write_csv(path, [[0, 9, 2, 3]])
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert load_trace(path, parser="numpy").column("ax").tolist() == [9.0]
+    assert len(parses) == 2
+
+
+def test_touched_file_keeps_the_cache(tmp_path, parses):
+    path = str(tmp_path / "trace.csv")
+    write_csv(path, [[0, 1, 2, 3]])
+    load_trace(path, parser="numpy")
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    load_trace(path, parser="numpy")
+    assert len(parses) == 1
+    with open(path + CACHE_META_SUFFIX) as f:
+        assert json.load(f)["mtime_ns"] == stat.st_mtime_ns + 1_000_000
+
+
+@pytest.mark.parametrize("meta", [{"version": traces.CACHE_VERSION + 1}, {"delimiter": ";"}, None])
+def test_stale_or_broken_sidecar_reparses(tmp_path, parses, meta):
+    path = str(tmp_path / "trace.csv")
+    write_csv(path, [[0, 1, 2, 3]])
+    load_trace(path, parser="numpy")
+    with open(path + CACHE_META_SUFFIX) as f:
+        stored = json.load(f)
+    with open(path + CACHE_META_SUFFIX, "w") as f:
+        f.write("{" if meta is None else json.dumps({**stored, **meta}))
+    assert load_trace(path, parser="numpy").column("az").tolist() == [3.0]
+    assert len(parses) == 2
+
+
+def test_cache_can_be_disabled(tmp_path, parses, monkeypatch):
+    path = str(tmp_path / "trace.csv")
+    write_csv(path, [[0, 1, 2, 3]])
+    load_trace(path, parser="numpy", cache=False)
+    monkeypatch.setenv("SENTINEL_TRACE_CACHE", "0")
+    load_trace(path, parser="numpy")
+    assert len(parses) == 2
+    assert not os.path.exists(path + CACHE_SUFFIX)
+
+
+def test_column_map_applies_to_cached_loads(tmp_path):
+    path = str(tmp_path / "trace.csv")
+    write_csv(path, [[0, 1, 2, 3]])
+    for _ in range(2):
+        trace = load_trace(path, column_map={"ax": "AccX"}, parser="numpy")
+        assert trace.columns == ["Time", "AccX", "ay", "az"]
+
+
+def test_missing_file(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        load_trace(str(tmp_path / "missing.csv"))
@@ -0,0 +1,38 @@
+import io
+import json
+
+import pytest
+
+from sentinel_triage.engine import TriageEngine
+from sentinel_triage.synthetic import synthetic_trace
+from sentinel_triage.traces import KINEMATIC_COLUMNS, Trace
+from sentinel_triage.worker import Worker
+
+DT = 1e-4
+
+
+@pytest.fixture(scope="module")
+def data():
+    return synthetic_trace("half-sine", 1 / DT, 0.05, 80.0)
+
+
+def test_request_without_units_is_refused(data):
+    response = Worker().handle({"id": 7, "data": data.tolist(), "frequency": DT})
+    assert response == {"id": 7, "error": "Request needs 'accel_units' ('g' or 'mm/s2')"}
+
+
+def test_request_matches_engine(data):
+    response = Worker().handle({"id": 1, "data": data.tolist(), "frequency": DT, "accel_units": "g"})
+    expected = TriageEngine(DT, accel_units="g").run(Trace(data, KINEMATIC_COLUMNS))
+    assert response.pop("id") == 1
+    assert response == pytest.approx(expected, nan_ok=True)
+
+
+def test_serve_answers_every_line(data):
+    requests = io.StringIO("not json\n\n" + json.dumps({"id": 2, "data": data.tolist(), "frequency": DT,
+                                                         "accel_units": "g", "criteria": ["GAMBIT"]}) + "\n")
+    responses = io.StringIO()
+    assert Worker().serve(requests, responses) == 2
+    first, second = map(json.loads, responses.getvalue().splitlines())
+    assert first["id"] is None and first["error"].startswith("Invalid request")
+    assert second["id"] == 2 and second["error"] is None and second["GAMBIT"] > 0